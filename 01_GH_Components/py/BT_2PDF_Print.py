@@ -25,6 +25,7 @@ Each branch on the GH input tree will be output to a separate PDF, so organize i
 NOTE: be sure to turn off all your GH Previews - otherwise they will print to the PDF as well.
 -
 EM Jun. 07, 2020
+Updated October 17, 2026
     Args:
         layersOn_: (Tree - strings) <Optional> A Tree of layers names to have 'On' during each export. If the tree length matches the '_geomToBake' the layer states will be modified for each output. Otherwise the first tree branch's values will be used for all. If none are passed, all Rhino Layers will be set to 'Off' for all the exports. Note: When passing in child/nested layers, use the Rhino convention <"Parent::Child"> - ie: "00_CAD::Floor_1" for a nested layer 'Floor_1' under '00_CAD'.
         _print: (Bool): Set to True to run. Use Boolean toggle not a button (for some reason?)
@@ -39,13 +40,14 @@ EM Jun. 07, 2020
         _tablesToBake: (Tree - Table Object) <Optional>
         titleBlockTxtToBake_: (Tree) Each Branch should contain one or more text strings to write out to the Layout Page (Paperspace). Useful for Titleblock items.
         titleBlockTxtLocatons_: (List) Center Points for the Text items to be bakes to the Layout. List length should match the length of each of the Tree Branches in 'titleBlockTxtToBake_'
+        multiPagePDF_: (Bool) <Optional> Default=False. Set True to bake all the branches at once (each on its own set of temporary sub-layers) and print them all as pages of a single PDF, named with the first 'fileName_' (or the Rhino file name). Much faster than baking / deleting for every sheet.
     Returns:
         
 """
 
 ghenv.Component.Name = "BT_2PDF_Print"
 ghenv.Component.NickName = "2PDF | Print"
-ghenv.Component.Message = 'JUN_07_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "03 | PDF"
@@ -58,92 +60,156 @@ import Grasshopper.Kernel as ghK
 import ghpythonlib.components as ghc
 import os
 import System
+import math
 
-def mesh2Hatch(mesh):
-    # Copied / Adapted from Ladybug Definition
+def faceHatch(_pts):
+    """Creates the hatch(es) for a single mesh face. Non-planar quads get split into two triangles"""
     
-    #Make some lists to hold key parameters
     hatches = []
-    colors = []
-    guids = []
-    runningVertexCount = 0
+    
+    outline = Rhino.Geometry.PolylineCurve(_pts + [_pts[0]])
+    if outline.IsPlanar():
+        hatches.extend( Rhino.Geometry.Hatch.Create(outline, 0, 0, 0) )
+    else:
+        for tri in ([_pts[0], _pts[1], _pts[2]], [_pts[2], _pts[3], _pts[0]]):
+            triOutline = Rhino.Geometry.PolylineCurve(tri + [tri[0]])
+            hatches.extend( Rhino.Geometry.Hatch.Create(triOutline, 0, 0, 0) )
+    
+    return hatches
+
+def facePlaneKey(_pts, _tol):
+    """Returns a (normal, offset) key for the plane of a planar face, or None if degenerate
+    
+    The normal is flipped to always point the same way, so that coplanar faces
+    wound in opposite directions still get the same key."""
+    
+    v1 = _pts[1] - _pts[0]
+    v2 = _pts[-1] - _pts[0]
+    normal = Rhino.Geometry.Vector3d.CrossProduct(v1, v2)
+    if not normal.Unitize():
+        return None
+    
+    n = [normal.X, normal.Y, normal.Z]
+    for each in n:
+        if abs(each) > 1e-6:
+            if each < 0:
+                n = [-x for x in n]
+            break
+    
+    offset = n[0]*_pts[0].X + n[1]*_pts[0].Y + n[2]*_pts[0].Z
+    
+    return (round(n[0], 3), round(n[1], 3), round(n[2], 3), int(round(offset / (_tol*10))))
+
+def regionOutlines(_faces, _tol):
+    """Finds the outline loops (outer boundaries and holes) of a set of touching faces
+    
+    Builds a small mesh from the faces with the shared vertices welded, so its
+    naked edges are the outline of the unioned region.
+    """
+    
+    regionMesh = Rhino.Geometry.Mesh()
+    vertIndex = {}
+    
+    for pts in _faces:
+        ids = []
+        for pt in pts:
+            key = ( int(round(pt.X/_tol)), int(round(pt.Y/_tol)), int(round(pt.Z/_tol)) )
+            if key not in vertIndex:
+                vertIndex[key] = regionMesh.Vertices.Add(pt)
+            if vertIndex[key] not in ids:
+                ids.append( vertIndex[key] )
+        
+        if len(ids) == 4:
+            regionMesh.Faces.AddFace(ids[0], ids[1], ids[2], ids[3])
+        elif len(ids) == 3:
+            regionMesh.Faces.AddFace(ids[0], ids[1], ids[2])
+    
+    nakedEdges = regionMesh.GetNakedEdges() or []
+    
+    return [Rhino.Geometry.PolylineCurve(pl) for pl in nakedEdges]
+
+def mesh2Hatch(mesh):
+    """Creates the colored hatches for a mesh, one per colored region
+    
+    Faces are grouped by their (averaged) color and their plane. Each group's
+    boundaries are unioned into as few outline loops as possible and hatched
+    together, rather than creating a separate hatch for every mesh face. If a
+    region can't be hatched as a whole, falls back to hatching its faces one by one.
+    """
+    
+    # Adapted from the Ladybug Definition
+    tol = sc.doc.ModelAbsoluteTolerance
     meshColors = mesh.VertexColors
     
+    #---------------------------------------------------------------------------
+    # Sort the faces into groups by color and plane
+    regions = {}
+    regionOrder = []
     for faceCount, face in enumerate(mesh.Faces):
-        faceColorList = []
-        facePointList = []
         
         #Extract the points and colors.
         if face.IsQuad:
-            faceColorList.append(meshColors[face.A])
-            faceColorList.append(meshColors[face.B])
-            faceColorList.append(meshColors[face.C])
-            faceColorList.append(meshColors[face.D])
-            
-            facePointList.append(mesh.PointAt(faceCount, 1,0,0,0))
-            facePointList.append(mesh.PointAt(faceCount, 0,1,0,0))
-            facePointList.append(mesh.PointAt(faceCount, 0,0,1,0))
-            facePointList.append(mesh.PointAt(faceCount, 0,0,0,1))
+            faceColorList = [meshColors[face.A], meshColors[face.B], meshColors[face.C], meshColors[face.D]]
+            facePointList = [mesh.PointAt(faceCount, 1,0,0,0),
+                            mesh.PointAt(faceCount, 0,1,0,0),
+                            mesh.PointAt(faceCount, 0,0,1,0),
+                            mesh.PointAt(faceCount, 0,0,0,1)]
         else:
-            faceColorList.append(meshColors[face.A])
-            faceColorList.append(meshColors[face.B])
-            faceColorList.append(meshColors[face.C])
-            
-            facePointList.append(mesh.PointAt(faceCount, 1,0,0,0))
-            facePointList.append(mesh.PointAt(faceCount, 0,1,0,0))
-            facePointList.append(mesh.PointAt(faceCount, 0,0,1,0))
+            faceColorList = [meshColors[face.A], meshColors[face.B], meshColors[face.C]]
+            facePointList = [mesh.PointAt(faceCount, 1,0,0,0),
+                            mesh.PointAt(faceCount, 0,1,0,0),
+                            mesh.PointAt(faceCount, 0,0,1,0)]
         
         #Calculate the average color of the face.
-        if face.IsQuad:
-            hatchColorR = (faceColorList[0].R + faceColorList[1].R + faceColorList[2].R + faceColorList[3].R) / 4
-            hatchColorG = (faceColorList[0].G + faceColorList[1].G + faceColorList[2].G + faceColorList[3].G) / 4
-            hatchColorB = (faceColorList[0].B + faceColorList[1].B + faceColorList[2].B + faceColorList[3].B) / 4
+        hatchColorR = sum(c.R for c in faceColorList) / len(faceColorList)
+        hatchColorG = sum(c.G for c in faceColorList) / len(faceColorList)
+        hatchColorB = sum(c.B for c in faceColorList) / len(faceColorList)
+        
+        # Non-planar quads get split into two triangles, each on its own plane
+        if face.IsQuad and not Rhino.Geometry.PolylineCurve(facePointList + [facePointList[0]]).IsPlanar():
+            faceParts = [ [facePointList[0], facePointList[1], facePointList[2]],
+                          [facePointList[2], facePointList[3], facePointList[0]] ]
         else:
-            hatchColorR = (faceColorList[0].R + faceColorList[1].R + faceColorList[2].R) / 3
-            hatchColorG = (faceColorList[0].G + faceColorList[1].G + faceColorList[2].G) / 3
-            hatchColorB = (faceColorList[0].B + faceColorList[1].B + faceColorList[2].B) / 3
-        hatchColor = System.Drawing.Color.FromArgb(255, hatchColorR, hatchColorG, hatchColorB)
+            faceParts = [ facePointList ]
         
-        #Create the outline of a new hatch.
-        hatchCurveInit = Rhino.Geometry.PolylineCurve(facePointList)
-        if face.IsQuad: hatchExtra = Rhino.Geometry.LineCurve(facePointList[0], facePointList[3])
-        else: hatchExtra = Rhino.Geometry.LineCurve(facePointList[0], facePointList[2])
-        hatchCurve = Rhino.Geometry.Curve.JoinCurves([hatchCurveInit, hatchExtra], sc.doc.ModelAbsoluteTolerance)[0]
+        for pts in faceParts:
+            key = ( (hatchColorR, hatchColorG, hatchColorB), facePlaneKey(pts, tol) )
+            if key not in regions:
+                regions[key] = []
+                regionOrder.append(key)
+            regions[key].append(pts)
+    
+    #---------------------------------------------------------------------------
+    # Create one hatch per region (or a few, if the region has separate islands)
+    hatches = []
+    colors = []
+    for key in regionOrder:
+        rgb, planeKey = key
+        hatchColor = System.Drawing.Color.FromArgb(255, rgb[0], rgb[1], rgb[2])
+        faces = regions[key]
         
-        #Create the hatch.
-        try:
-            if hatchCurve.IsPlanar():
-                meshFaceHatch = Rhino.Geometry.Hatch.Create(hatchCurve, 0, 0, 0)[0]
-                hatches.append(meshFaceHatch)
-                colors.append(hatchColor)
-            else:
-                #We have to split the quad face into two triangles.
-                hatchCurveInit1 = Rhino.Geometry.PolylineCurve([facePointList[0], facePointList[1], facePointList[2]])
-                hatchExtra1 = Rhino.Geometry.LineCurve(facePointList[0], facePointList[2])
-                hatchCurve1 = Rhino.Geometry.Curve.JoinCurves([hatchCurveInit1, hatchExtra1], sc.doc.ModelAbsoluteTolerance)[0]
-                meshFaceHatch1 = Rhino.Geometry.Hatch.Create(hatchCurve1, 0, 0, 0)[0]
-                hatchCurveInit2 = Rhino.Geometry.PolylineCurve([facePointList[2], facePointList[3], facePointList[0]])
-                hatchExtra2 = Rhino.Geometry.LineCurve(facePointList[2], facePointList[0])
-                hatchCurve2 = Rhino.Geometry.Curve.JoinCurves([hatchCurveInit2, hatchExtra2], sc.doc.ModelAbsoluteTolerance)[0]
-                meshFaceHatch2 = Rhino.Geometry.Hatch.Create(hatchCurve2, 0, 0, 0)[0]
-                
-                hatches.extend([meshFaceHatch1, meshFaceHatch2])
-                colors.extend([hatchColor, hatchColor])
-        except:pass
+        regionHatches = []
+        if planeKey is not None:
+            try:
+                outlines = regionOutlines(faces, tol)
+                if outlines:
+                    regionHatches = list( Rhino.Geometry.Hatch.Create(outlines, 0, 0, 0, tol) or [] )
+            except:
+                regionHatches = []
+        
+        if not regionHatches:
+            for pts in faces:
+                try: regionHatches.extend( faceHatch(pts) )
+                except: pass
         
+        hatches.extend(regionHatches)
+        colors.extend([hatchColor] * len(regionHatches))
+    
     return hatches, colors
 
-def bakeText(_txt, _txtLocation, _layer, _txtSize=1, _neighbors=[], _avoidCollisions=False):
-    """Bakes some Text to the Rhino scene
-    
-    _txt: <String> The actual text / note to bake
-    _txtLocation: <Point3D> The reference point  / location for the object
-    _layer: <String> The layer to bake the object to
-    _txtSize: <Float> The size of the text (height). Refers to the Annotation scale of the Page being printed
-    _neighbors: <List> The other text tags being printed
-    """
+def createText(_txt, _txtLocation, _txtSize=1):
+    """Creates a new (un-baked) TextEntity centered on the location"""
     # https://developer.rhino3d.com/api/RhinoCommon/html/T_Rhino_Geometry_TextEntity.htm
-    sc.doc = Rhino.RhinoDoc.ActiveDoc
     
     # The baseplane for the Text
     origin = _txtLocation
@@ -158,48 +224,15 @@ def bakeText(_txt, _txtLocation, _layer, _txtSize=1, _neighbors=[], _avoidCollis
     txt.TextHeight = _txtSize
     txt.Justification = Rhino.Geometry.TextJustification.MiddleCenter
     
-    if _avoidCollisions:
-        # Test against the other text items on the sheet
-        # First, find / create the bouding box rectangle of the text note
-        thisBB = txt.GetBoundingBox(txt.Plane)
-        boxXdim = abs(thisBB.Min.X - thisBB.Max.X)
-        boxYdim = abs(thisBB.Min.Y - thisBB.Max.Y)
-        domainX = ghc.ConstructDomain( (boxXdim/2)*-1,  boxXdim/2) 
-        domainY = ghc.ConstructDomain( (boxYdim/2)*-1,  boxYdim/2) 
-        boundingRect = ghc.Rectangle(txt.Plane, domainX, domainY, 0).rectangle
-        
-        # Compare the current text note to the others already in the scene
-        # Move the current tag if neccessary
-        for eachNeighbor in _neighbors:
-            intersection = ghc.CurveXCurve(eachNeighbor, boundingRect)
-            if intersection.points != None:
-                neighbor = ghc.DeconstuctRectangle(eachNeighbor) # The overlapping textbox
-                neighborY = neighbor.Y # Returns a domain
-                #neighborY = abs(neighborY[0] - neighborY[1]) # Total Y distance
-                
-                neighborCP = neighbor.base_plane.Origin
-                thisCP = ghc.DeconstuctRectangle(boundingRect).base_plane.Origin
-                
-                if thisCP.Y > neighborCP.Y:
-                    # Move the tag 'up'
-                    neighborMaxY = neighborCP.Y + neighborY[1]
-                    thisMinY = thisCP.Y - (boxYdim/2)
-                    moveVector = Rhino.Geometry.Vector3d(0,neighborMaxY-thisMinY,0)
-                    boundingRect = ghc.Move(boundingRect, moveVector).geometry
-                else:
-                    # Move the tag 'down'
-                    neighborMinY = neighborCP.Y - neighborY[1]
-                    thisMaxY = thisCP.Y + (boxYdim/2)
-                    moveVector = Rhino.Geometry.Vector3d(0,neighborMinY-thisMaxY,0)
-                    boundingRect = ghc.Move(boundingRect, moveVector).geometry
-                
-                #Re-Set the text tag's origin to the new location
-                txt.Plane = ghc.DeconstuctRectangle(boundingRect).base_plane
-    else:
-        boundingRect = None
+    return txt
+
+def addTextToDoc(_txtEntity, _layer):
+    """Adds the TextEntity to the Rhino scene, on the layer"""
+    
+    sc.doc = Rhino.RhinoDoc.ActiveDoc
     
     # Add the new text object to the Scene
-    txtObj = Rhino.RhinoDoc.ActiveDoc.Objects.AddText(txt)
+    txtObj = Rhino.RhinoDoc.ActiveDoc.Objects.AddText(_txtEntity)
     
     # Set the new Text's Layer
     if not rs.IsLayer(_layer):
@@ -208,7 +241,138 @@ def bakeText(_txt, _txtLocation, _layer, _txtSize=1, _neighbors=[], _avoidCollis
     
     sc.doc = ghdoc
     
-    return boundingRect # Return the text bounding box
+    return txtObj
+
+def bakeText(_txt, _txtLocation, _layer, _txtSize=1):
+    """Bakes some Text to the Rhino scene
+    
+    _txt: <String> The actual text / note to bake
+    _txtLocation: <Point3D> The reference point  / location for the object
+    _layer: <String> The layer to bake the object to
+    _txtSize: <Float> The size of the text (height). Refers to the Annotation scale of the Page being printed
+    """
+    
+    return addTextToDoc(createText(_txt, _txtLocation, _txtSize), _layer)
+
+def placeLabels(_rects, _maxMoves=25):
+    """Moves label rectangles (up or down) so that none of them overlap
+    
+    Labels are placed one at a time, in order. Each new label is checked only
+    against the already-placed labels in the grid cells it covers. If it
+    overlaps one, it is moved (up if its center is above the neighbor's, down if
+    not) to just clear that neighbor, and checked again, always continuing in the
+    same direction. If it can't be cleared that way within the move limit, the
+    other direction is tried. Labels that still can't be cleared are left at
+    their original location and reported back.
+    
+    _rects: <List> (center-X, center-Y, width, height) for each label
+    _maxMoves: <Int> The most times a label will be moved in one direction
+    
+    Returns:
+        centers: <List> The new (center-X, center-Y) for each label
+        unplaced: <List> The index of each label that could not be placed clear
+    """
+    
+    if not _rects:
+        return [], []
+    
+    cellSize = max( max(w, h) for x, y, w, h in _rects ) or 1.0
+    grid = {}
+    placed = []
+    
+    def cells(x, y, w, h):
+        x0 = int(math.floor((x - w/2.0) / cellSize))
+        x1 = int(math.floor((x + w/2.0) / cellSize))
+        y0 = int(math.floor((y - h/2.0) / cellSize))
+        y1 = int(math.floor((y + h/2.0) / cellSize))
+        return [(i, k) for i in range(x0, x1+1) for k in range(y0, y1+1)]
+    
+    def firstOverlap(x, y, w, h):
+        hits = set()
+        for cell in cells(x, y, w, h):
+            hits.update( grid.get(cell, []) )
+        
+        for i in sorted(hits):
+            nx, ny, nw, nh = placed[i]
+            if abs(x - nx) < (w + nw)/2.0 and abs(y - ny) < (h + nh)/2.0:
+                return placed[i]
+        return None
+    
+    def slide(x, y, w, h, direction):
+        for move in range(_maxMoves):
+            neighbor = firstOverlap(x, y, w, h)
+            if neighbor is None:
+                return y
+            
+            nx, ny, nw, nh = neighbor
+            if direction is None:
+                direction = 1 if y > ny else -1
+            
+            if direction > 0:
+                y = ny + nh/2.0 + h/2.0  # Move the tag 'up'
+            else:
+                y = ny - nh/2.0 - h/2.0  # Move the tag 'down'
+        
+        return y if firstOverlap(x, y, w, h) is None else None
+    
+    centers = []
+    unplaced = []
+    for labelNum, (x, y, w, h) in enumerate(_rects):
+        newY = slide(x, y, w, h, None)
+        
+        if newY is None:
+            # Try the other direction, from the original location
+            neighbor = firstOverlap(x, y, w, h)
+            newY = slide(x, y, w, h, -1 if y > neighbor[1] else 1)
+        
+        if newY is None:
+            # Leave it at its original location, not wherever the last move got to
+            unplaced.append(labelNum)
+            newY = y
+        
+        placed.append( (x, newY, w, h) )
+        for cell in cells(x, newY, w, h):
+            grid.setdefault(cell, []).append( len(placed)-1 )
+        
+        centers.append( (x, newY) )
+    
+    return centers, unplaced
+
+def bakeNotes(_notes, _txtLocations, _layer, _txtSize=1):
+    """Bakes a set of Text notes to the Rhino scene, moving them so they don't overlap
+    
+    _notes: <List> The text / notes to bake
+    _txtLocations: <List> The center-point (Point3D) for each note
+    _layer: <String> The layer to bake the objects to
+    _txtSize: <Float> The size of the text (height)
+    
+    Returns:
+        unplaced: <List> The text of any notes that could not be moved clear of the others
+    """
+    
+    txts = []
+    rects = []
+    for eachNote, eachLocation in zip(_notes, _txtLocations):
+        txt = createText(eachNote, eachLocation, _txtSize)
+        
+        # Find the size of the bouding box rectangle of the text note
+        thisBB = txt.GetBoundingBox(txt.Plane)
+        boxXdim = abs(thisBB.Min.X - thisBB.Max.X)
+        boxYdim = abs(thisBB.Min.Y - thisBB.Max.Y)
+        
+        txts.append(txt)
+        rects.append( (txt.Plane.Origin.X, txt.Plane.Origin.Y, boxXdim, boxYdim) )
+    
+    centers, unplaced = placeLabels(rects)
+    
+    for txt, (x, y) in zip(txts, centers):
+        #Re-Set the text tag's origin to the new location
+        plane = txt.Plane
+        plane.Origin = Rhino.Geometry.Point3d(x, y, plane.Origin.Z)
+        txt.Plane = plane
+        addTextToDoc(txt, _layer)
+    
+    return [_notes[i] for i in unplaced]
 
 def bakeObject(_obj, _attrs, _layer):
     """ Takes in an obj and bakes to a Layer
@@ -278,6 +442,15 @@ def bakeObject(_obj, _attrs, _layer):
     
     sc.doc = ghdoc
 
+def getLayerVisibilities():
+    # Record the Starting State of all the Layers (for resetting when done)
+    
+    sc.doc = Rhino.RhinoDoc.ActiveDoc
+    layerVisibilites = dict( (layer, rs.LayerVisible(layer)) for layer in rs.LayerNames() )
+    sc.doc = ghdoc
+    
+    return layerVisibilites
+
 def setOutputLayerVis(_detailViewLayers=[], _udLayersOn=[]):
     # Turn all Layer Visibilities 'Off' except for the designeted layers
     
@@ -289,11 +462,6 @@ def setOutputLayerVis(_detailViewLayers=[], _udLayersOn=[]):
     print 'Turning on layers: {}'.format(allLayersOn)
     print '----'
     
-    # Record the Starting State
-    layerVisibilites = [] # True/False record (for resetting when done)
-    for layer in layers:
-        layerVisibilites.append( rs.LayerVisible(layer) )
-    
     # Set layers 'off' if they aren't on the list to stay on
     for layer in layers:
         #if list(layer.Split(":"))[-1] not in allLayersOn:
@@ -306,21 +474,31 @@ def setOutputLayerVis(_detailViewLayers=[], _udLayersOn=[]):
     Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
     
     sc.doc = ghdoc
-    
-    return layerVisibilites
 
-def createTempLayer():
+def createTempLayer(_parentLayer=None):
+    # Creates a new, unused Layer. If a parent Layer is given, creates it as a sub-layer
+    # Returns the new Layer's full path
+    
     sc.doc = Rhino.RhinoDoc.ActiveDoc
     
     # Create an Unused Layer Name
     layer_name = sc.doc.Layers.GetUnusedLayerName(False)
     
     # Add a new Layer to the Document
-    layer_index = sc.doc.Layers.Add(layer_name, System.Drawing.Color.Black)
+    if _parentLayer:
+        parent = sc.doc.Layers.FindByFullPath(_parentLayer, -1)
+        newLayer = Rhino.DocObjects.Layer()
+        newLayer.Name = layer_name
+        newLayer.Color = System.Drawing.Color.Black
+        newLayer.ParentLayerId = sc.doc.Layers[parent].Id
+        layer_index = sc.doc.Layers.Add(newLayer)
+    else:
+        layer_index = sc.doc.Layers.Add(layer_name, System.Drawing.Color.Black)
     
     if layer_index<0:
         print "Unable to add {} layer.".format(layer_name)
     else:
+        layer_name = sc.doc.Layers[layer_index].FullPath
         print "Added Layer: '{}' ".format(layer_name)
     
     sc.doc = ghdoc
@@ -333,8 +511,8 @@ def removeTempLayer(_tmpLayerName):
     # Be sure the temp layer exists?
     if _tmpLayerName in rs.LayerNames():
         print "Removing Layer: '{}'".format(_tmpLayerName)
-        tmpLayer = sc.doc.Layers.FindName(_tmpLayerName)
-        sc.doc.Layers.Delete(tmpLayer)
+        rs.DeleteObjects(rs.ObjectsByLayer(_tmpLayerName))
+        rs.DeleteLayer(_tmpLayerName)
     
     sc.doc = ghdoc
 
@@ -343,18 +521,16 @@ def allLayersReset(_layerVisSettings):
     
     sc.doc=Rhino.RhinoDoc.ActiveDoc
     
-    currentLayer = Rhino.RhinoDoc.ActiveDoc.Layers.CurrentLayer
-    layers = rs.LayerNames()
-    for i in range(len(layers)):
-        #print layers[i], _layerVisSettings[i]
-        rs.LayerVisible(layers[i],_layerVisSettings[i])
+    for layer in rs.LayerNames():
+        if layer in _layerVisSettings:
+            rs.LayerVisible(layer, _layerVisSettings[layer])
     Rhino.RhinoDoc.ActiveDoc.Views.RedrawEnabled = True
     Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
     
     sc.doc = ghdoc
 
-def createSinglePDF(_view, _saveFolder, _fileName):
-    # Takes in a RhinoView and Exports it to PDF
+def getOutputFolder(_saveFolder):
+    # Returns the output folder path (with trailing slash), creating it if needed
     
     subFolder = '' #'\Exports\\'
     outputFolderPath = '{}{}'.format( _saveFolder, subFolder )
@@ -371,6 +547,11 @@ def createSinglePDF(_view, _saveFolder, _fileName):
     else:
         pass
     
+    return outputFolderPath
+
+def addPDFPage(_pdf, _view):
+    # Adds the RhinoView as a new page of the PDF
+    
     # Layout Page Size in Layout's Units
     pageHeight = sc.doc.Views.ActiveView.PageHeight
     pageWidth = sc.doc.Views.ActiveView.PageWidth
@@ -385,14 +566,19 @@ def createSinglePDF(_view, _saveFolder, _fileName):
     pageHeight = round(pageHeight, 2)
     pageWidth = round(pageWidth, 2)
     
-    pdf = Rhino.FileIO.FilePdf.Create()
     dpi = 300
     size = System.Drawing.Size(pageWidth*dpi,pageHeight*dpi) # Should get this from the view?
     settings = Rhino.Display.ViewCaptureSettings(_view, size, dpi)
     settings.OutputColor = Rhino.Display.ViewCaptureSettings.ColorMode.DisplayColor
-    pdf.AddPage(settings)
+    _pdf.AddPage(settings)
+
+def createSinglePDF(_view, _saveFolder, _fileName):
+    # Takes in a RhinoView and Exports it to PDF
     
-    filePath = outputFolderPath + _fileName + '.pdf'
+    pdf = Rhino.FileIO.FilePdf.Create()
+    addPDFPage(pdf, _view)
+    
+    filePath = getOutputFolder(_saveFolder) + _fileName + '.pdf'
     pdf.Write(filePath)
 
 def setActiveViewByName(_targetViewName):
@@ -457,96 +643,143 @@ elif _geomToBake and not fileName_:
     
     for i in range(_geomToBake.BranchCount): fileNames.append("{}_{:03d}".format(rhinoFileName, i+1).replace(" ", "_")  )
 
+def getSheetLayersOn(_branchNum):
+    # The User Determined layers to leave 'on' for the sheet
+    
+    try: 
+        return list(layersOn_.Branch(_branchNum))
+    except:
+        try:
+            return list(layersOn_.Branch(0))
+        except:
+            msg = 'No input in "LayersOn_" found? Turning all Rhino Scene layers off.'
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, msg)
+            return []
+
+def bakeSheet(_branchNum, _branch, _layerGeom, _layerNotes, _layerTitleBlock):
+    # Bakes all the Geometry, Notes, Titleblock Text and Tables for one sheet
+    
+    setActiveViewByName('Top') # Change to 'Top' View for Baking
+    
+    # > Geometry
+    for i, geomGUID in enumerate(_branch):
+        try:
+            geomAttrs = _geomAttributes.Branch(_branchNum)[i]
+        except:
+            geomAttrs = None
+        bakeObject(geomGUID, geomAttrs, _layerGeom) # Bake Geometry to the specified layer
+    
+    # > Notes
+    setActiveViewByName(_viewName) # Change to the Designated Output view/Page for Printing PDF
+    dtlViews = sc.doc.Views.ActiveView.GetDetailViews()
+    dtlViewTransforms = []
+    for eachView in dtlViews: dtlViewTransforms.append( eachView.WorldToPageTransform )
+    
+    if len(dtlViewTransforms)>1:
+        warning = "Looks like there are two Detail Views on your Layout Page? This Probably will not work right with more than one view on a page."
+        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
+    
+    # > Find the note's Paperspace location
+    noteCP_transformed = []
+    if _noteLocations.BranchCount > 0:
+        for eachCP in _noteLocations.Branch(_branchNum):
+            noteCP_transformed.append( ghc.Transform(eachCP, dtlViewTransforms[0]) )
+        
+        notes = list(_notesToBake.Branch(_branchNum))
+        unplaced = bakeNotes(notes, noteCP_transformed[:len(notes)], _layerNotes, float(noteTxtSize_))
+        if unplaced:
+            warning = "Could not find a clear spot for {} note(s) on sheet {}: {}\n"\
+            "They were left at their original location.".format(len(unplaced), _branchNum+1, unplaced)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
+    
+    # > Layout Page Titleblock Text Objects
+    if titleBlockTxtToBake_.BranchCount > 0:
+        for i, txtItem in enumerate( titleBlockTxtToBake_.Branch(_branchNum) ):
+            bakeText(_txt = txtItem,
+                _txtLocation = titleBlockTxtLocatons_.Branch(0)[i],
+                _layer=_layerTitleBlock,
+                _txtSize=3.4)
+    
+    # > Layout Page Table Objects
+    if _tablesToBake.BranchCount > 0:
+        for table in _tablesToBake.Branch(_branchNum):
+            for k, cell in table.Cells.items():
+                bakeText(_txt=str(cell.ValueFormated),
+                    _txtLocation=cell.Location,
+                    _layer=_layerNotes,
+                    _txtSize=cell.TextHeight)
+
+# Older copies of the component won't have the 'multiPagePDF_' input
+multiPagePDF = bool(globals().get('multiPagePDF_', False))
+
 ## Bake all the objects and print to PDF
-if _print and _viewName and _saveFolder and _geomToBake:
+if _print and _viewName and _saveFolder and _geomToBake and not multiPagePDF:
     setActiveViewByName(_viewName) # Set to the View to be exported
     detailViewLayers = findAllDetailViewLayers() # Find the layers to leave on
+    layerVis = getLayerVisibilities() # Record the starting state, just once
     
     for branchNum, branch in enumerate(_geomToBake.Branches):
-        try: 
-            udLayersOn = list(layersOn_.Branch(branchNum))
-        except:
-            try:
-                udLayersOn = list(layersOn_.Branch(0))
-            except:
-                udLayersOn = []
-                msg = 'No input in "LayersOn_" found? Turning all Rhino Scene layers off.'
-                ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, msg)
-        
-        layerVis = setOutputLayerVis(detailViewLayers, udLayersOn) # Turn off all the Layers (Except the Designated Layers)
+        setOutputLayerVis(detailViewLayers, getSheetLayersOn(branchNum)) # Turn off all the Layers (Except the Designated Layers)
         
         # Bake------
         tempLayer_Notes = createTempLayer() 
         tempLayer_Geom = createTempLayer() # Create a temporary layer for the Baked Geometry
         tempLayer_TitleBlock = createTempLayer() 
-        setActiveViewByName('Top') # Change to 'Top' View for Baking
-        
-        # > Geometry
-        for i, geomGUID in enumerate(branch):
-            try:
-                geomAttrs = _geomAttributes.Branch(branchNum)[i]
-            except:
-                geomAttrs = None
-            bakeObject(geomGUID, geomAttrs, tempLayer_Geom) # Bake Geometry to the specified layer
-        
-        # > Notes
-        setActiveViewByName(_viewName) # Change to the Designated Output view/Page for Printing PDF
-        dtlViews = sc.doc.Views.ActiveView.GetDetailViews()
-        dtlViewTransforms = []
-        for eachView in dtlViews: dtlViewTransforms.append( eachView.WorldToPageTransform )
-        
-        if len(dtlViewTransforms)>1:
-            warning = "Looks like there are two Detail Views on your Layout Page? This Probably will not work right with more than one view on a page."
-            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, warning)
-        
-        # > Find the note's Paperspace location
-        noteCP_transformed = []
-        if _noteLocations.BranchCount > 0:
-            for eachCP in _noteLocations.Branch(branchNum):
-                noteCP_transformed.append( ghc.Transform(eachCP, dtlViewTransforms[0]) )
-            
-            txtBoxes = [] # the note bounding boxes
-            for noteNum, eachNote in enumerate(_notesToBake.Branch(branchNum)):
-                txtBox = bakeText(_txt=eachNote,
-                        _txtLocation=noteCP_transformed[noteNum],
-                        _layer=tempLayer_Notes,
-                        _txtSize=float(noteTxtSize_),
-                        _neighbors=txtBoxes,
-                        _avoidCollisions=True)
-                txtBoxes.append( txtBox )
-        
-        # > Layout Page Titleblock Text Objects
-        if titleBlockTxtToBake_.BranchCount > 0:
-            for i, txtItem in enumerate( titleBlockTxtToBake_.Branch(branchNum) ):
-                bakeText(_txt = txtItem,
-                    _txtLocation = titleBlockTxtLocatons_.Branch(0)[i],
-                    _layer=tempLayer_TitleBlock,
-                    _txtSize=3.4,
-                    _avoidCollisions=False)
-        
-        # > Layout Page Table Objects
-        if _tablesToBake.BranchCount > 0:
-            for table in _tablesToBake.Branch(branchNum):
-                for k, cell in table.Cells.items():
-                    bakeText(_txt=str(cell.ValueFormated),
-                        _txtLocation=cell.Location,
-                        _layer=tempLayer_Notes,
-                        _txtSize=cell.TextHeight,
-                        _avoidCollisions=False)
+        bakeSheet(branchNum, branch, tempLayer_Geom, tempLayer_Notes, tempLayer_TitleBlock)
         
         # > Export the PDF
         createSinglePDF(sc.doc.Views.ActiveView, _saveFolder, fileNames[branchNum]) # Export to PDF
         
         # Delete the baked Geometry and the Temporary Layer(s)
-        sc.doc = Rhino.RhinoDoc.ActiveDoc
-        rs.DeleteObjects(rs.ObjectsByLayer(tempLayer_Geom))
-        rs.DeleteObjects(rs.ObjectsByLayer(tempLayer_Notes))
-        rs.DeleteObjects(rs.ObjectsByLayer(tempLayer_TitleBlock))
         removeTempLayer(tempLayer_Geom)
         removeTempLayer(tempLayer_Notes)
         removeTempLayer(tempLayer_TitleBlock)
+    
+    # Turn all the Layers back to original Visibilities
+    allLayersReset(layerVis)
+    
+    sc.doc = ghdoc
+
+## Bake all the sheets once, then print them all into a single multi-page PDF
+if _print and _viewName and _saveFolder and _geomToBake and multiPagePDF:
+    setActiveViewByName(_viewName) # Set to the View to be exported
+    detailViewLayers = findAllDetailViewLayers() # Find the layers to leave on
+    layerVis = getLayerVisibilities() # Record the starting state, just once
+    
+    # Bake------
+    # Each sheet gets its own set of sub-layers under one temporary parent layer
+    tempLayer_Parent = createTempLayer()
+    sheetLayers = []
+    for branchNum, branch in enumerate(_geomToBake.Branches):
+        tempLayer_Notes = createTempLayer(tempLayer_Parent)
+        tempLayer_Geom = createTempLayer(tempLayer_Parent)
+        tempLayer_TitleBlock = createTempLayer(tempLayer_Parent)
+        sheetLayers.append( [tempLayer_Geom, tempLayer_Notes, tempLayer_TitleBlock] )
         
-        # Turn all the Layers back to original Visibilities
-        allLayersReset(layerVis)
-        
-        sc.doc = ghdoc
+        bakeSheet(branchNum, branch, tempLayer_Geom, tempLayer_Notes, tempLayer_TitleBlock)
+    
+    # Print------
+    # Only the sheet's own sub-layers (and the designated layers) are on for each page
+    pdf = Rhino.FileIO.FilePdf.Create()
+    setActiveViewByName(_viewName)
+    for branchNum in range(_geomToBake.BranchCount):
+        setOutputLayerVis(detailViewLayers + [tempLayer_Parent] + sheetLayers[branchNum], getSheetLayersOn(branchNum))
+        addPDFPage(pdf, sc.doc.Views.ActiveView)
+    
+    if fileName_:
+        pdfFileName = str(fileName_[0]).replace(" ", "_")
+    else:
+        pdfFileName = fileNames[0].rsplit('_', 1)[0]
+    pdf.Write( getOutputFolder(_saveFolder) + pdfFileName + '.pdf' )
+    print 'Wrote {} pages to: {}.pdf'.format(_geomToBake.BranchCount, pdfFileName)
+    
+    # Delete all the baked Geometry and the Temporary Layer(s), just once
+    for eachSheetLayers in sheetLayers:
+        for eachLayer in eachSheetLayers:
+            removeTempLayer(eachLayer)
+    removeTempLayer(tempLayer_Parent)
+    
+    # Turn all the Layers back to original Visibilities
+    allLayersReset(layerVis)
+    
+    sc.doc = ghdoc
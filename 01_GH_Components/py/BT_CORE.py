@@ -51,8 +51,13 @@ import Rhino
 import json
 import random
 import re
+import os
+import hashlib
+import zipfile
+import cPickle as pickle
 from contextlib import contextmanager
-from collections import namedtuple
+from collections import namedtuple, defaultdict, OrderedDict
+from array import array
 
 #-------------------------------------------------------------------------------
 ##########    From HB    ###########
@@ -648,45 +653,110 @@ def preview(classObj):
 #-------------------------------------------------------------------------------
 ############    Def    #############
 
-def phpp_geomFromVerts(_idfObj):
-    """
-    Takes in an IDF Class Object and reads the Vertex information
-    Builds new geometry from the vertex data provided
+SrfcGeomData = namedtuple('SrfcGeomData', ['Area', 'Centroid', 'Normal', 'Width', 'Height', 'Tilt'])
+
+def phpp_geomDataFromVerts(_verts):
+    """ Calcs a planar polygon's geometric data from its Vertices using plain math (no Rhino / GH geometry)
+    
+    Uses Newell's method for the area and normal. The Width / Height are the
+    dimensions of the bounding rectangle in the surface's own plane, with
+    'Width' running horizontally (for horizontal surfaces it runs along world-X)
     
     Args:
-        _idfObj: An IDF-Class Object from the IDF-Reader with some Vertex data to read
-    Returns (list): 
-        0: boundary (Polyline) the perimeter edges built from the vertex points
-        1: srfc (Surface) the new surface built from the vertext points
-        2: surfaceArea (m2)
-        3: centroid (Point3d)
-        4: normalVector (Vector3d) Normal for the new surface
+        _verts (list): A flat list (or array) of the Vertex coordinates [x1, y1, z1, x2, y2, z2, ...]
+    Returns (SrfcGeomData):
+        Area: (m2)
+        Centroid: (x, y, z) tuple
+        Normal: (x, y, z) unit vector tuple, following the Vertex order (right hand rule)
+        Width: (m)
+        Height: (m)
+        Tilt: Angle (Degrees) between the Normal and world-Z. 0=facing up, 90=vertical, 180=facing down
     """
     
-    vertsTXT = []
-    vertsGH = []
-    vertNumber = []
-    for eachKey in _idfObj.__dict__.keys():
-        if 'Vertex' in eachKey:
-            numOnly = [int(i) for i in eachKey.split() if i.isdigit()] # Pulls num from "!- X,Y,Z Vertex 1 {m}"
-            numOnly = numOnly[0]
-            vertNumber.append( '{:03d}'.format(numOnly) )
-            vertsTXT.append([eachKey, getattr(_idfObj, eachKey)])
+    pts = [(_verts[i], _verts[i+1], _verts[i+2]) for i in range(0, len(_verts) - 2, 3)]
+    numPts = len(pts)
+    if numPts < 3:
+        return SrfcGeomData(0, pts[0] if pts else (0, 0, 0), (0, 0, 1), 0, 0, 0)
+    
+    # Newell's method for the polygon's normal
+    nX = nY = nZ = 0.0
+    for i in range(numPts):
+        x1, y1, z1 = pts[i]
+        x2, y2, z2 = pts[(i + 1) % numPts]
+        nX += (y1 - y2) * (z1 + z2)
+        nY += (z1 - z2) * (x1 + x2)
+        nZ += (x1 - x2) * (y1 + y2)
+    
+    magnitude = math.sqrt(nX * nX + nY * nY + nZ * nZ)
+    area = magnitude / 2
+    if magnitude == 0:
+        nX, nY, nZ = 0.0, 0.0, 1.0
+    else:
+        nX, nY, nZ = nX / magnitude, nY / magnitude, nZ / magnitude
+    
+    # Area-weighted centroid from a triangle fan off the first point
+    aX, aY, aZ = pts[0]
+    cX = cY = cZ = weights = 0.0
+    for i in range(1, numPts - 1):
+        bX, bY, bZ = pts[i]
+        dX, dY, dZ = pts[i + 1]
+        u = (bX - aX, bY - aY, bZ - aZ)
+        v = (dX - aX, dY - aY, dZ - aZ)
+        w = ((u[1] * v[2] - u[2] * v[1]) * nX + (u[2] * v[0] - u[0] * v[2]) * nY + (u[0] * v[1] - u[1] * v[0]) * nZ) / 2
+        cX += w * (aX + bX + dX) / 3
+        cY += w * (aY + bY + dY) / 3
+        cZ += w * (aZ + bZ + dZ) / 3
+        weights += w
+    
+    if weights != 0:
+        centroid = (cX / weights, cY / weights, cZ / weights)
+    else:
+        centroid = tuple( sum(pt[j] for pt in pts) / numPts for j in range(3) )
+    
+    # In-plane axes. X runs horizontal (world-Z x Normal) unless the surface is horizontal
+    xX, xY = -nY, nX
+    xLen = math.sqrt(xX * xX + xY * xY)
+    if xLen < 1e-9:
+        xX, xY, xZ = 1.0, 0.0, 0.0
+    else:
+        xX, xY, xZ = xX / xLen, xY / xLen, 0.0
+    yX, yY, yZ = nY * xZ - nZ * xY, nZ * xX - nX * xZ, nX * xY - nY * xX
+    
+    us = [pt[0] * xX + pt[1] * xY + pt[2] * xZ for pt in pts]
+    vs = [pt[0] * yX + pt[1] * yY + pt[2] * yZ for pt in pts]
+    width = max(us) - min(us)
+    height = max(vs) - min(vs)
+    
+    tilt = math.degrees( math.acos( max(-1.0, min(1.0, nZ)) ) )
+    
+    return SrfcGeomData(area, centroid, (nX, nY, nZ), width, height, tilt)
+
+def phpp_geomDataFromVertsBulk(_vertsList):
+    """ Calcs the geometric data for a whole list of surfaces in one go. See phpp_geomDataFromVerts()
+    
+    Args:
+        _vertsList (list): A list of flat Vertex lists (or arrays), one for each surface
+    Returns:
+        (list): A SrfcGeomData for each surface, in the same order
+    """
     
-    # Order verts using Vertex number as the key
-    verst_orderd = [x for _,x in sorted(zip(vertNumber, vertsTXT))]
+    return [phpp_geomDataFromVerts(verts) for verts in _vertsList]
+
+def phpp_geomFromPoints(_points):
+    """ Builds the Rhino geometry for a surface from its (x, y, z) Vertex points
     
-    for eachVert in verst_orderd:
-        vertXYZ = eachVert[1].split(' ') # Create a list of the Vert positions only
-        vertsGH.append( ghc.ConstructPoint(vertXYZ[0], vertXYZ[1], vertXYZ[2]) )
+    Args:
+        _points (list): The surface's (x, y, z) Vertex tuples, in order
+    Returns (list):
+        0: boundary (Polyline) the perimeter edges built from the vertex points
+        1: srfc (Surface) the new surface built from the vertext points
+    """
     
+    vertsGH = [ghc.ConstructPoint(vertX, vertY, vertZ) for vertX, vertY, vertZ in _points]
     boundary = ghc.PolyLine(vertsGH, True) # Create Closed PLine of the srfc boundary
     srfc = ghc.BoundarySurfaces(boundary) # Create the Surface Boundary from edge
-    surfaceArea = ghc.Area(srfc)[0]  # Get the Surface Area (m2)
-    centroid = ghc.Area(srfc)[1]
-    normalVector = ghc.EvaluateSurface(srfc, centroid)[1]
     
-    return boundary, srfc, surfaceArea, centroid, normalVector
+    return boundary, srfc
 
 def phpp_calcNorthAngle(_objNormVec, _refNorthVec):
     """ Takes in a Surface's Normal Vector and the project's north angle vector and computes the angle 0--360 between
@@ -819,6 +889,208 @@ def phpp_makeHBConstruction(_nm, _layer1, _layer2=None, _layer3=None):
     
     return constructionStr
 
+PHPP_LIB_TYPES = ('PHPP_lib_Glazing', 'PHPP_lib_Frame', 'PHPP_lib_Assmbly', 'PHPP_lib_TB', 'PHPP_lib_PsiInstall')
+PHPP_LIB_REVISION_KEY = 'PHPP_lib_Revision'
+
+class PHPP_DocLibrary:
+    """The Rhino Document UserText component / thermal bridge libraries, parsed once.
+    
+    Every 'PHPP_lib_...' entry is json-loaded a single time into a dict of
+    {Name: params} for each library type. The parsed data is re-used until the
+    Document's library revision changes. The 'PHPP_EditComponentLibrary' and
+    'PHPP_EditTBLibrary' Rhino commands bump the revision (PHPP_lib_Revision)
+    whenever they write. Switching documents, or adding / removing UserText
+    keys, also triggers a re-load.
+    
+    Note: the entry dicts returned are shared. Don't modify them.
+    """
+    
+    def __init__(self):
+        self.revision = None
+        self.libs = dict( (libType, {}) for libType in PHPP_LIB_TYPES )
+        self.errors = []
+        self.loads = 0
+    
+    def _docStrings(self):
+        doc = Rhino.RhinoDoc.ActiveDoc
+        return doc, (doc.Strings if doc else None)
+    
+    def currentRevision(self):
+        """Returns the (doc serial number, library revision, number of UserText keys)"""
+        
+        doc, strings = self._docStrings()
+        if strings is None:
+            return None
+        
+        return (doc.RuntimeSerialNumber, strings.GetValue(PHPP_LIB_REVISION_KEY), strings.Count)
+    
+    def refresh(self, _force=False):
+        """Re-loads the libraries from the Document UserText, if the revision has changed """
+        
+        revision = self.currentRevision()
+        if revision == self.revision and not _force:
+            return self
+        
+        self.libs = dict( (libType, {}) for libType in PHPP_LIB_TYPES )
+        self.errors = []
+        
+        doc, strings = self._docStrings()
+        if strings is not None:
+            for i in range(strings.Count):
+                key = strings.GetKey(i)
+                libType = next((t for t in PHPP_LIB_TYPES if key.startswith(t)), None)
+                if libType is None:
+                    continue
+                
+                try:
+                    d = json.loads( strings.GetValue(i) )
+                    name = d.get('Name', d.get('Typename'))
+                    self.libs[libType][name] = d
+                except:
+                    self.errors.append(key)
+        
+        self.revision = revision
+        self.loads += 1
+        
+        return self
+    
+    def getLib(self, _libType):
+        """Returns the {Name: params} dict for the library type, ie: 'PHPP_lib_TB' """
+        
+        return self.refresh().libs.get(_libType, {})
+    
+    def getEntry(self, _libType, _name, _default=None):
+        """Returns the params dict for a single named library entry"""
+        
+        return self.getLib(_libType).get(_name, _default)
+    
+    def __unicode__(self):
+        return u"A PHPP Document Library Object: < {} >".format(
+                ', '.join('{}: {}'.format(k, len(v)) for k, v in sorted(self.libs.items())))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}()".format(self.__class__.__name__)
+
+def phpp_getDocLibrary():
+    """ Returns the session's shared PHPP_DocLibrary, refreshed if the Document library changed """
+    
+    docLib = sc.sticky.get('IDF2PHPP_DocLibraryCache')
+    if not isinstance(docLib, PHPP_DocLibrary):
+        docLib = PHPP_DocLibrary()
+        sc.sticky['IDF2PHPP_DocLibraryCache'] = docLib
+    
+    return docLib.refresh()
+
+class PHPP_UserTextRecord:
+    """A Rhino object's Name and complete Attribute UserText, as read by a PHPP_UserTextSnapshot"""
+    
+    def __init__(self, _guid=None, _name=None, _attrs=None):
+        self.GUID = _guid
+        self.Name = _name
+        self.Attrs = _attrs if _attrs is not None else {}
+    
+    def get(self, _key, _type=None, _default=None):
+        """Returns the UserText value for the key, or the default if not found
+        
+        Args:
+            _key (str): The UserText key to look for
+            _type (str): None to return the raw value, or 'str' / 'float' to convert it
+            _default: The value to return if the key isn't found
+        """
+        
+        val = self.Attrs.get(_key)
+        if val is None:
+            return _default
+        
+        if _type == 'float':
+            return float(val)
+        elif _type == 'str':
+            return str(val)
+        
+        return val
+    
+    def __unicode__(self):
+        return u"A PHPP UserText Record: < {} | {} keys >".format(self.Name, len(self.Attrs))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _guid={!r}, _name={!r}, _attrs={!r})".format(
+                self.__class__.__name__,
+                self.GUID,
+                self.Name,
+                self.Attrs)
+
+class PHPP_UserTextSnapshot:
+    """The Attribute UserText of a set of Rhino objects, read in a single pass.
+    
+    Rather than calling rs.IsUserText / rs.GetUserText (and swapping sc.doc) for
+    every key of every object, all the key/values for the whole list of objects
+    are pulled from the Active Document at once. Anything asked for which isn't in
+    the snapshot yet is read in when first needed.
+    
+    Args:
+        _guids (list): The Rhino object GUIDs to read. Non-GUID items are ignored.
+    """
+    
+    def __init__(self, _guids=None):
+        self.records = {}
+        if _guids:
+            self.add(_guids)
+    
+    def add(self, _guids):
+        """Reads the Name and UserText for each of the objects not already in the snapshot"""
+        
+        doc = Rhino.RhinoDoc.ActiveDoc
+        
+        for each in _guids:
+            try:
+                guid = rs.coerceguid(each)
+            except:
+                guid = None
+            
+            if guid is None or str(guid) in self.records:
+                continue
+            
+            rhObj = doc.Objects.FindId(guid) if doc else None
+            if rhObj is None:
+                self.records[str(guid)] = PHPP_UserTextRecord(guid)
+                continue
+            
+            userStrings = rhObj.Attributes.GetUserStrings()
+            attrs = dict( (k, userStrings.Get(k)) for k in userStrings.AllKeys )
+            self.records[str(guid)] = PHPP_UserTextRecord(guid, rhObj.Attributes.Name, attrs)
+        
+        return self
+    
+    def record(self, _guid):
+        """Returns the PHPP_UserTextRecord for the object (an empty record if it isn't a Rhino object)"""
+        
+        try:
+            guid = rs.coerceguid(_guid)
+        except:
+            guid = None
+        
+        if guid is None:
+            return PHPP_UserTextRecord()
+        
+        if str(guid) not in self.records:
+            self.add([guid])
+        
+        return self.records[str(guid)]
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def __unicode__(self):
+        return u"A PHPP UserText Snapshot: < {} objects >".format(len(self.records))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _guids={!r})".format(
+                self.__class__.__name__,
+                [rec.GUID for rec in self.records.values()])
+
 def phpp_getWindowLibraryFromRhino():
     """ Loads any window object entries from the DocumentUseText library from the Active Rhino document 
     
@@ -839,56 +1111,56 @@ def phpp_getWindowLibraryFromRhino():
         # And make new Frame and Glass Objects. Add all of em' to new dictionaries
         if rs.IsDocumentUserText():
             print 'Getting Window Library data from the Rhino Document'
-            for eachKey in rs.GetDocumentUserText():
-                if 'PHPP_lib_Glazing' in eachKey:
-                    tempDict = json.loads(rs.GetDocumentUserText(eachKey))
-                    newGlazingObject = PHPP_Glazing(
-                                    tempDict['Name'],
-                                    tempDict['gValue'],
-                                    tempDict['uValue']
-                                    )
-                    lib_GlazingTypes[tempDict['Name']] = newGlazingObject
-                elif '_PsiInstall_' in eachKey:
-                    tempDict = json.loads(rs.GetDocumentUserText(eachKey))
-                    newPsiInstallObject = PHPP_Window_Install(
-                                    [
-                                    tempDict['Left'],
-                                    tempDict['Right'],
-                                    tempDict['Bottom'],
-                                    tempDict['Top']
-                                    ]
-                                    )
-                    lib_PsiInstalls[tempDict['Typename']] = newPsiInstallObject
-                elif 'PHPP_lib_Frame' in eachKey:
-                    tempDict = json.loads(rs.GetDocumentUserText(eachKey))
-                    newFrameObject = PHPP_Frame(
-                                    tempDict['Name'],
-                                    [
-                                    tempDict['uFrame_L'],
-                                    tempDict['uFrame_R'],
-                                    tempDict['uFrame_B'],
-                                    tempDict['uFrame_T']
-                                    ],
-                                    [
-                                    tempDict['wFrame_L'],
-                                    tempDict['wFrame_R'],
-                                    tempDict['wFrame_B'],
-                                    tempDict['wFrame_T']
-                                    ],
-                                    [
-                                    tempDict['psiG_L'],
-                                    tempDict['psiG_R'],
-                                    tempDict['psiG_B'],
-                                    tempDict['psiG_T']
-                                    ],
-                                    [
-                                    tempDict['psiInst_L'],
-                                    tempDict['psiInst_R'],
-                                    tempDict['psiInst_B'],
-                                    tempDict['psiInst_T']
-                                    ]
-                                    )
-                    lib_FrameTypes[tempDict['Name']] = newFrameObject
+            docLib = phpp_getDocLibrary()
+            
+            for name, tempDict in docLib.getLib('PHPP_lib_Glazing').items():
+                newGlazingObject = PHPP_Glazing(
+                                tempDict['Name'],
+                                tempDict['gValue'],
+                                tempDict['uValue']
+                                )
+                lib_GlazingTypes[name] = newGlazingObject
+            
+            for name, tempDict in docLib.getLib('PHPP_lib_PsiInstall').items():
+                newPsiInstallObject = PHPP_Window_Install(
+                                [
+                                tempDict['Left'],
+                                tempDict['Right'],
+                                tempDict['Bottom'],
+                                tempDict['Top']
+                                ]
+                                )
+                lib_PsiInstalls[name] = newPsiInstallObject
+            
+            for name, tempDict in docLib.getLib('PHPP_lib_Frame').items():
+                newFrameObject = PHPP_Frame(
+                                tempDict['Name'],
+                                [
+                                tempDict['uFrame_L'],
+                                tempDict['uFrame_R'],
+                                tempDict['uFrame_B'],
+                                tempDict['uFrame_T']
+                                ],
+                                [
+                                tempDict['wFrame_L'],
+                                tempDict['wFrame_R'],
+                                tempDict['wFrame_B'],
+                                tempDict['wFrame_T']
+                                ],
+                                [
+                                tempDict['psiG_L'],
+                                tempDict['psiG_R'],
+                                tempDict['psiG_B'],
+                                tempDict['psiG_T']
+                                ],
+                                [
+                                tempDict['psiInst_L'],
+                                tempDict['psiInst_R'],
+                                tempDict['psiInst_B'],
+                                tempDict['psiInst_T']
+                                ]
+                                )
+                lib_FrameTypes[name] = newFrameObject
             
             PHPPLibrary_['lib_GlazingTypes'] = lib_GlazingTypes
             PHPPLibrary_['lib_FrameTypes'] = lib_FrameTypes
@@ -942,6 +1214,96 @@ def phpp_createSrfcHBMatAndConst(_constName, _conductance, _intInsul):
     
     return newHBMat, newHBMat_Mass, constructionName, new_EPConstruction
 
+#-------------------------------------------------------------------------------
+###### Unit Conversion ####
+# {SI Unit: {Unit you Want: (scale, offset, reciprocal)}}
+# Converted value is: value*scale + offset, or if reciprocal: scale/value + offset
+PHPP_UNIT_SCHEMA = {
+        'C'    : {'F':(1.8, 32, False)},
+        'LITER': {'GALLON':(0.264172, 0, False)},
+        'MM'   : {'M':(0.001, 0, False), 'CM':(0.1, 0, False), 'FT':(1/304.8, 0, False), 'IN':(1/25.4, 0, False)},
+        'CM'   : {'M':(0.01, 0, False), 'FT':(1/30.48, 0, False), 'IN':(1/2.54, 0, False)},
+        'M'    : {'CM':(100, 0, False), 'MM':(1000, 0, False), 'FT':(3.280839895, 0, False), 'IN':(1/0.0254, 0, False)},
+        'M/DAY': {'FT/DAY':(3.280839895, 0, False)},
+        'M2'   : {'FT2':(10.76391042, 0, False)},
+        'M3'   : {'FT3':(35.31466672, 0, False)},
+        'M3/H' : {'CFM':(0.588577779, 0, False)},
+        'WH/M3': {'W/CFM':(1.699010796, 0, False)},
+        'WH/KM2':{'BTU/FT2':(0.176110159, 0, False)},
+        'MJ/M3K':{'BTU/FT3-F':(14.91066014, 0, False)},
+        'W/M2K': {'BTU/HR-FT2-F':(0.176110159, 0, False), 'HR-FT2-F/BTU':(5.678264134, 0, True)},
+        'M2K/W': {'HR-FT2-F/BTU':(5.678264134, 0, False)},
+        'W/MK' : {'HR-FT2-F/BTU-IN':(0.144227909, 0, True), 'BTU/HR-FT-F':(0.577789236, 0, False)},
+        'W/K'  : {'BTU/HR-F':(1.895633976, 0, False)},
+        'KW'   : {'BTU/H':(3412.141156, 0, False)},
+        'W/W'  : {'BTU/HW':(3.412141156, 0, False)}, # SEER
+        }
+
+# The IP unit meant by a user input of just 'IP', for each SI unit
+PHPP_UNIT_IP = {'W/M2K':'BTU/HR-FT2-F', 'W/MK':'BTU/HR-FT-F'}
+
+def phpp_compileUnitConversions(_schema):
+    """ Flattens the unit schema into a lookup table of numeric conversions, both directions
+    
+    Args:
+        _schema (dict): {SI Unit: {Unit: (scale, offset, reciprocal)}}
+    Returns:
+        (dict): {(From Unit, To Unit): (scale, offset, reciprocal)} Only real conversions
+            are included, anything not found needs no conversion.
+    """
+    
+    conversions = {}
+    inverses = {}
+    for unitFrom, unitsTo in _schema.items():
+        for unitTo, (scale, offset, reciprocal) in unitsTo.items():
+            conversions[(unitFrom, unitTo)] = (float(scale), float(offset), reciprocal)
+            
+            if not reciprocal:
+                inverses[(unitTo, unitFrom)] = (1.0/scale, -float(offset)/scale, False)
+            elif offset == 0:
+                inverses[(unitTo, unitFrom)] = (float(scale), 0.0, True)
+    
+    for key, conversion in inverses.items():
+        conversions.setdefault(key, conversion)
+    
+    return conversions
+
+PHPP_UNIT_CONVERSIONS = phpp_compileUnitConversions(PHPP_UNIT_SCHEMA)
+
+def phpp_convertValue(_value, _conversion):
+    """ Converts a single value with a compiled unit conversion
+    
+    Numbers are converted directly. Numeric strings ('12', '0.5') are read in as
+    numbers first. Anything else (text, formulas, None) is returned as-is.
+    
+    Args:
+        _value: The value to convert
+        _conversion (tuple): The (scale, offset, reciprocal) from PHPP_UNIT_CONVERSIONS, or
+            None for no conversion
+    Returns:
+        The converted value
+    """
+    
+    if not isinstance(_value, (int, long, float)):
+        try:
+            _value = int(_value)
+        except (TypeError, ValueError):
+            try:
+                _value = float(_value)
+            except (TypeError, ValueError):
+                return _value
+    
+    if not _conversion:
+        return _value
+    
+    scale, offset, reciprocal = _conversion
+    try:
+        if reciprocal:
+            return scale / _value + offset
+        return _value * scale + offset
+    except ZeroDivisionError:
+        return _value
+
 def phpp_convertValueToMetric(_inputString, _outputUnit):
     """ Will convert a string such as "12 FT" into the corresponding Metric unit
     
@@ -949,14 +1311,6 @@ def phpp_convertValueToMetric(_inputString, _outputUnit):
         _inputString: String: The input value from the user
         _outputUnit: String: ('M', 'CM', 'MM', 'W/M2K', 'W/MK', 'M3') The desired unit
     """
-    schema = {
-                'M':{'SI': 1, 'M':1, 'CM':0.01, 'MM':0.001, 'FT':0.3048, "'":0.3048, 'IN':0.0254, '"':0.0254},
-                'CM':{'SI': 1, 'M':100, 'CM':1, 'MM':0.1, 'FT':30.48, "'":30.48, 'IN':2.54, '"':2.54},
-                'MM':{'SI': 1, 'M':1000, 'CM':10, 'MM':1, 'FT':304.8, "'":304.8, 'IN':25.4, '"':25.4},
-                'W/M2K':{'SI':1, 'IP':5.678264134}, # IP=Btu/hr-sf-F
-                'W/MK':{'SI':1, 'IP':1.730734908}, #IP=Btu/hr-ft-F
-                'M3':{'SI':1, 'FT3':0.028316847},
-              }
     
     inputValue = _inputString
     
@@ -974,8 +1328,10 @@ def phpp_convertValueToMetric(_inputString, _outputUnit):
                     break # so it will only take the first number found, "123 ft3" doesn't work otherwise
             
             inputUnit = phpp_findInputStringUnit(_inputString)
-            conversionFactor = schema.get(_outputUnit, {}).get(inputUnit, 1)
-            return float(inputValue) * float(conversionFactor)
+            if inputUnit == 'IP':
+                inputUnit = PHPP_UNIT_IP.get(_outputUnit, inputUnit)
+            conversion = PHPP_UNIT_CONVERSIONS.get((inputUnit, _outputUnit))
+            return float(phpp_convertValue(float(inputValue), conversion))
         except:
             return inputValue
 
@@ -1003,6 +1359,248 @@ def phpp_findInputStringUnit(_in):
     
     return inputUnit
 
+#-------------------------------------------------------------------------------
+###### Shading Geometry Search ####
+class PHPP_ShadingBVH:
+    """A bounding-box hierarchy over the shading geometry, built once per run.
+    
+    The window shading searches test every check-line / intersection-surface
+    against the scene. Rather than running BrepXCurve / BrepXBrep on every
+    shading Brep, the searches ask the hierarchy for only those Breps whose
+    bounding boxes overlap the query geometry's box. Candidates are always
+    returned in their original input order so the results match a flat scan.
+    
+    Args:
+        _shadingGeom (list): The shading Breps to index. None items are ignored.
+        _leafSize (int): Max number of Breps held in a leaf node. Default=4
+        _tol (float): Amount (model units) the query boxes are grown by. Default=0.001
+    """
+    
+    def __init__(self, _shadingGeom, _leafSize=4, _tol=0.001):
+        self.geometry = [geom for geom in _shadingGeom if geom is not None]
+        self.leafSize = max(1, int(_leafSize))
+        self.tol = _tol
+        
+        # Flat node arrays: bounds, then either children (left, right) or a leaf item list
+        self._nodeMin = []
+        self._nodeMax = []
+        self._nodeChildren = []
+        self._nodeItems = []
+        self._itemMin = []
+        self._itemMax = []
+        
+        # Each search makes several queries per window, so the stats are kept per
+        # query: the number of queries, and the total candidates returned by them
+        self.queries = 0
+        self.tested = 0
+        
+        items = []
+        for i, geom in enumerate(self.geometry):
+            bbox = geom.GetBoundingBox(True)
+            mn = (bbox.Min.X, bbox.Min.Y, bbox.Min.Z)
+            mx = (bbox.Max.X, bbox.Max.Y, bbox.Max.Z)
+            ctr = ((mn[0]+mx[0])*0.5, (mn[1]+mx[1])*0.5, (mn[2]+mx[2])*0.5)
+            items.append( (i, mn, mx, ctr) )
+            self._itemMin.append(mn)
+            self._itemMax.append(mx)
+        
+        if items:
+            self._build(items)
+    
+    def _build(self, _items):
+        """Recursively adds a node for the items, splitting at the median of the longest axis"""
+        
+        mn = tuple( min(item[1][k] for item in _items) for k in range(3) )
+        mx = tuple( max(item[2][k] for item in _items) for k in range(3) )
+        
+        nodeID = len(self._nodeMin)
+        self._nodeMin.append(mn)
+        self._nodeMax.append(mx)
+        self._nodeChildren.append(None)
+        self._nodeItems.append(None)
+        
+        if len(_items) <= self.leafSize:
+            self._nodeItems[nodeID] = [item[0] for item in _items]
+            return nodeID
+        
+        extents = [mx[k] - mn[k] for k in range(3)]
+        axis = extents.index(max(extents))
+        _items.sort(key=lambda item: item[3][axis])
+        mid = len(_items) // 2
+        
+        left = self._build(_items[:mid])
+        right = self._build(_items[mid:])
+        self._nodeChildren[nodeID] = (left, right)
+        
+        return nodeID
+    
+    def _boundsOf(self, _geom):
+        """Returns the (min, max) tuples for any Rhino geometry, Line or BoundingBox"""
+        
+        if isinstance(_geom, Rhino.Geometry.BoundingBox):
+            bbox = _geom
+        elif hasattr(_geom, 'GetBoundingBox'):
+            bbox = _geom.GetBoundingBox(True)
+        else:
+            bbox = _geom.BoundingBox
+        
+        t = self.tol
+        return ( (bbox.Min.X-t, bbox.Min.Y-t, bbox.Min.Z-t),
+                 (bbox.Max.X+t, bbox.Max.Y+t, bbox.Max.Z+t) )
+    
+    def query(self, _geom):
+        """Finds the shading Breps whose bounding box overlaps the geometry's box
+        
+        Args:
+            _geom: The query geometry (Line, Curve, Surface, Brep or BoundingBox)
+        Returns:
+            candidates (list): The shading Breps to test, in input order
+        """
+        
+        self.queries += 1
+        if not self._nodeMin:
+            return []
+        
+        qMin, qMax = self._boundsOf(_geom)
+        def _overlaps(mn, mx):
+            return not (mn[0] > qMax[0] or mx[0] < qMin[0] or
+                        mn[1] > qMax[1] or mx[1] < qMin[1] or
+                        mn[2] > qMax[2] or mx[2] < qMin[2])
+        
+        hits = []
+        stack = [0]
+        while stack:
+            nodeID = stack.pop()
+            if not _overlaps(self._nodeMin[nodeID], self._nodeMax[nodeID]):
+                continue
+            
+            children = self._nodeChildren[nodeID]
+            if children is None:
+                hits.extend( i for i in self._nodeItems[nodeID]
+                            if _overlaps(self._itemMin[i], self._itemMax[i]) )
+            else:
+                stack.extend(children)
+        
+        hits.sort()
+        self.tested += len(hits)
+        
+        return [self.geometry[i] for i in hits]
+    
+    def resetStats(self):
+        self.queries = 0
+        self.tested = 0
+    
+    def __len__(self):
+        return len(self.geometry)
+    
+    def __unicode__(self):
+        return u"A PHPP Shading BVH Object: < {} Breps, {} nodes >".format(len(self.geometry), len(self._nodeMin))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _shadingGeom={!r}, _leafSize={!r}, _tol={!r})".format(
+                self.__class__.__name__,
+                self.geometry,
+                self.leafSize,
+                self.tol)
+
+class PHPP_ZoneIndex:
+    """A uniform XY grid over the HB Zone bounding boxes, built once per run.
+    
+    Finding the host zone for a TFA surface used to run ShapeInBrep against 
+    every zone in turn. For a zone to contain the surface, its box has to 
+    contain the surface's box, so only those zones (found through the grid cell
+    under the surface's center) get the exact containment test.
+    
+    Args:
+        _zones (list): The Honeybee Zone objects (with .name and .geometry)
+        _tol (float): Amount (model units) the zone boxes are grown by. Default=0.001
+    """
+    
+    def __init__(self, _zones, _tol=0.001):
+        self.zones = list(_zones)
+        self.tol = _tol
+        self.tested = 0
+        self.pruned = 0
+        
+        self._zoneMin = []
+        self._zoneMax = []
+        for zone in self.zones:
+            bbox = zone.geometry.GetBoundingBox(True)
+            self._zoneMin.append( (bbox.Min.X-_tol, bbox.Min.Y-_tol, bbox.Min.Z-_tol) )
+            self._zoneMax.append( (bbox.Max.X+_tol, bbox.Max.Y+_tol, bbox.Max.Z+_tol) )
+        
+        # Size the grid cells off the average zone footprint
+        if self.zones:
+            spans = [max(mx[0]-mn[0], mx[1]-mn[1]) for mn, mx in zip(self._zoneMin, self._zoneMax)]
+            self.cellSize = max(sum(spans) / len(spans), 0.01)
+        else:
+            self.cellSize = 1.0
+        
+        self._grid = {}
+        for i, (mn, mx) in enumerate(zip(self._zoneMin, self._zoneMax)):
+            for ix in range(self._cell(mn[0]), self._cell(mx[0])+1):
+                for iy in range(self._cell(mn[1]), self._cell(mx[1])+1):
+                    self._grid.setdefault((ix, iy), []).append(i)
+    
+    def _cell(self, _v):
+        return int(math.floor(_v / self.cellSize))
+    
+    def candidates(self, _geom):
+        """Returns the zones whose bounding box fully contains the geometry's box, in input order
+        
+        Args:
+            _geom: The Rhino geometry to find candidate host zones for
+        Returns:
+            zones (list): The candidate Honeybee Zone objects
+        """
+        
+        bbox = _geom.GetBoundingBox(True)
+        ctr = bbox.Center
+        
+        found = []
+        for i in self._grid.get( (self._cell(ctr.X), self._cell(ctr.Y)), [] ):
+            mn, mx = self._zoneMin[i], self._zoneMax[i]
+            if (mn[0] <= bbox.Min.X and mn[1] <= bbox.Min.Y and mn[2] <= bbox.Min.Z and
+                mx[0] >= bbox.Max.X and mx[1] >= bbox.Max.Y and mx[2] >= bbox.Max.Z):
+                found.append(i)
+        
+        self.tested += len(found)
+        self.pruned += len(self.zones) - len(found)
+        
+        return [self.zones[i] for i in found]
+    
+    def __iter__(self):
+        return iter(self.zones)
+    
+    def __len__(self):
+        return len(self.zones)
+    
+    def __unicode__(self):
+        return u"A PHPP Zone Index Object: < {} Zones, {} grid cells >".format(len(self.zones), len(self._grid))
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _zones={!r}, _tol={!r})".format(
+                self.__class__.__name__,
+                self.zones,
+                self.tol)
+
+def phpp_shadingCandidates(_shadingGeom, _queryGeom):
+    """Returns the shading objects that could intersect the query geometry
+    
+    Args:
+        _shadingGeom: Either a PHPP_ShadingBVH or a plain list of shading Breps
+        _queryGeom: The check-line or intersection surface to test with
+    Returns:
+        candidates (list): The BVH candidates, or the full list if not a BVH
+    """
+    
+    if isinstance(_shadingGeom, PHPP_ShadingBVH):
+        return _shadingGeom.query(_queryGeom)
+    
+    return list(_shadingGeom)
+
 #-------------------------------------------------------------------------------
 ###### Classes for PHPP Objects ####
 class PHPP_WindowObject:
@@ -1048,7 +1646,12 @@ class PHPP_WindowObject:
         self.Azimuth = phpp_calcNorthAngle(self.SurfaceNormal, ghc.UnitY(1)) # Assumes Y is North, should get this from Zone....
     
     def calcShadingDims_Simple(self, _shadingGeom, _limit=99):
-        """ Finds PHPP-Style dimensions to relevant shading objects """
+        """ Finds PHPP-Style dimensions to relevant shading objects
+        
+        Args:
+            _shadingGeom: A list of shading Breps, or a PHPP_ShadingBVH built over them
+            _limit: (float) A number (m) to limit the shading search to. Default = 99m
+        """
         
         ShadingDims = namedtuple('ShadingDims', ['Horizon', 'Overhang', 'Reveal'])
         if _shadingGeom is None:
@@ -1073,39 +1676,29 @@ class PHPP_WindowObject:
         self.ShadingDimensions = ShadingDims(horizon, overhang, reveal)
         return self.ShadingDimensions
     
-    def calcShadingFactor_Simple(self, _lat=40, _shadingGeom=None, _limit=None):
+    def getShadingInputs(self):
+        # The window's shading dimensions and orientation, as needed by PHPP_Window_Shading_Calculator
+        return WindowShadingInputs(self.ShadingDimensions.Horizon.h_hori, self.ShadingDimensions.Horizon.d_hori,
+                                   self.ShadingDimensions.Overhang.o_over, self.ShadingDimensions.Overhang.d_over,
+                                   self.ShadingDimensions.Reveal.o_reveal, self.ShadingDimensions.Reveal.d_reveal,
+                                   self.AngleFromHoriz, self.Azimuth, self.GlazingWidth, self.GlazingHeight)
+    
+    def calcShadingFactor_Simple(self, _lat=40, _shadingGeom=None, _limit=None, _calculator=None):
         # ----------------------------------------------------------------------
         # Calc the Shading Factors based on the geometry found in the scene
         # This re-creates the PHPP v9.6a shading factor algortithms. I think Andrew Peel made these algorithms?
+        # Pass in a _calculator to share its latitude factors between windows
         
         if not hasattr(self, 'ShadingDimensions'):
             self.calcShadingDims_Simple(_shadingGeom, _limit)
         
-        calculator = PHPP_Window_Shading_Calculator(_lat)
-        
-        winter_Horiz = calculator.Winter_HorizShadingFactor(self.ShadingDimensions.Horizon.h_hori,
-                                                            self.ShadingDimensions.Horizon.d_hori, 
-                                                            self.AngleFromHoriz, self.Azimuth, self.GlazingHeight )
-        summer_Horiz = calculator.Summer_HorizShadingFactor(self.ShadingDimensions.Horizon.h_hori, 
-                                                            self.ShadingDimensions.Horizon.d_hori,
-                                                            self.AngleFromHoriz, self.Azimuth, self.GlazingHeight )
-        
-        winter_Overhead = calculator.Winter_OverhangShadingFactor(self.ShadingDimensions.Overhang.o_over,
-                                                                  self.ShadingDimensions.Overhang.d_over,
-                                                                  self.AngleFromHoriz, self.Azimuth, self.GlazingHeight  )
-        summer_Overhead = calculator.Summer_OverhangShadingFactor(self.ShadingDimensions.Overhang.o_over,
-                                                                  self.ShadingDimensions.Overhang.d_over,
-                                                                  self.AngleFromHoriz, self.Azimuth, self.GlazingHeight  )
-        
-        winter_Reveal = calculator.Winter_RevealShadingFactor(self.ShadingDimensions.Reveal.o_reveal,
-                                                              self.ShadingDimensions.Reveal.d_reveal,
-                                                              self.AngleFromHoriz, self.Azimuth, self.GlazingWidth)
-        summer_Reveal = calculator.Summer_RevealShadingFactor(self.ShadingDimensions.Reveal.o_reveal,
-                                                              self.ShadingDimensions.Reveal.d_reveal,
-                                                              self.AngleFromHoriz, self.Azimuth, self.GlazingWidth)
-        
-        winter = winter_Horiz * winter_Overhead * winter_Reveal
-        summer = summer_Horiz * summer_Overhead * summer_Reveal
+        if _calculator is None:
+            _calculator = PHPP_Window_Shading_Calculator(_lat)
+        
+        factors = _calculator.calcShadingFactors( [self.getShadingInputs()] )[0]
+        
+        winter = factors.Winter_Horiz * factors.Winter_Overhang * factors.Winter_Reveal
+        summer = factors.Summer_Horiz * factors.Summer_Overhang * factors.Summer_Reveal
         return winter, summer
     
     def getShadingDims_Simple(self):
@@ -1274,7 +1867,7 @@ class PHPP_WindowObject:
     def findHorizonShadingValues(self, _shadingGeom, _extents=99):
         """
         Arguments:
-            _shadingGeom: (list) A list of possible shading objects to test against
+            _shadingGeom: (list | PHPP_ShadingBVH) The possible shading objects to test against
             _extents: (float) A number (m) to limit the shading search to. Default = 99m
         Returns:
             h_hori: Distance (m) out from the glazing surface of any horizontal shading objects found
@@ -1294,7 +1887,7 @@ class PHPP_WindowObject:
         
         HorizontalLine = ghc.LineSDL(ShadingOrigin, self.SurfaceNormal, _extents)
         VerticalLine = ghc.LineSDL(ShadingOrigin, UpVector, _extents)
-        for shadingObj in _shadingGeom:
+        for shadingObj in phpp_shadingCandidates(_shadingGeom, HorizontalLine):
             if ghc.BrepXCurve(shadingObj, HorizontalLine).points != None:
                 HorizonShading.append( shadingObj )
         
@@ -1304,6 +1897,10 @@ class PHPP_WindowObject:
         IntersectionCurve = []
         IntersectionPoints = []
         
+        if isinstance(_shadingGeom, PHPP_ShadingBVH) and HorizonShading:
+            srfcCandidates = set( id(x) for x in _shadingGeom.query(IntersectionSurface) )
+            HorizonShading = [x for x in HorizonShading if id(x) in srfcCandidates]
+        
         for shadingObj in HorizonShading:
             if ghc.BrepXBrep(shadingObj, IntersectionSurface).curves != None:
                 IntersectionCurve.append(ghc.BrepXBrep(shadingObj, IntersectionSurface))
@@ -1368,8 +1965,8 @@ class PHPP_WindowObject:
         edge2 = ghc.LineSDL(ShadingOrigin, self.getSurfaceNormal(self.GlazingSrfc), depth)
         intersectionTestPlane = ghc.SumSurface(edge1, edge2)
         
-        OverhangShadingObjs = (x for x in _shadingGeom 
-                        if ghc.BrepXBrep(intersectionTestPlane, x).curves != None)
+        OverhangShadingObjs = [x for x in phpp_shadingCandidates(_shadingGeom, intersectionTestPlane)
+                        if ghc.BrepXBrep(intersectionTestPlane, x).curves != None]
         
         #-----------------------------------------------------------------------
         # Using the filtered set of shading objects, find the 'edges' of shading 
@@ -1380,6 +1977,10 @@ class PHPP_WindowObject:
         VerticalLine = ghc.LineSDL(ShadingOrigin, UpVector, _extents)
         
         IntersectionSurface = ghc.SumSurface(HorizontalLine, VerticalLine)
+        if isinstance(_shadingGeom, PHPP_ShadingBVH) and OverhangShadingObjs:
+            srfcCandidates = set( id(x) for x in _shadingGeom.query(IntersectionSurface) )
+            OverhangShadingObjs = [x for x in OverhangShadingObjs if id(x) in srfcCandidates]
+        
         IntersectionCurves = (ghc.BrepXBrep(obj, IntersectionSurface).curves 
                                 for obj in OverhangShadingObjs
                                 if ghc.BrepXBrep(obj, IntersectionSurface).curves != None)
@@ -1481,15 +2082,15 @@ class PHPP_WindowObject:
         Side1_RevealShaderObjs = []
         testStartPt = ghc.Move(WinCenter, ghc.Amplitude(self.SurfaceNormal, 0.1)).geometry #Offsets the test line just a bit
         Side1_TesterLine = ghc.LineSDL(testStartPt, Side1_Direction, _extents) #extend a line off to side 1
-        for i in range(len(_shadingGeom)):
-            if ghc.BrepXCurve(_shadingGeom[i],Side1_TesterLine).points != None:
-                Side1_RevealShaderObjs.append(_shadingGeom[i])
+        for shadingObj in phpp_shadingCandidates(_shadingGeom, Side1_TesterLine):
+            if ghc.BrepXCurve(shadingObj, Side1_TesterLine).points != None:
+                Side1_RevealShaderObjs.append(shadingObj)
         
         Side2_RevealShaderObjs = []
         Side2_TesterLine = ghc.LineSDL(testStartPt, Side2_Direction, _extents) #extend a line off to side 2
-        for i in range(len(_shadingGeom)):
-            if ghc.BrepXCurve(_shadingGeom[i],Side2_TesterLine).points != None:
-                Side2_RevealShaderObjs.append(_shadingGeom[i])
+        for shadingObj in phpp_shadingCandidates(_shadingGeom, Side2_TesterLine):
+            if ghc.BrepXCurve(shadingObj, Side2_TesterLine).points != None:
+                Side2_RevealShaderObjs.append(shadingObj)
         
         NumShadedSides = 0
         if len(Side1_RevealShaderObjs) != 0:
@@ -1659,17 +2260,59 @@ class PHPP_WindowObject:
                self.Type_Variant,
                self.InstallDepth)
 
+WindowShadingInputs = namedtuple('WindowShadingInputs', ['h_hori', 'd_hori', 'o_over', 'd_over', 'o_reveal', 'd_reveal',
+                                                         'Tilt', 'Azimuth', 'GlazingWidth', 'GlazingHeight'])
+WindowShadingFactors = namedtuple('WindowShadingFactors', ['Winter_Horiz', 'Winter_Overhang', 'Winter_Reveal',
+                                                           'Summer_Horiz', 'Summer_Overhang', 'Summer_Reveal'])
+
 class PHPP_Window_Shading_Calculator():
     global __e
     __e = 2.71828182845904
     
     def __init__(self, _lat=40):
         self.Latitude = _lat
+        self._latFactors = {}
     
-    def Winter_HorizShadingFactor(self, h_hori, d_hori, Tilt, Azimuth, GlazingHeight):
-        if h_hori is None or d_hori is None:
-            return 1
+    def getLatitudeFactors(self, _method):
+        """ Returns the latitude dependent factors for one of the shading factor methods
+        
+        These only depend on self.Latitude, so are calculated the first time
+        they're needed and then re-used for every window after that.
+        
+        Args:
+            _method (str): 'Winter_Horiz', 'Winter_Reveal', 'Winter_Overhang', 'Summer_Horiz', ...
+        Returns:
+            (tuple): hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a, perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a
+        """
+        
+        key = (_method, self.Latitude)
+        if key not in self._latFactors:
+            self._latFactors[key] = getattr(self, '_latFactors_' + _method)()
+        return self._latFactors[key]
+    
+    def calcShadingFactors(self, _windows):
+        """ Calcs all six shading factors for a whole set of windows in one call
+        
+        Args:
+            _windows (list): A WindowShadingInputs tuple (or any tuple in the same order) for each window:
+                (h_hori, d_hori, o_over, d_over, o_reveal, d_reveal, Tilt, Azimuth, GlazingWidth, GlazingHeight)
+        Returns:
+            (list): A WindowShadingFactors tuple for each window, in the same order
+        """
+        
+        factors = []
+        for h_hori, d_hori, o_over, d_over, o_reveal, d_reveal, tilt, azimuth, width, height in _windows:
+            factors.append( WindowShadingFactors(
+                    self.Winter_HorizShadingFactor(h_hori, d_hori, tilt, azimuth, height),
+                    self.Winter_OverhangShadingFactor(o_over, d_over, tilt, azimuth, height),
+                    self.Winter_RevealShadingFactor(o_reveal, d_reveal, tilt, azimuth, width),
+                    self.Summer_HorizShadingFactor(h_hori, d_hori, tilt, azimuth, height),
+                    self.Summer_OverhangShadingFactor(o_over, d_over, tilt, azimuth, height),
+                    self.Summer_RevealShadingFactor(o_reveal, d_reveal, tilt, azimuth, width) ) )
         
+        return factors
+    
+    def _latFactors_Winter_Horiz(self):
         #Set up the Horiz Constants
         hor_m1 = [0.011953348, 0.011953348, 0.001476536, 0.001476536, -0.001307563, -0.001307563]
         hor_b1 = [-0.261997475, -0.261997475, 0.490848602, 0.490848602, 0.883715765, 0.883715765]
@@ -1685,15 +2328,6 @@ class PHPP_Window_Shading_Calculator():
         perp_b2 = [0.662706638, 0.662706638, -0.686205976, -0.686205976, -1.651987505, -1.651987505]
         perp_Deg2 = 90
         
-        # Clean inputs
-        if d_hori == 0:
-            hh_dh = 1
-        else:
-            hh_dh = (h_hori / d_hori)
-        
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        V_Factor_hori = 1
-        
         #Set up the Horizontal Factors
         if self.Latitude <= hor_Deg1:
             hor_S_r = hor_m1[0] * self.Latitude + hor_b1[0]
@@ -1748,72 +2382,24 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5]* self.Latitude + perp_b2[5]
         
-        #hor1 Factor Calcs
-        if Azimuth_down == 0:
-            hor1 = hor_N_r + (1 - hor_N_r) / (1 + hh_dh**2)**hor_N_a
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r + (1 - hor_S_r) / (1 + hh_dh**2)**hor_S_a
-        else:
-            hor1 = hor_OW_r + (1 - hor_OW_r) / (1 + hh_dh**2)**hor_OW_a
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
+    
+    def _latFactors_Winter_Reveal(self):
+        #Set up the Horiz Constants
+        hor_m1 = [-0.000548191, -0.000548191, -0.000559231, -0.000559231, -0.000548195, -0.000548195]
+        hor_b1 = [0.813773754, 0.813773754, 0.863835221, 0.863835221, 0.813773898, 0.813773898]
+        hor_Deg1 = 90
+        hor_m2 = [-0.0038284, -0.0038284, -0.012573537, -0.012573537, -0.003828399, -0.003828399]
+        hor_b2 = [-0.262761285, -0.262761285, -0.13186139, -0.13186139, -0.262761072, -0.262761072]
+        hor_Deg2 = 90
         
-        #hor2 Factor Calcs
-        if Azimuth_down == 270:
-            hor2 = hor_N_r + (1 - hor_N_r) / (1 + hh_dh**2)**hor_N_a
-        elif Azimuth_down == 90:
-            hor2 = hor_S_r + (1 - hor_S_r) / (1 + hh_dh**2)**hor_S_a
-        else:
-            hor2 = hor_OW_r + (1 - hor_OW_r) / (1 + hh_dh**2)**hor_OW_a
-        
-        #Calc Senk1 Factor
-        if Azimuth_down == 0:
-            senk1 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
-        elif Azimuth_down == 180:
-            senk1 = perp_S_r + (1 - perp_S_r) / (1 + hh_dh**2)**perp_S_a
-        else:
-            senk1 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
-        
-        #Calc Senk2 Factor
-        if Azimuth_down == 270:
-            senk2 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
-        elif Azimuth_down == 90:
-            senk2 = perp_S_r + (1 - perp_S_r) / (1 + hh_dh**2)**perp_S_a
-        else:
-            senk2 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
-        
-        #Calc main Factors
-        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1 - math.cos(2 * (Azimuth - Azimuth_down)*(math.pi/180)))
-        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1 - math.cos(2 * (Azimuth - Azimuth_down) * (math.pi/180)))
-        
-        if math.sin(math.radians(Tilt)) != 0:
-            x = 1 - h_hori / GlazingHeight /abs(math.sin(math.radians(Tilt)))
-        else:
-            x = 0
-        V_Factor_hori = max(ipol_hor + 1/2 *(ipol_senk - ipol_hor) * (1-math.cos(2 * Tilt * (math.pi/180))), x)
-        
-        return V_Factor_hori
-    
-    def Winter_RevealShadingFactor(self, o_reveal, d_reveal, Tilt, Azimuth, GlazingWidth):
-        if o_reveal is None or d_reveal is None:
-            return 1
-        
-        #Calc the first values
-        Ti = o_reveal /(0.5 * GlazingWidth + d_reveal)
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        
-        #Set up the Horiz Constants
-        hor_m1 = [-0.000548191, -0.000548191, -0.000559231, -0.000559231, -0.000548195, -0.000548195]
-        hor_b1 = [0.813773754, 0.813773754, 0.863835221, 0.863835221, 0.813773898, 0.813773898]
-        hor_Deg1 = 90
-        hor_m2 = [-0.0038284, -0.0038284, -0.012573537, -0.012573537, -0.003828399, -0.003828399]
-        hor_b2 = [-0.262761285, -0.262761285, -0.13186139, -0.13186139, -0.262761072, -0.262761072]
-        hor_Deg2 = 90
-        
-        perp_m1 = [0.001198624, 0.001198624, 0.000748647, 0.000748647, 0.000212172, 0.000212173]
-        perp_b1 = [0.792233903, 0.792233903, 0.771014921, 0.771014921, 0.605894803, 0.605894803]
-        perp_Deg1 = 90
-        perp_m2 = [0.005799242, 0.005799242, -0.005084283, -0.005084283, 0.00009799056, 0.00009799056]
-        perp_b2 = [-0.547245304, -0.547245304, -0.293059757, -0.293059757, -0.500894234, -0.500894234]
-        perp_Deg2 = 90
+        perp_m1 = [0.001198624, 0.001198624, 0.000748647, 0.000748647, 0.000212172, 0.000212173]
+        perp_b1 = [0.792233903, 0.792233903, 0.771014921, 0.771014921, 0.605894803, 0.605894803]
+        perp_Deg1 = 90
+        perp_m2 = [0.005799242, 0.005799242, -0.005084283, -0.005084283, 0.00009799056, 0.00009799056]
+        perp_b2 = [-0.547245304, -0.547245304, -0.293059757, -0.293059757, -0.500894234, -0.500894234]
+        perp_Deg2 = 90
         
         #Set up the Horizontal Factors
         if self.Latitude <= hor_Deg1:
@@ -1869,53 +2455,10 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5] * self.Latitude + perp_b2[5]
         
-        #Calc hori1
-        if Azimuth_down == 0:
-            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc hori2
-        if Azimuth_down == 270:
-            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 90:
-            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc senk1
-        if Azimuth_down == 0:
-            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 180:
-            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc senk2
-        if Azimuth_down == 270:
-            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 90:
-            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc the shading Factor
-        ipol_hor = hor1 +1/2* (hor1 - hor2)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
-        ipol_senk = senk1 +1/2* (senk2 - senk1)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
-        V_Factor_Reveal = ipol_hor + 1/2 * (ipol_senk - ipol_hor) * (1 - math.cos( 2* Tilt * (math.pi/180)))
-        
-        return V_Factor_Reveal
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
     
-    def Winter_OverhangShadingFactor(self, o_over, d_over, Tilt, Azimuth, GlazingHeight):
-        if o_over is None or d_over is None:
-            return 1
-        
-        #Set Up Input Values
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        Ti = o_over / (0.5 * GlazingHeight + d_over)
-        
+    def _latFactors_Winter_Overhang(self):
         #Set up the Horiz Constants
         hor_m1 = [0.001283722, 0.001283722, 0.000100694, 0.000100694, -0.00122305, -0.00122305]
         hor_b1 = [0.145829537, 0.145829537, 0.450066972, 0.450066972, 0.808786341, 0.808786341]
@@ -1985,58 +2528,11 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5] * self.Latitude + perp_b2[5]
         
-        #Calc hori1
-        if Azimuth_down == 0:
-            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc hori2
-        if Azimuth_down == 270:
-            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 90:
-            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc senk1
-        if Azimuth_down == 0:
-            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 180:
-            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc senk2
-        if Azimuth_down == 270:
-            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 90:
-            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc the Shading Factors
-        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1-math.cos(2* (Azimuth - Azimuth_down) * (math.pi/180)))
-        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1-math.cos(2* (Azimuth - Azimuth_down) * (math.pi/180)))
-        V_Factor_Overhang = ipol_hor + 1/2 * (ipol_senk - ipol_hor)*(1-math.cos(2* Tilt * (math.pi/180)))
-        
-        return V_Factor_Overhang
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
     
-    def Summer_HorizShadingFactor(self, h_hori, d_hori, Tilt, Azimuth, GlazingHeight):
-        if h_hori is None or d_hori is None:
-            return 1
-        
-        #Clean Input Values
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        
-        if d_hori == 0:
-            hh_dh = 1
-        else:
-            hh_dh = (h_hori / d_hori)
-       
-       #Set up the Horiz Constants
+    def _latFactors_Summer_Horiz(self):
+        #Set up the Horiz Constants
         hor_m1 = [0.011087354, 0.011087354, -0.000357811, -0.000357811, -0.021768375, 0.001776364]
         hor_b1 = [0.245266666, 0.245266666, 0.439737536, 0.439737536, 0.813891468, 0.060265281]
         hor_Deg1 = [90, 90, 30, 90]
@@ -2105,58 +2601,10 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5] * self.Latitude + perp_b2[5]
         
-        #Calc hor1
-        if Azimuth_down == 0:
-            hor1 = hor_N_r * __e**(hor_N_a * hh_dh) + 1 - hor_N_r
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r * __e**(hor_S_a * hh_dh) + 1 - hor_S_r
-        else:
-            hor1 = hor_OW_r * __e**(hor_OW_a * hh_dh) + 1 - hor_OW_r
-        
-        #Calc hor2
-        if Azimuth_down == 270:
-            hor2 = hor_N_r * __e**(hor_N_a * hh_dh) + 1 - hor_N_r
-        elif Azimuth_down == 90:
-            hor2 = hor_S_r * __e**(hor_S_a * hh_dh) + 1 - hor_S_r
-        else:
-            hor2 = hor_OW_r * __e**(hor_OW_a * hh_dh) + 1 - hor_OW_r
-        
-        #Calc senk1
-        if Azimuth_down == 0:
-            senk1 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
-        elif Azimuth_down == 180:
-            senk1 = perp_S_r * __e**(perp_S_a * hh_dh) + 1 - perp_S_r
-        else:
-            senk1 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
-        
-        #Calc senk2
-        if Azimuth_down == 270:
-            senk2 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
-        elif Azimuth_down == 90:
-            senk2 = perp_S_r * __e**(perp_S_a * hh_dh) + 1 - perp_S_r
-        else:
-            senk2 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
-        
-        #Calc main Factors
-        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1 - math.cos(2 * (Azimuth - Azimuth_down)*(math.pi/180)))
-        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1 - math.cos(2 * (Azimuth - Azimuth_down) * (math.pi/180)))
-        
-        if math.sin(math.radians(Tilt)) != 0:
-            x = 1 - h_hori / GlazingHeight /abs(math.sin(math.radians(Tilt)))
-        else:
-            x = 0
-        V_Factor_hori = max(ipol_hor + 1/2 *(ipol_senk - ipol_hor) * (1-math.cos(2 * Tilt * (math.pi/180))), x)
-        
-        return V_Factor_hori
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
     
-    def Summer_RevealShadingFactor(self, o_reveal, d_reveal, Tilt, Azimuth, GlazingWidth):
-        if o_reveal is None or d_reveal is None:
-            return 1
-            
-        #Calc the first values
-        Ti = o_reveal /(0.5 * GlazingWidth + d_reveal)
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        
+    def _latFactors_Summer_Reveal(self):
         #Set up the Horiz Constants
         hor_m1 = [0.000104144, 0.000104144, 0.00015311, 0.00015311, 0.000104139, 0.000104139]
         hor_b1 = [0.787949282, 0.787949282, 0.877404098, 0.877404098, 0.787949573,0.787949573]
@@ -2226,54 +2674,10 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5] * self.Latitude + perp_b2[5]
         
-        #Calc hori1
-        if Azimuth_down == 0:
-            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc hori2
-        if Azimuth_down == 270:
-            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 90:
-            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
-        
-        #Calc senk1
-        if Azimuth_down == 0:
-            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 180:
-            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc senk2
-        if Azimuth_down == 270:
-            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
-        elif Azimuth_down == 90:
-            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
-        else:
-            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
-        
-        #Calc the shading Factor
-        ipol_hor = hor1 +1/2* (hor1 - hor2)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
-        ipol_senk = senk1 +1/2* (senk2 - senk1)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
-        V_Factor_Reveal = ipol_hor + 1/2 * (ipol_senk - ipol_hor) * (1 - math.cos( 2* Tilt * (math.pi/180)))
-        
-        return V_Factor_Reveal
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
     
-    def Summer_OverhangShadingFactor(self, o_over, d_over, Tilt, Azimuth, GlazingHeight):
-        if o_over is None or d_over is None:
-            return 1
-        
-        #Set Up Input Values
-        Azimuth_down = (int(Azimuth % 360) / 90) * 90
-        Ti = o_over / (0.5 * GlazingHeight + d_over)
-        Tu = o_over / (0.5 * GlazingHeight + d_over)
-        
+    def _latFactors_Summer_Overhang(self):
         #Set up the Horiz Constants
         hor_m1 = [-0.021486491, 0.002099882, 0.0000210709, 0.0000210709,0.023887087, -0.005637176]
         hor_b1 = [0.819347035, 0.081454448, 0.459193968, 0.459193968, 0.098922183, 1.092256566]
@@ -2343,15 +2747,91 @@ class PHPP_Window_Shading_Calculator():
         else:
             perp_N_a = perp_m2[5] * self.Latitude + perp_b2[5]
         
-        #Calc hori1
-        if Azimuth_down == 0:
-            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
-        elif Azimuth_down == 180:
-            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
-        else:
-            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        return (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+                perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a)
+    
+    def Winter_HorizShadingFactor(self, h_hori, d_hori, Tilt, Azimuth, GlazingHeight):
+        if h_hori is None or d_hori is None:
+            return 1
         
-        #Calc hori2
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Winter_Horiz')
+        
+        # Clean inputs
+        if d_hori == 0:
+            hh_dh = 1
+        else:
+            hh_dh = (h_hori / d_hori)
+        
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
+        V_Factor_hori = 1
+        
+        #hor1 Factor Calcs
+        if Azimuth_down == 0:
+            hor1 = hor_N_r + (1 - hor_N_r) / (1 + hh_dh**2)**hor_N_a
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r + (1 - hor_S_r) / (1 + hh_dh**2)**hor_S_a
+        else:
+            hor1 = hor_OW_r + (1 - hor_OW_r) / (1 + hh_dh**2)**hor_OW_a
+        
+        #hor2 Factor Calcs
+        if Azimuth_down == 270:
+            hor2 = hor_N_r + (1 - hor_N_r) / (1 + hh_dh**2)**hor_N_a
+        elif Azimuth_down == 90:
+            hor2 = hor_S_r + (1 - hor_S_r) / (1 + hh_dh**2)**hor_S_a
+        else:
+            hor2 = hor_OW_r + (1 - hor_OW_r) / (1 + hh_dh**2)**hor_OW_a
+        
+        #Calc Senk1 Factor
+        if Azimuth_down == 0:
+            senk1 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
+        elif Azimuth_down == 180:
+            senk1 = perp_S_r + (1 - perp_S_r) / (1 + hh_dh**2)**perp_S_a
+        else:
+            senk1 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
+        
+        #Calc Senk2 Factor
+        if Azimuth_down == 270:
+            senk2 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
+        elif Azimuth_down == 90:
+            senk2 = perp_S_r + (1 - perp_S_r) / (1 + hh_dh**2)**perp_S_a
+        else:
+            senk2 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
+        
+        #Calc main Factors
+        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1 - math.cos(2 * (Azimuth - Azimuth_down)*(math.pi/180)))
+        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1 - math.cos(2 * (Azimuth - Azimuth_down) * (math.pi/180)))
+        
+        if math.sin(math.radians(Tilt)) != 0:
+            x = 1 - h_hori / GlazingHeight /abs(math.sin(math.radians(Tilt)))
+        else:
+            x = 0
+        V_Factor_hori = max(ipol_hor + 1/2 *(ipol_senk - ipol_hor) * (1-math.cos(2 * Tilt * (math.pi/180))), x)
+        
+        return V_Factor_hori
+    
+    def Winter_RevealShadingFactor(self, o_reveal, d_reveal, Tilt, Azimuth, GlazingWidth):
+        if o_reveal is None or d_reveal is None:
+            return 1
+        
+        #Calc the first values
+        Ti = o_reveal /(0.5 * GlazingWidth + d_reveal)
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
+        
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Winter_Reveal')
+        
+        #Calc hori1
+        if Azimuth_down == 0:
+            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc hori2
         if Azimuth_down == 270:
             hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
         elif Azimuth_down == 90:
@@ -2361,19 +2841,70 @@ class PHPP_Window_Shading_Calculator():
         
         #Calc senk1
         if Azimuth_down == 0:
-            senk1 = min(1, perp_N_r + ( 1 - perp_N_r) / (1 + Tu**2)**perp_N_a) #North
+            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
         elif Azimuth_down == 180:
-            senk1 = min(1, perp_S_r + ( 1 - perp_S_r) / (1 + Tu**2)**perp_S_a) #South
+            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
         else:
-            senk1 = min(1, perp_OW_r + ( 1 - perp_OW_r) / (1 + Tu**2)**perp_OW_a) #East / West
+            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
         
         #Calc senk2
         if Azimuth_down == 270:
-            senk2 = perp_N_r + ( 1 - perp_N_r) / (1 + Tu**2)**perp_N_a #North
+            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
         elif Azimuth_down == 90:
-            senk2 = perp_S_r + ( 1 - perp_S_r) / (1 + Tu**2)**perp_S_a #South
+            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
         else:
-            senk2 = perp_OW_r + ( 1 - perp_OW_r) / (1 + Tu**2)**perp_OW_a #East / West
+            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
+        
+        #Calc the shading Factor
+        ipol_hor = hor1 +1/2* (hor1 - hor2)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
+        ipol_senk = senk1 +1/2* (senk2 - senk1)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
+        V_Factor_Reveal = ipol_hor + 1/2 * (ipol_senk - ipol_hor) * (1 - math.cos( 2* Tilt * (math.pi/180)))
+        
+        return V_Factor_Reveal
+    
+    def Winter_OverhangShadingFactor(self, o_over, d_over, Tilt, Azimuth, GlazingHeight):
+        if o_over is None or d_over is None:
+            return 1
+        
+        #Set Up Input Values
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
+        Ti = o_over / (0.5 * GlazingHeight + d_over)
+        
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Winter_Overhang')
+        
+        #Calc hori1
+        if Azimuth_down == 0:
+            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc hori2
+        if Azimuth_down == 270:
+            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 90:
+            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc senk1
+        if Azimuth_down == 0:
+            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
+        elif Azimuth_down == 180:
+            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
+        else:
+            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
+        
+        #Calc senk2
+        if Azimuth_down == 270:
+            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
+        elif Azimuth_down == 90:
+            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
+        else:
+            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
         
         #Calc the Shading Factors
         ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1-math.cos(2* (Azimuth - Azimuth_down) * (math.pi/180)))
@@ -2381,106 +2912,269 @@ class PHPP_Window_Shading_Calculator():
         V_Factor_Overhang = ipol_hor + 1/2 * (ipol_senk - ipol_hor)*(1-math.cos(2* Tilt * (math.pi/180)))
         
         return V_Factor_Overhang
-
-class PHPP_Window_Install:
-    """ For storing the install conditions (0|1) of each edge in a window component """
     
-    def __init__(self, _installs):
-        """
-        Args:
-            _installs (list): A list of four 'install' types (Left, Right, Bottom, Top)
-        """
-        self.Installs = _installs
-        self.setInstalls()
+    def Summer_HorizShadingFactor(self, h_hori, d_hori, Tilt, Azimuth, GlazingHeight):
+        if h_hori is None or d_hori is None:
+            return 1
         
-    def setInstalls(self):
-        # In case the number of installs passed != 4, use the first one for all of them
-        if len(self.Installs) != 4:
-            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
-            self.Inst_R = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
-            self.Inst_B = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
-            self.Inst_T = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
-        else:
-            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
-            self.Inst_R = float(self.Installs[1]) if self.Installs[1] != None else 'Auto'
-            self.Inst_B = float(self.Installs[2]) if self.Installs[2] != None else 'Auto'
-            self.Inst_T = float(self.Installs[3]) if self.Installs[3] != None else 'Auto'
-    
-    def getAllasList(self):
-        # So can easily output all the items in a single list
-        return [int(self.Inst_L), int(self.Inst_R), int(self.Inst_B), int(self.Inst_T)]
-    
-    def __unicode__(self):
-        return u'A PHPP Style Window Install Object: < L={self.Inst_L} | R={self.Inst_R} | T={self.Inst_T} | B={self.Inst_B} >'.format(self=self)
-    
-    def __str__(self):
-        return unicode(self).encode('utf-8')
-    
-    def __repr__(self):
-       return "{}( _installs={!r} )".format(
-               self.__class__.__name__, self.Installs)
-
-class PHPP_Glazing:
-    """ For storing PHPP Style Glazing Parameters """
-    
-    def __init__(self, _nm, _gValue, _uValue):
-        """
-        Args:
-            _nm (str): The name of the glass type
-            _gValue (float): The g-Value (SHGC) value of the glass only as per EN 410 (%)
-            _uValue (float): The Thermal Trasmittance value of the center of glass (W/m2k) as per EN 673
-        """
-        self.Name = _nm
-        try:
-            self.gValue = float(_gValue)
-        except:
-            self.gValue = _gValue
+        #Clean Input Values
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
         
-        try:
-            self.uValue = float(_uValue)
-        except:
-            self.uValue = _uValue
+        if d_hori == 0:
+            hh_dh = 1
+        else:
+            hh_dh = (h_hori / d_hori)
+       
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Summer_Horiz')
         
+        #Calc hor1
+        if Azimuth_down == 0:
+            hor1 = hor_N_r * __e**(hor_N_a * hh_dh) + 1 - hor_N_r
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r * __e**(hor_S_a * hh_dh) + 1 - hor_S_r
+        else:
+            hor1 = hor_OW_r * __e**(hor_OW_a * hh_dh) + 1 - hor_OW_r
         
-    def __unicode__(self):
-        return u'A PHPP Style Glazing Object: < {self.Name} >'.format(self=self)
-    
-    def __str__(self):
-        return unicode(self).encode('utf-8')
-    
-    def __repr__(self):
-       return "{}( _nm={!r}, _gValue={!r}, _uValue={!r} )".format(
-               self.__class__.__name__,
-               self.Name,
-               self.gValue,
-               self.uValue)
-
-class PHPP_Frame:
-    """ For Storing PHPP Style Frame Parameters """
-    
-    def __init__(self, _nm, _uValues, _frameWidths, _psiGlazings, _psiInstalls, _chiGlassCarrier=None):
-        """
-        Args:
-            _nm (str): The name of the Frame Type
-            _uValues (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
-            _frameWidths (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
-            _psiGlazings (list): A list of the 4 Psi-Values (W/mk) for the glazing spacers (Left, Right, Bottom, Top)
-            _psiInstalls (list): A list of the 4 Psi-Values (W/mk) for the frame Installations (Left, Right, Bottom, Top)
-            _chiGlassCarrier (list): A value for the Chi-Value (W/k) of the glass carrier for curtain walls
-        """
-        self.Name = _nm
+        #Calc hor2
+        if Azimuth_down == 270:
+            hor2 = hor_N_r * __e**(hor_N_a * hh_dh) + 1 - hor_N_r
+        elif Azimuth_down == 90:
+            hor2 = hor_S_r * __e**(hor_S_a * hh_dh) + 1 - hor_S_r
+        else:
+            hor2 = hor_OW_r * __e**(hor_OW_a * hh_dh) + 1 - hor_OW_r
         
-        self.uValues = _uValues
-        self.frameWidths = _frameWidths
-        self.PsiGVals = _psiGlazings
-        self.PsiInstalls = _psiInstalls
-        self.chiGlassCarrier = _chiGlassCarrier
+        #Calc senk1
+        if Azimuth_down == 0:
+            senk1 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
+        elif Azimuth_down == 180:
+            senk1 = perp_S_r * __e**(perp_S_a * hh_dh) + 1 - perp_S_r
+        else:
+            senk1 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
         
-        self.cleanAttrSet(['uLeft', 'uRight', 'uBottom', 'uTop'], self.uValues)
-        self.cleanAttrSet(['fLeft', 'fRight', 'fBottom', 'fTop'], self.frameWidths)
-        self.cleanAttrSet(['psigLeft', 'psigRight', 'psigBottom', 'psigTop'], self.PsiGVals)
-        self.cleanAttrSet(['psiInstLeft', 'psiInstRight', 'psiInstBottom', 'psiInstTop'], self.PsiInstalls)
-    
+        #Calc senk2
+        if Azimuth_down == 270:
+            senk2 = perp_N_r * __e**(perp_N_a * hh_dh) + 1 - perp_N_r
+        elif Azimuth_down == 90:
+            senk2 = perp_S_r * __e**(perp_S_a * hh_dh) + 1 - perp_S_r
+        else:
+            senk2 = perp_OW_r * __e**(perp_OW_a * hh_dh) + 1 - perp_OW_r
+        
+        #Calc main Factors
+        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1 - math.cos(2 * (Azimuth - Azimuth_down)*(math.pi/180)))
+        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1 - math.cos(2 * (Azimuth - Azimuth_down) * (math.pi/180)))
+        
+        if math.sin(math.radians(Tilt)) != 0:
+            x = 1 - h_hori / GlazingHeight /abs(math.sin(math.radians(Tilt)))
+        else:
+            x = 0
+        V_Factor_hori = max(ipol_hor + 1/2 *(ipol_senk - ipol_hor) * (1-math.cos(2 * Tilt * (math.pi/180))), x)
+        
+        return V_Factor_hori
+    
+    def Summer_RevealShadingFactor(self, o_reveal, d_reveal, Tilt, Azimuth, GlazingWidth):
+        if o_reveal is None or d_reveal is None:
+            return 1
+            
+        #Calc the first values
+        Ti = o_reveal /(0.5 * GlazingWidth + d_reveal)
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
+        
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Summer_Reveal')
+        
+        #Calc hori1
+        if Azimuth_down == 0:
+            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc hori2
+        if Azimuth_down == 270:
+            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 90:
+            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc senk1
+        if Azimuth_down == 0:
+            senk1 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
+        elif Azimuth_down == 180:
+            senk1 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
+        else:
+            senk1 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
+        
+        #Calc senk2
+        if Azimuth_down == 270:
+            senk2 = perp_N_r * __e**(perp_N_a * Ti) + 1 - perp_N_r #North
+        elif Azimuth_down == 90:
+            senk2 = perp_S_r * __e**(perp_S_a * Ti) + 1 - perp_S_r #South
+        else:
+            senk2 = perp_OW_r * __e**(perp_OW_a * Ti) + 1 - perp_OW_r #East / West
+        
+        #Calc the shading Factor
+        ipol_hor = hor1 +1/2* (hor1 - hor2)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
+        ipol_senk = senk1 +1/2* (senk2 - senk1)*(1 - math.cos(2*(Azimuth - Azimuth_down) * (math.pi/180)))
+        V_Factor_Reveal = ipol_hor + 1/2 * (ipol_senk - ipol_hor) * (1 - math.cos( 2* Tilt * (math.pi/180)))
+        
+        return V_Factor_Reveal
+    
+    def Summer_OverhangShadingFactor(self, o_over, d_over, Tilt, Azimuth, GlazingHeight):
+        if o_over is None or d_over is None:
+            return 1
+        
+        #Set Up Input Values
+        Azimuth_down = (int(Azimuth % 360) / 90) * 90
+        Ti = o_over / (0.5 * GlazingHeight + d_over)
+        Tu = o_over / (0.5 * GlazingHeight + d_over)
+        
+        # Latitude dependent factors, only calculated once for each calculator
+        (hor_S_r, hor_OW_r, hor_N_r, hor_S_a, hor_OW_a, hor_N_a,
+        perp_S_r, perp_OW_r, perp_N_r, perp_S_a, perp_OW_a, perp_N_a) = self.getLatitudeFactors('Summer_Overhang')
+        
+        #Calc hori1
+        if Azimuth_down == 0:
+            hor1 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 180:
+            hor1 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor1 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc hori2
+        if Azimuth_down == 270:
+            hor2 = hor_N_r * __e**(hor_N_a * Ti) + 1 - hor_N_r #North
+        elif Azimuth_down == 90:
+            hor2 = hor_S_r * __e**(hor_S_a * Ti) + 1 - hor_S_r #South
+        else:
+            hor2 = hor_OW_r * __e**(hor_OW_a * Ti) + 1 - hor_OW_r #East / West
+        
+        #Calc senk1
+        if Azimuth_down == 0:
+            senk1 = min(1, perp_N_r + ( 1 - perp_N_r) / (1 + Tu**2)**perp_N_a) #North
+        elif Azimuth_down == 180:
+            senk1 = min(1, perp_S_r + ( 1 - perp_S_r) / (1 + Tu**2)**perp_S_a) #South
+        else:
+            senk1 = min(1, perp_OW_r + ( 1 - perp_OW_r) / (1 + Tu**2)**perp_OW_a) #East / West
+        
+        #Calc senk2
+        if Azimuth_down == 270:
+            senk2 = perp_N_r + ( 1 - perp_N_r) / (1 + Tu**2)**perp_N_a #North
+        elif Azimuth_down == 90:
+            senk2 = perp_S_r + ( 1 - perp_S_r) / (1 + Tu**2)**perp_S_a #South
+        else:
+            senk2 = perp_OW_r + ( 1 - perp_OW_r) / (1 + Tu**2)**perp_OW_a #East / West
+        
+        #Calc the Shading Factors
+        ipol_hor = hor1 + 1/2 * (hor2 - hor1) * (1-math.cos(2* (Azimuth - Azimuth_down) * (math.pi/180)))
+        ipol_senk = senk1 + 1/2 * (senk2 - senk1) * (1-math.cos(2* (Azimuth - Azimuth_down) * (math.pi/180)))
+        V_Factor_Overhang = ipol_hor + 1/2 * (ipol_senk - ipol_hor)*(1-math.cos(2* Tilt * (math.pi/180)))
+        
+        return V_Factor_Overhang
+
+class PHPP_Window_Install:
+    """ For storing the install conditions (0|1) of each edge in a window component """
+    
+    def __init__(self, _installs):
+        """
+        Args:
+            _installs (list): A list of four 'install' types (Left, Right, Bottom, Top)
+        """
+        self.Installs = _installs
+        self.setInstalls()
+        
+    def setInstalls(self):
+        # In case the number of installs passed != 4, use the first one for all of them
+        if len(self.Installs) != 4:
+            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_R = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_B = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_T = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+        else:
+            self.Inst_L = float(self.Installs[0]) if self.Installs[0] != None else 'Auto'
+            self.Inst_R = float(self.Installs[1]) if self.Installs[1] != None else 'Auto'
+            self.Inst_B = float(self.Installs[2]) if self.Installs[2] != None else 'Auto'
+            self.Inst_T = float(self.Installs[3]) if self.Installs[3] != None else 'Auto'
+    
+    def getAllasList(self):
+        # So can easily output all the items in a single list
+        return [int(self.Inst_L), int(self.Inst_R), int(self.Inst_B), int(self.Inst_T)]
+    
+    def __unicode__(self):
+        return u'A PHPP Style Window Install Object: < L={self.Inst_L} | R={self.Inst_R} | T={self.Inst_T} | B={self.Inst_B} >'.format(self=self)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    
+    def __repr__(self):
+       return "{}( _installs={!r} )".format(
+               self.__class__.__name__, self.Installs)
+
+class PHPP_Glazing:
+    """ For storing PHPP Style Glazing Parameters """
+    
+    def __init__(self, _nm, _gValue, _uValue):
+        """
+        Args:
+            _nm (str): The name of the glass type
+            _gValue (float): The g-Value (SHGC) value of the glass only as per EN 410 (%)
+            _uValue (float): The Thermal Trasmittance value of the center of glass (W/m2k) as per EN 673
+        """
+        self.Name = _nm
+        try:
+            self.gValue = float(_gValue)
+        except:
+            self.gValue = _gValue
+        
+        try:
+            self.uValue = float(_uValue)
+        except:
+            self.uValue = _uValue
+        
+        
+    def __unicode__(self):
+        return u'A PHPP Style Glazing Object: < {self.Name} >'.format(self=self)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    
+    def __repr__(self):
+       return "{}( _nm={!r}, _gValue={!r}, _uValue={!r} )".format(
+               self.__class__.__name__,
+               self.Name,
+               self.gValue,
+               self.uValue)
+
+class PHPP_Frame:
+    """ For Storing PHPP Style Frame Parameters """
+    
+    def __init__(self, _nm, _uValues, _frameWidths, _psiGlazings, _psiInstalls, _chiGlassCarrier=None):
+        """
+        Args:
+            _nm (str): The name of the Frame Type
+            _uValues (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
+            _frameWidths (list): A list of the 4 U-Values (W/m2k) for the frame sides (Left, Right, Bottom, Top)
+            _psiGlazings (list): A list of the 4 Psi-Values (W/mk) for the glazing spacers (Left, Right, Bottom, Top)
+            _psiInstalls (list): A list of the 4 Psi-Values (W/mk) for the frame Installations (Left, Right, Bottom, Top)
+            _chiGlassCarrier (list): A value for the Chi-Value (W/k) of the glass carrier for curtain walls
+        """
+        self.Name = _nm
+        
+        self.uValues = _uValues
+        self.frameWidths = _frameWidths
+        self.PsiGVals = _psiGlazings
+        self.PsiInstalls = _psiInstalls
+        self.chiGlassCarrier = _chiGlassCarrier
+        
+        self.cleanAttrSet(['uLeft', 'uRight', 'uBottom', 'uTop'], self.uValues)
+        self.cleanAttrSet(['fLeft', 'fRight', 'fBottom', 'fTop'], self.frameWidths)
+        self.cleanAttrSet(['psigLeft', 'psigRight', 'psigBottom', 'psigTop'], self.PsiGVals)
+        self.cleanAttrSet(['psiInstLeft', 'psiInstRight', 'psiInstBottom', 'psiInstTop'], self.PsiInstalls)
+    
     def cleanAttrSet(self, _inList, _attrList):
         # In case the input len != 4 and convert to float values
         if len(_attrList) != 4:
@@ -2781,8 +3475,9 @@ class PHPP_Sys_ExhaustVent:
                self.Duct01)
 
 class PHPP_TFA_Surface:
-    def __init__(self, _tfaSrfc,  _zoneBreps, _roomVentFlowRates, _inset=0, _offsetZ=0):
+    def __init__(self, _tfaSrfc,  _zoneBreps, _roomVentFlowRates, _inset=0, _offsetZ=0, _userText=None):
         self.ID = random.randint(1000,9999)
+        self.UserText = _userText # Optional PHPP_UserTextSnapshot shared by all the surfaces
         self.Neighbors = None
         self.InsetLen = _inset # meters
         self.OffsetZ = _offsetZ # meters
@@ -2873,7 +3568,13 @@ class PHPP_TFA_Surface:
         srfcInset = ghc.Move(srfcInset, ghc.UnitZ(0.01) )[0]   # Move it 'up' 10mm just a tiny bit off floor
         
         # Find which Honeybee Zone the TFA Surface is 'inside' of 
+        # If given a PHPP_ZoneIndex, only test the zones whose box could hold the surface
+        if isinstance(_zoneBreps, PHPP_ZoneIndex):
+            _zoneBreps = _zoneBreps.candidates(srfcInset)
+        
         foundHost = []
+        hostName = None
+        hostBrep = None
         for zone in _zoneBreps:
             inside = ghc.ShapeInBrep(zone.geometry, srfcInset) 
             if inside == 0: # 0=Inside, 1=Intersecting, 2=Outside
@@ -2919,37 +3620,32 @@ class PHPP_TFA_Surface:
         return (roomName, roomNum, roomTFAfactor, surface, area,
         centroid, Vent_Sup, Vent_Eta, Vent_Trans, nonResUse, lightingControl, motionControl )
     
-    def cleanGet(self, _GUID, _attr, _type=None):
-        sc.doc = Rhino.RhinoDoc.ActiveDoc
-        if rs.IsUserText(_GUID):
-            if _attr in rs.GetUserText(_GUID):
-                if _type=='float':
-                    output = float(rs.GetUserText(_GUID, _attr))
-                else:
-                    output = str(rs.GetUserText(_GUID, _attr))
-            else:
-                output = None
-        sc.doc = ghdoc
+    def getUserTextRecord(self, _GUID):
+        if self.UserText is None:
+            self.UserText = PHPP_UserTextSnapshot()
         
-        return output 
+        return self.UserText.record(_GUID)
+    
+    def cleanGet(self, _GUID, _attr, _type=None):
+        return self.getUserTextRecord(_GUID).get(_attr, _type or 'str')
     
     def getSrfcAttrsFromRhino(self, _srfcGUID, _ventRates):
         
         # Pull the Basic User-Text Attributes from the Rhino Scene
-        sc.doc = Rhino.RhinoDoc.ActiveDoc
-        roomName = rs.ObjectName(_srfcGUID)
-        roomNum = self.cleanGet(_srfcGUID, 'Room_Number')
-        roomTFAfactor = self.cleanGet(_srfcGUID, 'TFA_Factor')
+        userText = self.getUserTextRecord(_srfcGUID)
+        roomName = userText.Name
+        roomNum = userText.get('Room_Number', 'str')
+        roomTFAfactor = userText.get('TFA_Factor', 'str')
         
         # Get the Rhino Scene's Ventilation Flow Rates
-        roomVentSup = self.cleanGet(_srfcGUID, 'V_sup', _type='float')
-        roomVentExtr = self.cleanGet(_srfcGUID, 'V_eta', _type='float')
-        roomVentTrans = self.cleanGet(_srfcGUID, 'V_trans', _type='float')
+        roomVentSup = userText.get('V_sup', 'float')
+        roomVentExtr = userText.get('V_eta', 'float')
+        roomVentTrans = userText.get('V_trans', 'float')
         
         # Get Any non-Res attrs
-        roomNonResUse = self.cleanGet(_srfcGUID, 'useType')
-        roomNonResLightingControl = self.cleanGet(_srfcGUID, 'lighting')
-        roomNonResMotionControl = self.cleanGet(_srfcGUID, 'motion')
+        roomNonResUse = userText.get('useType', 'str')
+        roomNonResLightingControl = userText.get('lighting', 'str')
+        roomNonResMotionControl = userText.get('motion', 'str')
         
         # Get any GH Scene params as well. Overrider the Rhino Scene values
         if len(_ventRates)==3:
@@ -2961,8 +3657,6 @@ class PHPP_TFA_Surface:
             roomVentExtr = 'Automatic' if roomVentExtr==None else roomVentExtr
             roomVentTrans = 'Automatic' if roomVentTrans==None else roomVentTrans
         
-        sc.doc = ghdoc
-        
         return (roomName, roomNum, float(roomTFAfactor), roomVentSup, roomVentExtr,
         roomVentTrans, roomNonResUse, roomNonResLightingControl, roomNonResMotionControl)
     
@@ -3496,6 +4190,7 @@ class PHPP_grnd_FloorElement():
             weightedUvales = []
             
             sc.doc = Rhino.RhinoDoc.ActiveDoc
+            userText = PHPP_UserTextSnapshot(_flrSrfcs)
             for srfcGUID in _flrSrfcs:
                 # Get the Surface Area Params
                 srfcGeom = rs.coercebrep(srfcGUID)
@@ -3504,7 +4199,7 @@ class PHPP_grnd_FloorElement():
                     floorAreas.append( srfcArea )
                     
                     # Get the Surface U-Values Params
-                    srfcUvalue = self.getSrfcUvalue(srfcGUID)
+                    srfcUvalue = self.getSrfcUvalue(srfcGUID, userText)
                     weightedUvales.append(srfcUvalue * srfcArea )
                 else:
                     floorAreas.append( 1 )
@@ -3565,6 +4260,7 @@ class PHPP_grnd_FloorElement():
         
         if len(_perimCrvs)>0:
             sc.doc = Rhino.RhinoDoc.ActiveDoc
+            userText = PHPP_UserTextSnapshot(_perimCrvs)
             for crvGUID in _perimCrvs:
                 
                 # See if its just Numbers passed in. If so, use them and break out
@@ -3582,7 +4278,7 @@ class PHPP_grnd_FloorElement():
                     try:
                         crvPsiValue = float(_UDperimPsi)
                     except:
-                        crvPsiValue, warning = self.getCurvePsiValue(crvGUID)
+                        crvPsiValue, warning = self.getCurvePsiValue(crvGUID, userText)
                     
                     totalLen += crvLen
                     psiXlen += (crvLen * crvPsiValue)
@@ -3610,7 +4306,7 @@ class PHPP_grnd_FloorElement():
         else:
             return 0, 0, None
         
-    def getCurvePsiValue(self, _perimCrvGUID):
+    def getCurvePsiValue(self, _perimCrvGUID, _userText=None):
         """Takes in a single Curve GUID and returns its length and Psi*Len
         
         Will look at the UserText of the curve to get the Psi Value Type
@@ -3621,30 +4317,20 @@ class PHPP_grnd_FloorElement():
         
         Parameters:
         _perimCrvGUID (GUID): A single GUID 
+        _userText (PHPP_UserTextSnapshot): Optional. The pre-read UserText to look in
         
         Returns:
         crvPsiValue (float): The Curve's UserText Param for 'Psi-Value' if found.
         """
         
         warning = None
-        crvPsiValueName = rs.GetUserText(_perimCrvGUID, 'Typename')
+        if _userText is None:
+            _userText = PHPP_UserTextSnapshot([_perimCrvGUID])
+        crvPsiValueName = _userText.record(_perimCrvGUID).get('Typename')
         if crvPsiValueName:
-            for k in rs.GetDocumentUserText():
-                if 'PHPP_lib_TB' not in k:
-                    continue
-                
-                try:
-                    d = json.loads(rs.GetDocumentUserText(k))
-                    if d.get('Name', None) == crvPsiValueName:
-                        psiValParams = rs.GetDocumentUserText(k)
-                        break
-                except:
-                    psiValParams = None
-            else:
-                psiValParams = None
+            psiValParams = phpp_getDocLibrary().getEntry('PHPP_lib_TB', crvPsiValueName)
             
             if psiValParams:
-                psiValParams = json.loads(psiValParams)
                 crvPsiValue = psiValParams.get('psiValue', 0.5)
                 if crvPsiValue < 0:
                     warning = 'Warning: Negative Psi-Value found for type: "{}"\nApplying 0.0 W/mk for that edge.'.format(crvPsiValueName)
@@ -3669,7 +4355,7 @@ class PHPP_grnd_FloorElement():
         
         return crvPsiValue, warning
     
-    def getSrfcUvalue(self, _srfcGUID):
+    def getSrfcUvalue(self, _srfcGUID, _userText=None):
         """Takes in a single Surface GUID and returns its U-Value Param
         
         Will look at the UserText of the surface to get the EP Construction
@@ -3680,30 +4366,19 @@ class PHPP_grnd_FloorElement():
         
         Parameters:
         _srfcGUID (GUID): A single GUID value
+        _userText (PHPP_UserTextSnapshot): Optional. The pre-read UserText to look in
         
         Returns:
         srfcUvalue (float): The Surface's UserText Param for 'U-Value' if found
         """
         
-        srfcConstructionName = rs.GetUserText(_srfcGUID, 'EPConstruction')
+        if _userText is None:
+            _userText = PHPP_UserTextSnapshot([_srfcGUID])
+        srfcConstructionName = _userText.record(_srfcGUID).get('EPConstruction')
         if srfcConstructionName:
-            constParams = rs.GetDocumentUserText('PHPP_lib_Assmbly_' + srfcConstructionName)
-            
-            for k in rs.GetDocumentUserText():
-                if 'PHPP_lib_Assmbly' not in k:
-                    continue
-                try:
-                    d = json.loads(rs.GetDocumentUserText(k))
-                    if d.get('Name', None) == srfcConstructionName:
-                        constParams = rs.GetDocumentUserText(k)
-                        break
-                except:
-                    constParams = None
-            else:
-                constParams = None
+            constParams = phpp_getDocLibrary().getEntry('PHPP_lib_Assmbly', srfcConstructionName)
             
             if constParams:
-                constParams = json.loads(constParams)
                 srfcUvalue = constParams.get('uValue', 1)
             else:
                 warning = ('Warning: Could not find a construction type in the',
@@ -3962,465 +4637,2204 @@ class PHPP_grnd_SuspendedFloor(PHPP_grnd_FloorElement):
 
 class PHPP_ClimateDataSet:
     
-    def __init__(self, _dataSet='US0055b-New York', _alt='=J23', _cntry='US-United States of America', _reg='New York'):
-        self.DataSet = _dataSet
-        self.Altitude = _alt
-        self.Country = _cntry
-        self.Region = _reg
+    def __init__(self, _dataSet='US0055b-New York', _alt='=J23', _cntry='US-United States of America', _reg='New York'):
+        self.DataSet = _dataSet
+        self.Altitude = _alt
+        self.Country = _cntry
+        self.Region = _reg
+    
+    def __unicode__(self):
+        return u'A Location Object for: "{!r}":'.format(self.DataSet)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _dataSet={!r}, _alt={!r}, _cntry={!r}, _reg{!r} )".format(
+               self.__class__.__name__,
+               self.DataSet,
+               self.Altitude,
+               self.Country,
+               self.Region)
+
+#-------------------------------------------------------------------------------
+#### For reading the IDF File  #####
+IDF_CACHE_VERSION = 1 # Bump whenever the parsed record format changes
+
+class IDF_Schema:
+    """ The ordered field keys for one IDF Class, shared by every Object with the same layout
+    
+    Most Objects of the same IDF Class have exactly the same fields, so only one
+    of these is made for each layout and all of those Objects point to it.
+    """
+    
+    _schemas = {}
+    
+    def __init__(self, _objClass, _keys):
+        self.ObjClass = _objClass
+        self.Keys = _keys
+        self.Index = dict( (key, i) for i, key in enumerate(_keys) )
+        
+        # Vertex fields, in Vertex-number order ie: 'XYZ Vertex 1 {m}'
+        vertexKeys = [k for k in _keys if 'Vertex' in k]
+        vertexKeys.sort(key=idf_fieldNumber)
+        self.VertexIndexes = tuple( self.Index[k] for k in vertexKeys )
+        
+        # Layer fields, in file order ie: 'Outside Layer', 'Layer 2', ...
+        if _objClass.startswith('Construction'):
+            self.LayerIndexes = tuple( i for i, k in enumerate(_keys) if 'Layer' in k )
+        else:
+            self.LayerIndexes = ()
+    
+    @classmethod
+    def get(cls, _objClass, _keys):
+        """ Returns the shared IDF_Schema for the IDF Class / keys given, building it if needed """
+        
+        schemaKey = (_objClass, _keys)
+        schema = cls._schemas.get(schemaKey)
+        if schema is None:
+            schema = cls(_objClass, _keys)
+            cls._schemas[schemaKey] = schema
+        return schema
+    
+    def __repr__(self):
+        return "{}( _objClass={!r}, _keys={!r} )".format(
+               self.__class__.__name__,
+               self.ObjClass,
+               self.Keys)
+
+def idf_fieldNumber(_key):
+    """ Util func. Pulls the number from a key like 'XYZ Vertex 12 {m}' (returns 0 if there isn't one) """
+    
+    for each in _key.split():
+        if each.isdigit():
+            return int(each)
+    return 0
+
+def idf_fieldValue(_key, _value):
+    """ Util func. Converts a field's value to a float if the field has units ie: 'Thickness {m}' """
+    
+    if '{' in _key and _value:
+        try:
+            return float(_value)
+        except ValueError:
+            pass
+    return _value
+
+class IDF_Class(object):
+    """ Holds onto the data for a single IDF Object
+    
+    Field values are kept in a tuple, in file order, against an IDF_Schema that is
+    shared by all the Objects with the same layout. Values for any field with units
+    are stored as floats. Vertex coordinates are pulled out once into a flat array
+    of floats (x1, y1, z1, x2, ...) and Construction layers into an ordered list of
+    Material names. Fields can still be read with getattr(obj, 'Field Name') like before.
+    """
+    
+    __slots__ = ('objName', 'Vertices', 'Layers', '_schema', '_values', '_extra')
+    
+    def __init__(self, _objClass, _fields):
+        """
+        Args:
+            _objClass (str): The IDF Class name ie: 'BuildingSurface:Detailed'
+            _fields (list): (key, value) tuples, in file order. A dict is ok too.
+        """
+        if isinstance(_fields, dict):
+            _fields = _fields.items()
+        
+        _fields = [(k, v) for k, v in _fields if k != None and v != None]
+        schema = IDF_Schema.get(_objClass, tuple(k for k, v in _fields))
+        
+        object.__setattr__(self, 'objName', _objClass)
+        object.__setattr__(self, '_schema', schema)
+        object.__setattr__(self, '_values', tuple(idf_fieldValue(k, v) for k, v in _fields))
+        object.__setattr__(self, '_extra', None)
+        object.__setattr__(self, 'Layers', [self._values[i] for i in schema.LayerIndexes])
+        
+        verts = array('d')
+        for i in schema.VertexIndexes:
+            verts.extend( float(xyz) for xyz in str(self._values[i]).split() )
+        object.__setattr__(self, 'Vertices', verts)
+    
+    def __getattr__(self, _key):
+        # Only called if the normal attribute lookup fails, so look in the fields
+        extra = object.__getattribute__(self, '_extra')
+        if extra and _key in extra:
+            return extra[_key]
+        
+        i = object.__getattribute__(self, '_schema').Index.get(_key)
+        if i is None:
+            raise AttributeError(_key)
+        return object.__getattribute__(self, '_values')[i]
+    
+    def __setattr__(self, _key, _value):
+        if _key in IDF_Class.__slots__:
+            object.__setattr__(self, _key, _value)
+        else:
+            # Overrides (or adds) a field value without touching the shared schema
+            if self._extra is None:
+                object.__setattr__(self, '_extra', {})
+            self._extra[_key] = _value
+    
+    def get(self, _key, _default=None):
+        """ Returns the field's value, or the default if the Object doesn't have that field """
+        return getattr(self, _key, _default)
+    
+    def keys(self):
+        """ Returns all the field keys, in file order """
+        return list(self._schema.Keys) + [k for k in (self._extra or {}) if k not in self._schema.Index]
+    
+    def items(self):
+        """ Returns all the (key, value) fields, in file order """
+        return [(k, getattr(self, k)) for k in self.keys()]
+    
+    def getFields(self, _contains):
+        """ Returns the (key, value) fields, in file order, with keys which contain the string given ie: 'Zone ' """
+        return [(k, v) for k, v in self.items() if _contains in k]
+    
+    def getVertexPoints(self):
+        """ Returns a list of the (x, y, z) Vertex tuples, in Vertex-number order """
+        v = self.Vertices
+        return [(v[i], v[i+1], v[i+2]) for i in range(0, len(v) - 2, 3)]
+    
+    def setVertexPoints(self, _points):
+        """ Replaces the Object's Vertices with the (x, y, z) points given """
+        verts = array('d')
+        for pt in _points:
+            verts.extend( (float(pt[0]), float(pt[1]), float(pt[2])) )
+        object.__setattr__(self, 'Vertices', verts)
+    
+    def copy(self):
+        """ Returns a new IDF_Class object with the same fields (overrides included) """
+        newObj = IDF_Class(self.objName, self.items())
+        newObj.setVertexPoints( self.getVertexPoints() )
+        return newObj
+    
+    def __repr__(self):
+        return "An IDF File object with all its Params"
+
+def idf_cleanFieldComment(_comment):
+    """ Cleans up a '!- ' field comment so it can be used as an attribute key
+
+    Commas are removed to match the keys used everywhere else (ie:
+    'X,Y,Z Vertex 1 {m}' becomes 'XYZ Vertex 1 {m}')
+    """
+
+    return _comment.replace(',', '').strip()
+
+def idf_addFieldValues(_fields, _lineValues, _comment):
+    """ Util func used by the tokenizer to add a single line's values to the Object's field list """
+    
+    if not _lineValues:
+        return
+    
+    if _comment:
+        _fields.append( (_comment, ' '.join(_lineValues)) )
+    else:
+        for value in _lineValues:
+            _fields.append( ('Field {}'.format(len(_fields)+1), value) )
+
+def idf_tokenizeFile(_filePath, _classes=None):
+    """ Streams an IDF file line by line and yields each object as soon as its ';' terminator is read
+
+    Handles '!' comment lines, '!- ' field comments and objects which put more than
+    one field on a single line. Values found on the same line share that line's
+    field comment and are joined with a space (ie: vertex 'x, y, z' -> 'x y z').
+    Fields without any '!- ' comment each get their own 'Field N' key. The file is read directly,
+    nothing is copied or held in memory other than the current object.
+
+    Args:
+        _filePath (str): The full path to the .idf file
+        _classes (list): Optional. IDF Class names (ie: 'Zone', 'Construction') to return.
+            Objects of any other class are skipped over without building their fields.
+    Yields (tuple):
+        0: objClass (str) The IDF Class name of the object ie: 'BuildingSurface:Detailed'
+        1: fields (list) of (key, value) tuples in the order found in the file
+    """
+
+    classFilter = set(_classes) if _classes else None
+
+    objClass = None
+    fields = []
+    keep = True
+
+    with open(_filePath, 'r') as idfFile:
+        for line in idfFile:
+            # Split off any comment. A '!-' comment names the field(s) on this line
+            data, sep, comment = line.partition('!')
+            data = data.strip()
+            if not data:
+                continue
+
+            if comment.startswith('-'):
+                comment = idf_cleanFieldComment(comment[1:])
+            else:
+                comment = None
+
+            # Walk the line, breaking at each ',' or ';'
+            lineValues = []
+            start = 0
+            for i, char in enumerate(data):
+                if char != ',' and char != ';':
+                    continue
+
+                lineValues.append( data[start:i].strip() )
+                start = i + 1
+
+                if char == ';':
+                    # End of the Object
+                    if objClass is None:
+                        objClass = lineValues.pop(0)
+                        keep = classFilter is None or objClass in classFilter
+                    if keep:
+                        idf_addFieldValues(fields, lineValues, comment)
+                        yield objClass, fields
+
+                    objClass, fields, keep, lineValues = None, [], True, []
+
+            if not lineValues:
+                continue
+
+            if objClass is None:
+                # The first value is always the Object's Class name
+                objClass = lineValues.pop(0)
+                keep = classFilter is None or objClass in classFilter
+
+            if keep:
+                idf_addFieldValues(fields, lineValues, comment)
+
+def idf_iterObjects(_filePath, _classes=None):
+    """ Lazily reads an IDF file and yields an IDF_Class object for each IDF Object found
+
+    Args:
+        _filePath (str): The full path to the .idf file
+        _classes (list): Optional. Only build objects of these IDF Class names
+    Yields:
+        IDF_Class: One for each IDF Object found in the file
+    """
+
+    for objClass, fields in idf_tokenizeFile(_filePath, _classes):
+        yield IDF_Class(objClass, fields)
+
+class IDF_ObjectStore:
+    """ Holds onto all the Objects read from an IDF file, indexed by IDF Class and Name
+    
+    The raw fields for each Object are stored as they are read in. The IDF_Class
+    objects are only built the first time they are asked for. Also indexes
+    each Zone's surfaces and each surface's fenestration so those don't need
+    to be searched for.
+    """
+    
+    def __init__(self, _records=None):
+        """
+        Args:
+            _records (iterable): Optional. (objClass, fields) tuples, such as the ones yielded by idf_tokenizeFile()
+        """
+        self._classes = []      # [objClass, ...] in the order first found
+        self._fields = {}       # {objClass: [fields, fields, ...]}
+        self._objs = {}         # {objClass: [IDF_Class or None, ...]}
+        self._names = {}        # {objClass: {Name: index}}
+        self._zoneSurfaces = {}         # {Zone Name: [Surface Name, ...]}
+        self._srfcFenestration = {}     # {Surface Name: [Fenestration Name, ...]}
+        
+        for objClass, fields in _records or []:
+            self.addRecord(objClass, fields)
+    
+    def addRecord(self, _objClass, _fields):
+        """ Adds a raw (objClass, fields) record. The IDF_Class object is not built until needed """
+        
+        fieldDict = dict(_fields)
+        name = fieldDict.get('Name', _fields[0][1] if _fields else '')
+        
+        if _objClass not in self._fields:
+            self._classes.append(_objClass)
+        self._fields.setdefault(_objClass, []).append(_fields)
+        self._objs.setdefault(_objClass, []).append(None)
+        self._names.setdefault(_objClass, {}).setdefault(name, len(self._fields[_objClass])-1)
+        
+        # Keep track of the Zone -> Surface -> Fenestration relations
+        if _objClass == 'BuildingSurface:Detailed':
+            self._zoneSurfaces.setdefault(fieldDict.get('Zone Name'), []).append(name)
+        elif _objClass == 'FenestrationSurface:Detailed':
+            self._srfcFenestration.setdefault(fieldDict.get('Building Surface Name'), []).append(name)
+    
+    def addObject(self, _idfObj):
+        """ Adds an already built IDF object (ie: from an older reader) """
+        
+        if isinstance(_idfObj, IDF_Class):
+            fields = _idfObj.items()
+        else:
+            fields = [(k, v) for k, v in _idfObj.__dict__.items() if k != 'objName']
+        
+        self.addRecord(getattr(_idfObj, 'objName', ''), fields)
+    
+    def _getObj(self, _objClass, _i):
+        obj = self._objs[_objClass][_i]
+        if obj is None:
+            obj = IDF_Class(_objClass, self._fields[_objClass][_i])
+            self._objs[_objClass][_i] = obj
+        return obj
+    
+    def getClassNames(self):
+        """ Returns a list of all the IDF Class names found, in the order first found """
+        return list(self._classes)
+    
+    def getObjects(self, *_objClasses):
+        """ Returns a list of all the IDF_Class objects of the IDF Class(es) given, in file order """
+        
+        objs = []
+        for objClass in _objClasses:
+            for i in range(len(self._objs.get(objClass, []))):
+                objs.append( self._getObj(objClass, i) )
+        return objs
+    
+    def getObjectsLike(self, *_classNames):
+        """ Returns a list of the IDF_Class objects of every IDF Class which has any of the names given in it
+        
+        This is the matching the reader has always used ('Construction' in objName) so any
+        variant classes (ie: 'Construction:InternalSource', 'WindowMaterial:GasMixture') are
+        included as well. Objects are returned class by class, in the order the classes were first found.
+        """
+        
+        objClasses = [objClass for objClass in self._classes if any(nm in objClass for nm in _classNames)]
+        return self.getObjects(*objClasses)
+    
+    def getObject(self, _objClass, _name, _default=None):
+        """ Returns the IDF_Class object of the IDF Class with the Name given """
+        
+        i = self._names.get(_objClass, {}).get(_name)
+        if i is None:
+            return _default
+        return self._getObj(_objClass, i)
+    
+    def getFirst(self, _objClass, _default=None):
+        """ Returns the first IDF_Class object found of the IDF Class given (ie: 'Building') """
+        
+        if not self._objs.get(_objClass):
+            return _default
+        return self._getObj(_objClass, 0)
+    
+    def getZoneSurfaces(self, _zoneName):
+        """ Returns the 'BuildingSurface:Detailed' objects hosted by the Zone """
+        return [self.getObject('BuildingSurface:Detailed', nm) for nm in self._zoneSurfaces.get(_zoneName, [])]
+    
+    def getSurfaceFenestration(self, _srfcName):
+        """ Returns the 'FenestrationSurface:Detailed' objects hosted by the Surface """
+        return [self.getObject('FenestrationSurface:Detailed', nm) for nm in self._srfcFenestration.get(_srfcName, [])]
+    
+    def getRecords(self):
+        """ Yields the (objClass, fields) records for every Object in the store """
+        
+        for objClass, fieldsList in self._fields.items():
+            for fields in fieldsList:
+                yield objClass, fields
+    
+    def __len__(self):
+        return sum(len(objs) for objs in self._objs.values())
+    
+    def __unicode__(self):
+        return u'An IDF Object Store with {} Objects'.format(len(self))
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    
+    def __repr__(self):
+        return "{}( _records=<{} records> )".format(
+               self.__class__.__name__,
+               len(self))
+
+def idf_storeFromInput(_idfObjs):
+    """ Returns an IDF_ObjectStore from whatever the Reader passed along
+    
+    Args:
+        _idfObjs (list): Either a list with an IDF_ObjectStore in it, or a flat list of IDF_Class objects
+    Returns:
+        IDF_ObjectStore
+    """
+    
+    for each in _idfObjs or []:
+        if isinstance(each, IDF_ObjectStore):
+            return each
+    
+    store = IDF_ObjectStore()
+    for each in _idfObjs or []:
+        store.addObject(each)
+    
+    return store
+
+def idf_fileHash(_filePath):
+    """ Returns the md5 hex digest of a file's contents, read in chunks """
+    
+    md5 = hashlib.md5()
+    with open(_filePath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            md5.update(chunk)
+    
+    return md5.hexdigest()
+
+def idf_getCacheStats():
+    """ Returns the dict of IDF cache 'hits' and 'misses' counted so far this session """
+    
+    return sc.sticky.setdefault('IDF2PHPP_IDFCacheStats', {'hits':0, 'misses':0})
+
+def idf_loadStore(_filePath, _useCache=True, _cacheFolder=None, _writeCache=True):
+    """ Reads an IDF file into an IDF_ObjectStore, using the on-disk cache if the file hasn't changed
+    
+    The parsed records are saved next to the IDF file ('in.idf' -> 'in.idf.idf2phcache'),
+    or in the '_cacheFolder' if one is given, along with the file's path, size, modified-time and content hash. If the path,
+    size and modified-time all still match, the cache is loaded and the IDF is not
+    read at all. If only the size or time changed, the content hash is checked
+    so that an identical re-export (ie: Honeybee re-writing the same in.idf) is
+    still a cache hit.
+    
+    Args:
+        _filePath (str): The full path to the .idf file
+        _useCache (bool): Set False to always parse the IDF file (the cache is still re-written)
+        _cacheFolder (str): The folder to keep the cache file in. Default is the IDF file's folder.
+        _writeCache (bool): Set False to never write the cache file
+    Returns:
+        IDF_ObjectStore
+    """
+    
+    stats = idf_getCacheStats()
+    if _cacheFolder:
+        cachePath = os.path.join(_cacheFolder, os.path.basename(_filePath) + '.idf2phcache')
+    else:
+        cachePath = _filePath + '.idf2phcache'
+    fileStat = os.stat(_filePath)
+    
+    key = {'version': IDF_CACHE_VERSION,
+           'path': os.path.abspath(_filePath),
+           'size': fileStat.st_size,
+           'mtime': fileStat.st_mtime,
+           'hash': None}
+    
+    #---------------------------------------------------------------------------
+    # Try and use the cache
+    if _useCache and os.path.exists(cachePath):
+        try:
+            with open(cachePath, 'rb') as cacheFile:
+                cachedKey = pickle.load(cacheFile)
+                
+                sameFile = cachedKey.get('version') == key['version'] and cachedKey.get('path') == key['path']
+                sameStat = cachedKey.get('size') == key['size'] and cachedKey.get('mtime') == key['mtime']
+                
+                if sameFile and not sameStat:
+                    key['hash'] = idf_fileHash(_filePath)
+                
+                if sameFile and (sameStat or cachedKey.get('hash') == key['hash']):
+                    records = pickle.load(cacheFile)
+                    stats['hits'] += 1
+                    
+                    if not sameStat and _writeCache:
+                        # Same contents, new timestamp. Update the key so next time is quicker
+                        key['hash'] = cachedKey.get('hash')
+                        idf_writeCache(cachePath, key, records)
+                    
+                    return IDF_ObjectStore(records)
+        except Exception as e:
+            print 'Unable to read the IDF cache file: {}'.format(e)
+    
+    #---------------------------------------------------------------------------
+    # Parse the IDF file, and save the cache for next time
+    stats['misses'] += 1
+    records = list(idf_tokenizeFile(_filePath))
+    
+    if _writeCache:
+        if key['hash'] is None:
+            key['hash'] = idf_fileHash(_filePath)
+        idf_writeCache(cachePath, key, records)
+    
+    return IDF_ObjectStore(records)
+
+def idf_writeCache(_cachePath, _key, _records):
+    """ Util func used by idf_loadStore() to save the key and parsed records """
+    
+    try:
+        with open(_cachePath, 'wb') as cacheFile:
+            pickle.dump(_key, cacheFile, 2)
+            pickle.dump(_records, cacheFile, 2)
+    except Exception as e:
+        print 'Unable to write the IDF cache file: {}'.format(e)
+
+class IDF_Zone:
+    def __init__(self, _idfObj):
+        self.ZoneName = getattr(_idfObj, 'Name')
+        self.InfiltrationACH50 = None
+        self.Volume_Gross = None
+        self.FloorArea_Gross = False
+        self.Volume_Vn50 = None
+        self.TFA = None
+    
+    def __unicode__(self):
+        return u'An IDF Zone Object: {}'.format(self.ZoneName)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_ZoneList:
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        
+        for eachKey, eachZoneName in _idfObj.getFields('Zone '):
+            setattr(self, eachKey, eachZoneName )
+                
+    def __unicode__(self):
+        return u'An IDF ZoneList Object: {}'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_ZoneInfilFlowRate:
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        self.ZoneName = getattr(_idfObj, 'Zone or ZoneList Name')
+        self.ScheduleName = getattr(_idfObj, 'Schedule Name')
+        self.DesignFlowRate = getattr(_idfObj, 'Design Flow Rate {m3/s}')
+        self.FlowRatePerFloorArea = getattr(_idfObj, 'Flow per Zone Floor Area {m3/s-m2}')
+        self.FlowRatePerSurfaceArea =  getattr(_idfObj, 'Flow per Exterior Surface Area {m3/s-m2}')
+        self.ACH =  getattr(_idfObj, 'Air Changes per Hour {1/hr}')
+        
+    def __unicode__(self):
+        return u'An IDF Zone Infiltration Flow Rate Object: {}'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_building:
+    # Basic Building Data and North Orientation information
+    
+    def __init__(self, _idfObj):
+        self.BldgName = getattr(_idfObj, 'Name')
+        self.NorthAngle = getattr(_idfObj, 'North Axis {deg}') # in Degrees off North (North=0 ,East=90, etc..)
+        self.NorthVector = self.calcNorthAnglefromVec(self.NorthAngle) # Calc degrees from the Vector
+    
+    def calcNorthAnglefromVec(self, _northAngle):
+        _northAngle = float(_northAngle) * -1 # *-1 to go clockwise?
+        northVec = rs.VectorRotate((0,1,0), float(_northAngle), (0,0,1)) # Vector to Rotate(Y), Angle(Deg), RotationAxis(Z)
+        return northVec
+    
+    def __unicode__(self):
+        return u'The Building Data Object: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_MaterialLayer:
+    # For holding onto Params for 
+    # 'Material' and 'Material:AirGap' objects
+    
+    def __init__(self, _idfObj, noMass=False):
+        self.Name = getattr(_idfObj, 'Name').replace('__Int__', '')
+        self.MatType = getattr(_idfObj, 'objName')
+        
+        # Set object defaults
+        self.LayerThickness = None
+        self.LayerConductivity = None
+        self.LayerConductance = None
+        self.Type = None
+        
+        if noMass == False:
+            # Get the actual data from the IDF Object to set up the rest
+            self.getLayerData(_idfObj)
+            self.setLayerData()
+        elif noMass == True:
+            self.getNoMassData(_idfObj)
+    
+    def getNoMassData(self, _idfObj):
+        # Get all the relevant data from the IDF Object
+        resistance = _idfObj.get('Thermal Resistance {m2-K/W}')
+        if resistance is not None:
+            self.LayerConductance = 1 / float(resistance)
+            self.LayerThickness = 1
+            self.LayerConductivity = self.LayerConductance
+    
+    def getLayerData(self, _idfObj):
+        # Get all the relevant data from the IDF Object
+        self.LayerThickness = _idfObj.get('Thickness {m}', self.LayerThickness)
+        self.LayerConductivity = _idfObj.get('Conductivity {W/m-K}', self.LayerConductivity)
+        
+        resistance = _idfObj.get('Thermal Resistance {m2-K/W}')
+        if resistance is not None:
+            self.LayerConductance = 1 / float(resistance)
+    
+    def setLayerData(self):
+        # Sort out the layer conductances/Resistances (m2-k/W)
+        if 'AirGap' in self.MatType:
+            self.LayerThickness = 1
+        
+        self.LayerThickness = float(self.LayerThickness) if self.LayerThickness else 0.1 # Apply default thickness if none
+        
+        if self.LayerConductance == None:
+            self.LayerConductance = float(self.LayerConductivity) * float(self.LayerThickness)
+        elif self.LayerConductance != None and self.LayerConductivity == None:
+            print self.Name,  self.LayerThickness
+            self.LayerConductivity = float(self.LayerConductance) / float(self.LayerThickness)
+        
+    def __unicode__(self):
+        return u'EnergyPlus Material Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_MaterialWindowSimple:
+    # For holding onto Params for
+    # WindowMaterial:SimpleGlazingSystem Objects
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.uValue = getattr(_idfObj, 'U-Factor {W/m2-K}' )
+        self.gValue = getattr(_idfObj, 'Solar Heat Gain Coefficient' )
+        self.VT = getattr(_idfObj, 'Visible Transmittance' )
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Simple Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_MaterialWindowGlazing:
+    # For holding onto Params for
+    # WindowMaterial:Glazing Objects
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.Thickness = float( getattr(_idfObj, 'Thickness {m}' ) )
+        self.Conductivity = float( getattr(_idfObj, 'Conductivity {W/m-K}' ) )
+        self.uValue = 1 / (self.Thickness/self.Conductivity)
+        self.gValue = getattr(_idfObj, 'Solar Transmittance at Normal Incidence' )
+        self.VT = getattr(_idfObj, 'Visible Transmittance at Normal Incidence' )
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Glazing Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_MaterialWindowGas:
+    # For holding onto Params for
+    # WindowMaterial:Gas Objects
+    #https://www.engineersedge.com/heat_transfer/thermal-conductivity-gases.htm
+    
+    gasConductivities = {'Air': 0.0262,
+                        'Argon': 0.0179,
+                        'Krypton': 0.0095,
+                        'Xenon': 0.0055
+    }
+    
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name' )
+        self.GasType = getattr(_idfObj, 'Gas Type' )
+        self.Conductivity = self.gasConductivities[self.GasType]
+        self.Thickness = float( (getattr(_idfObj, 'Thickness {m}' ) ) )
+        self.uValue = 1 / (self.Thickness / self.Conductivity)
+    
+    def __unicode__(self):
+        return u'EnergyPlus WindowMaterial:Gas Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_Construction:
+    """
+    For holding onto Params for EnergPlus 'Construction' objects (Assemblies)
+    Note that when created, the new Object will clean up its name to remove any 
+    '__Int_' flags and then set the 'IntInsul' attribute as appropriate
+    """
+    def __init__(self, _idfObj):
+        self.Name = getattr(_idfObj, 'Name')
+        self.getLayerNames(_idfObj)
+        self.checkInteriorInsul()
+    
+    def checkInteriorInsul(self):
+        if '__Int__' in self.Name:
+            self.IntInsul = 'x'
+            self.Name = self.Name.replace('__Int__', '')
+        else:
+            self.IntInsul = None
+            
+    def getLayerNames(self, _idfObj):
+        # Set the self.Layers list of names
+        self.Layers = []
+        self.LayerNames = []
+        
+        # The IDF Object's Layers are already in order (outside -> in)
+        for layerNum, layerName in _idfObj.getFields('Layer'):
+            layerName = layerName.replace('__Int__', '')
+            self.Layers.append( [layerNum, layerName]  )
+            self.LayerNames.append(layerName)
+    
+    def __unicode__(self):
+        return u'EnergyPlus Construction Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_surfaceWindow:
+    # For holding onto Params for
+    # FenestrationSurface:Detailed Objects
+    
+    def __init__(self, _idfObj, _winSimpleMat, _wShadFac=None, _sShadFac=None, _geomData=None):
+        self.Quantity = 1
+        self.Name = getattr(_idfObj, 'Name')
+        
+        # Window size from the Vertices, in the window's own plane
+        if _geomData is None:
+            _geomData = phpp_geomDataFromVerts(_idfObj.Vertices)
+        self.Width = _geomData.Width
+        self.Height = _geomData.Height
+        self.Dims = (self.Width, self.Height)
+        self.HostSrfc = getattr(_idfObj, 'Building Surface Name')
+        self.winterShadingFac = _wShadFac
+        self.summerShadingFac = _sShadFac
+        self.EPConstuctionName = getattr(_idfObj, "Construction Name")
+        
+        # This will take in an EP 'WindowMaterial:SimpleGlazingSystem' and build PHPP style frame / glass
+        self.setPHPPConstruction(self.EPConstuctionName, _winSimpleMat)
+    
+    def setPHPPConstruction(self, _constructionName, _winSimpleMat, _installs=[1,1,1,1]):
+        # Sets the PHPP Style Frame, Glass and Installs 
+        self.Type_Glass = PHPP_Glazing(
+                _constructionName, # Name
+                _winSimpleMat.gValue, # g-Value
+                _winSimpleMat.uValue # U-Value
+                )
+        
+        self.Type_Frame = PHPP_Frame(
+                _constructionName, # Name
+                [_winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue], # Frame U-Values
+                [0.12, 0.12, 0.12, 0.12], # Frame Widths (Default to 0.1m)
+                [0.00, 0.00, 0.00, 0.00], # Psi-Glazing Edge Defaults
+                [0.00, 0.00, 0.00, 0.00] # Psi-Installs Defaults)
+                ) 
+        
+        self.Installs = PHPP_Window_Install(_installs)
+    
+    def setShadingDims_Simple(self, _in):
+        self.ShadingDimensions = _in
+    
+    def getShadingDims_Simple(self):
+        try:
+            return self.ShadingDimensions
+        except AttributeError as e:
+            return None
+    
+    def getShadingFactors(self):
+        try:
+            return self.winterShadingFac, self.summerShadingFac
+        except AttributeError as e:
+            return None
+    
+    def __unicode__(self):
+        return u'FenestrationSurface:Detailed: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_surfaceOpaque:
+    # For holding onto Params for
+    # BuildingSurface:Detailed Objects
+    
+    def __init__(self, _idfObj, _northAngle, _geomData=None):
+        self.Name = getattr(_idfObj, 'Name')
+        self.AssemblyName = getattr(_idfObj, 'Construction Name')
+        self.srfcType = getattr(_idfObj, 'Surface Type')
+        self.exposure = getattr(_idfObj, 'Outside Boundary Condition')
+        self.HostZoneName = getattr(_idfObj, 'Zone Name')
+        self.findGroupNumber(self.srfcType, self.exposure)
+        self.getGeometryData(_idfObj, _northAngle, _geomData)
+    
+    def getGeometryData(self, idfObj, _northAngle, _geomData=None):
+        # Calc the Geometry data from the Vertex points
+        # The actual Rhino Geometry is only built if its asked for (getSrfc, getBoundary)
+        if _geomData is None:
+            _geomData = phpp_geomDataFromVerts(idfObj.Vertices)
+        
+        self.Points = idfObj.getVertexPoints()
+        self.Boundary = None
+        self.Srfc = None
+        self.SurfaceArea = _geomData.Area
+        self.Centroid = Rhino.Geometry.Point3d(*_geomData.Centroid)
+        self.NormalVector = Rhino.Geometry.Vector3d(*_geomData.Normal)
+        
+        # Find the Rotation off North Vector
+        self.AngleFromNorth = phpp_calcNorthAngle(self.NormalVector, _northAngle)
+        
+        # Find the Rotation off Horizontal
+        self.AngleFromHoriz = _geomData.Tilt
+        
+        # Use Defaults at this time.
+        # Someday calc the shading factors and have inputs for the rest?
+        self.Factor_Shading = 0.5 # Default
+        self.Factor_Absorptivity = 0.6  # Default
+        self.Factor_Emissivity = 0.9   # Default
+    
+    def getBoundary(self):
+        # Builds the Rhino boundary Polyline the first time its needed
+        if self.Boundary is None:
+            self.Boundary, self.Srfc = phpp_geomFromPoints(self.Points)
+        return self.Boundary
+    
+    def getSrfc(self):
+        # Builds the Rhino Surface the first time its needed
+        if self.Srfc is None:
+            self.Boundary, self.Srfc = phpp_geomFromPoints(self.Points)
+        return self.Srfc
+    
+    def findGroupNumber(self, _srfcType, _exposureType):
+        # Figure out the 'Group Number' for PHPP based on the EP Exposure type
+        if _exposureType == 'Surface':
+            pass
+        elif _srfcType == 'Wall' and _exposureType == 'Outdoors':
+            self.GroupNum = 8
+        elif _srfcType == 'Wall' and _exposureType == 'Ground':
+            self.GroupNum = 9
+        elif _srfcType == 'Roof' and _exposureType == 'Outdoors':
+            self.GroupNum = 10
+        elif _srfcType == 'Floor' and _exposureType == 'Ground':
+            self.GroupNum = 11
+        elif _srfcType == 'Floor' and _exposureType == 'Outdoors':
+            self.GroupNum = 12
+        elif _exposureType == 'Adiabatic':
+            self.GroupNum = 18
+        else:
+            self.GroupNum = 13
+            print _srfcType, _exposureType
+            groupWarning = "Couldn't figure out the Group Number for surface '{}'?".format(self.Name)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, groupWarning)
+    
+    def __unicode__(self):
+        return u'EnergyPlus BuildingSurface:Detailed Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+class IDF_Obj_location:
+    def __init__(self):
+        self.Name = getattr(_idfObj, 'Name')
+        self.Latitude = getattr(_idfObj, 'Latitude {deg}')
+        self.Longitude = getattr(_idfObj, 'Longitude {deg}')
+        self.TimeZone = getattr(_idfObj, 'Time Zone {hr}')
+        self.Elevation = getattr(_idfObj, 'Elevation {m}')
+    
+    def __unicode__(self):
+        return u'EnergyPlus Location Params: [{}]'.format(self.Name)
+    
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+
+#-------------------------------------------------------------------------------
+# For the main Excel Object Writer #
+class PHPP_XL_Obj:
+    """ A holder for an Excel writable datapoint with a worksheet, range and value """
+    
+    # {Unit You have: {Unit you Want: (scale, offset, reciprocal)}, {...}, ...}
+    conversionSchema = PHPP_UNIT_SCHEMA
+    
+    def __init__(self, _shtNm, _rangeAddress, _val, _unitSI=None, _unitIP='SI'):
+        """
+        Args:
+            _shtNm (str): The Name of the Worksheet to write to
+            _rangeAddress (str): The Cell Range (A1, B12, etc...) to write to on the Worksheet
+            _val (str): The Value to write to the Cell Range (Value2)
+            _unitSI: (str) The SI unit for the item
+            _unitIP: (str) The IP unit for the item
+        """
+        self.Worksheet = _shtNm
+        self.Range = _rangeAddress
+        self.Value = _val
+        self.Unit_SI = _unitSI
+        self.Unit_IP = _unitIP
+    
+    def getWorksheet(self, _units='SI'):
+        if _units == 'SI':
+            return self.Worksheet
+        
+        if self.Worksheet == 'U-Values':
+            return 'R-Values'
+        elif self.Worksheet == 'Additional Vent':
+            return 'Addl vent'
+        else:
+            return self.Worksheet
+    
+    def getValue(self, _targetUnit='SI'):
+        """ Get the Item Value properly. Allows for unit conversion.
+        
+        For instance calling "obj.getValue(obj.Unit_IP)" will return the 
+        converted value into Inch-Pound units. Pass 'SI' or leave 
+        input blank for no conversion (return = self.Value x 1.0)
+        
+        Args:
+            _targetUnit: (str) The unit to convert the value to. 'SI' or 'IP'
+        Returns:
+            value converted into the right units
+        """
+        
+        if not self.Unit_SI:
+            return self.Value
+        
+        return phpp_convertValue(self.Value, self.getConversion(_targetUnit))
+    
+    def getConversion(self, _targetUnit='SI'):
+        """ The compiled (scale, offset, reciprocal) unit conversion for the Item, or None """
+        
+        if _targetUnit == 'IP':
+            targetUnit = self.Unit_IP
+        elif _targetUnit == 'SI':
+            targetUnit = self.Unit_SI
+        else:
+            targetUnit = _targetUnit
+        
+        return PHPP_UNIT_CONVERSIONS.get((self.Unit_SI, targetUnit))
     
     def __unicode__(self):
-        return u'A Location Object for: "{!r}":'.format(self.DataSet)
+        return u"PHPP Obj | Worksheet: {self.Worksheet}  |  Cell: {self.Range}  |  Value: {self.Value}".format(self=self)
     def __str__(self):
         return unicode(self).encode('utf-8')
     def __repr__(self):
-        return "{}( _dataSet={!r}, _alt={!r}, _cntry={!r}, _reg{!r} )".format(
+       return "{}( _nm={!r}, _shtNm={!r}, _rangeAddress={!r}, _val={!r}, _unitSI={!r}, _unitIP={!r}".format(
                self.__class__.__name__,
-               self.DataSet,
-               self.Altitude,
-               self.Country,
-               self.Region)
+               self.Worksheet,
+               self.Range,
+               self.Value,
+               self.Unit_SI,
+               self.Unit_IP)
 
-#-------------------------------------------------------------------------------
-#### For reading the IDF File  #####
-class IDF_Zone:
-    def __init__(self, _idfObj):
-        self.ZoneName = getattr(_idfObj, 'Name')
-        self.InfiltrationACH50 = None
-        self.Volume_Gross = None
-        self.FloorArea_Gross = False
-        self.Volume_Vn50 = None
-        self.TFA = None
+def xl_getWriteItems(_xlObjs, _unitType='SI'):
+    """ Converts a list of PHPP_XL_Objs into (Worksheet, Range, Value) items to write
+    
+    The unit conversion is looked up once for each unit pair in the list, rather
+    than once for every item.
+    
+    Args:
+        _xlObjs (list): The PHPP_XL_Objs
+        _unitType (str): 'SI' or 'IP' The units of the PHPP being written to
+    Returns:
+        (list): The (Worksheet, Range, Value) items, in the same order as the objects
+    """
+    
+    items = []
+    conversions = {} # (Unit_SI, Unit_IP) -> Compiled Conversion
+    for obj in _xlObjs:
+        value = obj.Value
+        if obj.Unit_SI:
+            unitKey = (obj.Unit_SI, obj.Unit_IP)
+            if unitKey not in conversions:
+                conversions[unitKey] = obj.getConversion(_unitType)
+            value = phpp_convertValue(value, conversions[unitKey])
         
-    def __unicode__(self):
-        return u'An IDF Zone Object: {}'.format(self.ZoneName)
+        items.append( (obj.getWorksheet(_unitType), obj.Range, value) )
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    return items
 
-class IDF_ZoneList:
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name')
-        
-        for eachKey in _idfObj.__dict__.keys():
-            if 'Zone ' in eachKey:
-                setattr(self, eachKey, getattr(_idfObj, eachKey) )
-                
-    def __unicode__(self):
-        return u'An IDF ZoneList Object: {}'.format(self.Name)
+def xl_colToNum(_col):
+    """ Excel column letters to number ie: 'A' -> 1, 'AL' -> 38 """
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    num = 0
+    for char in _col.upper():
+        num = num * 26 + (ord(char) - 64)
+    return num
 
-class IDF_ZoneInfilFlowRate:
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name')
-        self.ZoneName = getattr(_idfObj, 'Zone or ZoneList Name')
-        self.ScheduleName = getattr(_idfObj, 'Schedule Name')
-        self.DesignFlowRate = getattr(_idfObj, 'Design Flow Rate {m3/s}')
-        self.FlowRatePerFloorArea = getattr(_idfObj, 'Flow per Zone Floor Area {m3/s-m2}')
-        self.FlowRatePerSurfaceArea =  getattr(_idfObj, 'Flow per Exterior Surface Area {m3/s-m2}')
-        self.ACH =  getattr(_idfObj, 'Air Changes per Hour {1/hr}')
-        
-    def __unicode__(self):
-        return u'An IDF Zone Infiltration Flow Rate Object: {}'.format(self.Name)
+def xl_numToCol(_num):
+    """ Excel column number to letters ie: 1 -> 'A', 38 -> 'AL' """
+    
+    col = ''
+    while _num > 0:
+        _num, remainder = divmod(_num - 1, 26)
+        col = chr(65 + remainder) + col
+    return col
+
+def xl_splitAddress(_address):
+    """ Splits a single cell address into its (column number, row number) ie: 'L12' -> (12, 12)
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    Returns None if the address isn't a single cell (ie: 'A1:B2' or a named range)
+    """
+    
+    match = re.match(r'^\$?([A-Za-z]{1,3})\$?(\d+)$', str(_address).strip())
+    if not match:
+        return None
+    return xl_colToNum(match.group(1)), int(match.group(2))
 
-class IDF_Obj_building:
-    # Basic Building Data and North Orientation information
+XL_Block = namedtuple('XL_Block', ['Worksheet', 'Range', 'Values', 'NumCells'])
+
+def xl_groupIntoBlocks(_items):
+    """ Groups single-cell items into rectangular blocks of adjacent cells, for each Worksheet
     
-    def __init__(self, _idfObj):
-        self.BldgName = getattr(_idfObj, 'Name')
-        self.NorthAngle = getattr(_idfObj, 'North Axis {deg}') # in Degrees off North (North=0 ,East=90, etc..)
-        self.NorthVector = self.calcNorthAnglefromVec(self.NorthAngle) # Calc degrees from the Vector
+    Cells next to each other in a row are joined into runs, then runs with the
+    same columns in consecutive rows are stacked into rectangles. Anything which
+    isn't a single cell address is left as its own 1x1 'block'.
     
-    def calcNorthAnglefromVec(self, _northAngle):
-        _northAngle = float(_northAngle) * -1 # *-1 to go clockwise?
-        northVec = rs.VectorRotate((0,1,0), float(_northAngle), (0,0,1)) # Vector to Rotate(Y), Angle(Deg), RotationAxis(Z)
-        return northVec
+    Args:
+        _items (list): (worksheet, range, value) tuples
+    Returns:
+        (list): XL_Block tuples with the Worksheet, the block's Range ('L12:AL20'), 
+            the Values as a list of rows (each a list of values) and the number of cells
+    """
     
-    def __unicode__(self):
-        return u'The Building Data Object: [{}]'.format(self.Name)
+    blocks = []
+    cellsBySheet = {}
+    
+    for sheet, address, value in _items:
+        cell = xl_splitAddress(address)
+        if cell is None:
+            blocks.append( XL_Block(sheet, address, [[value]], 1) )
+        else:
+            cellsBySheet.setdefault(sheet, {})[cell] = value
+    
+    for sheet, cells in cellsBySheet.items():
+        # Find the runs of adjacent columns in each row
+        rows = {}
+        for col, row in cells.keys():
+            rows.setdefault(row, []).append(col)
+        
+        runs = {} # {(startCol, endCol): [row, row, ...]}
+        for row, cols in rows.items():
+            cols.sort()
+            start = prev = cols[0]
+            for col in cols[1:] + [None]:
+                if col != None and col == prev + 1:
+                    prev = col
+                    continue
+                runs.setdefault((start, prev), []).append(row)
+                start = prev = col
+        
+        # Stack runs with the same columns in consecutive rows into rectangles
+        for (startCol, endCol), runRows in sorted(runs.items()):
+            runRows.sort()
+            top = bottom = runRows[0]
+            for row in runRows[1:] + [None]:
+                if row != None and row == bottom + 1:
+                    bottom = row
+                    continue
+                
+                values = [[cells[(col, r)] for col in range(startCol, endCol + 1)] for r in range(top, bottom + 1)]
+                if top == bottom and startCol == endCol:
+                    address = '{}{}'.format(xl_numToCol(startCol), top)
+                else:
+                    address = '{}{}:{}{}'.format(xl_numToCol(startCol), top, xl_numToCol(endCol), bottom)
+                blocks.append( XL_Block(sheet, address, values, (bottom - top + 1) * (endCol - startCol + 1)) )
+                
+                top = bottom = row
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    return blocks
 
-class IDF_Obj_MaterialLayer:
-    # For holding onto Params for 
-    # 'Material' and 'Material:AirGap' objects
+#-------------------------------------------------------------------------------
+#### Geometry Excel Objects ####
+# Used by BT_CreateXLObj_Geom and the 04_Batch runner
+class Model_Index:
+    """Name-keyed joins between the model's zones, surfaces, windows and constructions
+    
+    Built once per run and passed through the Excel-Object builders so each
+    zone filter / host lookup / UD name lookup is a dict or set lookup
+    instead of a scan over the whole branch.
+    """
     
-    def __init__(self, _idfObj, noMass=False):
-        self.Name = getattr(_idfObj, 'Name').replace('__Int__', '')
-        self.MatType = getattr(_idfObj, 'objName')
-        
-        # Set object defaults
-        self.LayerThickness = None
-        self.LayerConductivity = None
-        self.LayerConductance = None
-        self.Type = None
+    def __init__(self, _zones, _zoneObjs, _uValueUID_Names):
+        self.Zones = set(_zones) # Zone Names to include in the output
+        self.ConstructionUDs = _uValueUID_Names # EP Construction Name -> PHPP UD Name
+        self.SurfaceUDs = {} # Surface Name -> PHPP UD Name, filled in as the Areas are created
         
-        if noMass == False:
-            # Get the actual data from the IDF Object to set up the rest
-            self.getLayerData(_idfObj)
-            self.setLayerData()
-        elif noMass == True:
-            self.getNoMassData(_idfObj)
+        self.ZoneObjs = defaultdict(list) # Zone Name -> Zone Objects
+        for zoneObj in _zoneObjs:
+            self.ZoneObjs[zoneObj.ZoneName].append(zoneObj)
     
-    def getNoMassData(self, _idfObj):
-        # Get all the relevant data from the IDF Object
-        for eachKey in _idfObj.__dict__.keys():
-            if 'Thermal Resistance {m2-K/W}' in eachKey:
-                self.LayerConductance = 1 / float(getattr(_idfObj, 'Thermal Resistance {m2-K/W}'))
-                self.LayerThickness = 1
-                self.LayerConductivity = self.LayerConductance
+    def includeZone(self, _zoneName):
+        return _zoneName in self.Zones
     
-    def getLayerData(self, _idfObj):
-        # Get all the relevant data from the IDF Object
-        for eachKey in _idfObj.__dict__.keys():
-            if 'Thickness {m}' in eachKey:
-                self.LayerThickness = getattr(_idfObj, 'Thickness {m}')
-            elif 'Conductivity {W/m-K}' in eachKey:
-                self.LayerConductivity = getattr(_idfObj, 'Conductivity {W/m-K}')
-            elif 'Thermal Resistance {m2-K/W}' in eachKey:
-                self.LayerConductance = 1 / float(getattr(_idfObj, 'Thermal Resistance {m2-K/W}'))
+    def includeSurface(self, _srfcName):
+        return _srfcName in self.SurfaceUDs
     
-    def setLayerData(self):
-        # Sort out the layer conductances/Resistances (m2-k/W)
-        if 'AirGap' in self.MatType:
-            self.LayerThickness = 1
+    def addSurface(self, _srfcName, _srfcNameUD):
+        self.SurfaceUDs[_srfcName] = _srfcNameUD
+    
+    def getConstructionUD(self, _constName):
+        """Returns the PHPP UD Name ('01ud-...') for an EP Construction Name"""
         
-        self.LayerThickness = float(self.LayerThickness) if self.LayerThickness else 0.1 # Apply default thickness if none
+        if _constName in self.ConstructionUDs:
+            return self.ConstructionUDs[_constName]
         
-        if self.LayerConductance == None:
-            self.LayerConductance = float(self.LayerConductivity) * float(self.LayerThickness)
-        elif self.LayerConductance != None and self.LayerConductivity == None:
-            print self.Name,  self.LayerThickness
-            self.LayerConductivity = float(self.LayerConductance) / float(self.LayerThickness)
+        # No exact match, fall back to comparing the names without the numeric prefix
+        constName = _constName.replace('_', ' ')
+        for uIDName in self.ConstructionUDs.values():
+            if constName in uIDName[5:] or uIDName[5:] in constName:
+                constName = uIDName
         
-    def __unicode__(self):
-        return u'EnergyPlus Material Params: [{}]'.format(self.Name)
+        return constName
     
+    def __unicode__(self):
+        return u"A Model_Index Object: < {} Zones, {} Surfaces, {} Constructions >".format(len(self.Zones), len(self.SurfaceUDs), len(self.ConstructionUDs))
     def __str__(self):
         return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "Model_Index( _zones={!r}, _zoneObjs=<{} objs>, _uValueUID_Names={!r} )".format(sorted(self.Zones), sum(len(v) for v in self.ZoneObjs.values()), self.ConstructionUDs)
 
-class IDF_Obj_MaterialWindowSimple:
-    # For holding onto Params for
-    # WindowMaterial:SimpleGlazingSystem Objects
+def phpp_getMaterialIndex(_materialBranch):
+    """ Dict of all the Opaque Construction Materials in the model, by Name
     
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name' )
-        self.uValue = getattr(_idfObj, 'U-Factor {W/m2-K}' )
-        self.gValue = getattr(_idfObj, 'Solar Heat Gain Coefficient' )
-        self.VT = getattr(_idfObj, 'Visible Transmittance' )
+    Built once per run so each Construction Layer is a single lookup
+    """
     
-    def __unicode__(self):
-        return u'EnergyPlus WindowMaterial:Simple Params: [{}]'.format(self.Name)
+    materialIndex = {}
+    for eachMat in _materialBranch:
+        materialIndex.setdefault(getattr(eachMat, 'Name'), eachMat)
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    return materialIndex
 
-class IDF_Obj_MaterialWindowGlazing:
-    # For holding onto Params for
-    # WindowMaterial:Glazing Objects
+def phpp_getUvalues(_inputBranch, _materialIndex):
+    """ Creates the 'U-Values' worksheet Objects for the Opaque Constructions
     
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name' )
-        self.Thickness = float( getattr(_idfObj, 'Thickness {m}' ) )
-        self.Conductivity = float( getattr(_idfObj, 'Conductivity {W/m-K}' ) )
-        self.uValue = 1 / (self.Thickness/self.Conductivity)
-        self.gValue = getattr(_idfObj, 'Solar Transmittance at Normal Incidence' )
-        self.VT = getattr(_idfObj, 'Visible Transmittance at Normal Incidence' )
+    Args:
+        _inputBranch (list): IDF_Obj_Construction objects. Any Window Constructions are skipped.
+        _materialIndex (dict): {Name: IDF_Obj_MaterialLayer}, see phpp_getMaterialIndex()
+    Returns:
+        (tuple): The list of PHPP_XL_Objs, and an OrderedDict of the {EP Construction Name: PHPP UD Name}
+    """
     
-    def __unicode__(self):
-        return u'EnergyPlus WindowMaterial:Glazing Params: [{}]'.format(self.Name)
+    uID_Count = 1
+    uValueUID_Names = OrderedDict() # EP Construction Name -> PHPP UD Name
+    uValuesConstructorStartRow = 10
+    uValuesList = []
+    for eachConst in _inputBranch:
+        # for each Construction Assembly in the model....
+        
+        # Get the Construction's Name and the Materal Layers in the EP Model
+        construcionNameEP = getattr(eachConst, 'Name')
+        layers = getattr(eachConst, 'Layers') # In IDF order (outside -> in)
+        intInsuFlag = eachConst.IntInsul if eachConst.IntInsul != None else ''
+        
+        # Filter out any of the Window Constructions
+        # If the (first) material doesn't match any of the Opaque ones... it must be a window (maybe?)
+        isWindow = len(layers) > 0 and layers[0][1] not in _materialIndex
+        
+        if isWindow == True:
+            pass
+        else:
+            # Fix the name to remove 'PHPP_CONST_'
+            if 'PHPP_CONST_' in construcionNameEP:
+                constName_clean = construcionNameEP.split('PHPP_CONST_')[1].replace('_', ' ')
+            else:
+                constName_clean = construcionNameEP.replace('_', ' ')
+            
+            # Create the list of User-ID Constructions to match PHPP
+            uValueUID_Names[construcionNameEP] = '{:02d}ud-{}'.format(uID_Count, constName_clean)
+            
+            # Create the Objects for the Header Piece (Name, Rsi, Rse)
+            nameAddress = '{}{}'.format('M', uValuesConstructorStartRow + 1) # Construction Name
+            rSi = '{}{}'.format('M', uValuesConstructorStartRow + 3) # R-surface-int
+            rSe = '{}{}'.format('M', uValuesConstructorStartRow + 4) # R-surface-ext
+            intIns = '{}{}'.format('S', uValuesConstructorStartRow + 1) # Interior Insulation Flag
+            
+            uValuesList.append( PHPP_XL_Obj('U-Values', nameAddress, constName_clean))
+            uValuesList.append( PHPP_XL_Obj('U-Values', rSi, 0, 'M2K/W', 'HR-FT2-F/BTU'))
+            uValuesList.append( PHPP_XL_Obj('U-Values', rSe, 0, 'M2K/W', 'HR-FT2-F/BTU')) # For now, zero out
+            if eachConst.IntInsul != None:
+                uValuesList.append( PHPP_XL_Obj('U-Values', intIns, 'x'))
+            
+            # Create the actual Material Layers for PHPP U-Value
+            # PHPP lists the layers from the interior (Rsi) side, so inside -> out
+            layerCount = 0
+            for layer in reversed(layers):
+                # For each layer in the Construction Assembly...
+                # See if the Construction's Layer material name matches one in the Materials list....
+                # If so, use those parameters from the Material Layer
+                eachMatLayer = _materialIndex.get(layer[1])
+                
+                # Skip any unknown materials and filter out any MASSLAYERs
+                if eachMatLayer is None or layer[1] == 'MASSLAYER':
+                    continue
+                
+                # Clean the name
+                if 'PHPP_MAT_' in layer[1]:
+                    layerMatName = layer[1].split('PHPP_MAT_')[1].replace('_', ' ')
+                else:
+                    layerMatName = layer[1].replace('_', ' ')
+                
+                layerNum = layer[0]
+                layerMatCond = getattr(eachMatLayer, 'LayerConductivity')
+                layerThickness = getattr(eachMatLayer, 'LayerThickness')*1000 # Cus PHPP uses mm for thickness
+                
+                # Set up the Range tagets
+                layer1Address_L = '{}{}'.format('L', uValuesConstructorStartRow + 7 + layerCount) # Material Name
+                layer1Address_M = '{}{}'.format('M', uValuesConstructorStartRow + 7 + layerCount) # Conductivity
+                layer1Address_S = '{}{}'.format('S', uValuesConstructorStartRow + 7 + layerCount) # Thickness
+                
+                # Create the Layer Objects
+                uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_L, layerMatName))# Material Name
+                uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_M, layerMatCond, 'W/MK', 'HR-FT2-F/BTU-IN')) # Conductivity
+                uValuesList.append( PHPP_XL_Obj('U-Values', layer1Address_S, layerThickness, 'MM', 'IN')) # Thickness
+                
+                layerCount+=1
+            
+            uID_Count += 1
+            uValuesConstructorStartRow += 21
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    return uValuesList, uValueUID_Names
 
-class IDF_Obj_MaterialWindowGas:
-    # For holding onto Params for
-    # WindowMaterial:Gas Objects
-    #https://www.engineersedge.com/heat_transfer/thermal-conductivity-gases.htm
-    
-    gasConductivities = {'Air': 0.0262,
-                        'Argon': 0.0179,
-                        'Krypton': 0.0095,
-                        'Xenon': 0.0055
-    }
+def phpp_getComponents(_inputBranch):
+    """ Creates the 'Components' worksheet Glazing and Frame Objects for the Windows
     
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name' )
-        self.GasType = getattr(_idfObj, 'Gas Type' )
-        self.Conductivity = self.gasConductivities[self.GasType]
-        self.Thickness = float( (getattr(_idfObj, 'Thickness {m}' ) ) )
-        self.uValue = 1 / (self.Thickness / self.Conductivity)
+    Sets each Window's 'UD_glass_Name' and 'UD_frame_Name' for phpp_getWindows()
+    """
     
-    def __unicode__(self):
-        return u'EnergyPlus WindowMaterial:Gas Params: [{}]'.format(self.Name)
+    winComponentStartRow = 15
+    frame_Count = 0
+    glass_Count = 0
+    winComponentsList = []
+    glassNameDict = {}
+    frameNameDict = {}
+    
+    for eachWin in _inputBranch:
+        # For each PHPP Style Window Object in the model....
+        
+        ########## Glass ##########
+        # Pull out the Glass info from the window
+        gNm = getattr(eachWin.Type_Glass, 'Name')
+        gV = getattr(eachWin.Type_Glass, 'gValue')
+        uG = getattr(eachWin.Type_Glass, 'uValue')
+        
+        if gNm not in glassNameDict.keys():
+            # Add the new glass type to the dict of UD Names:
+            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
+            glassNameDict[gNm] = '{:02d}ud-{}'.format(glass_Count+1, gNm)
+            
+            # Set the glass range addresses
+            Address_Gname = '{}{}'.format('IE', winComponentStartRow + glass_Count) # Name
+            Address_Gvalue = '{}{}'.format('IF', winComponentStartRow + glass_Count) # g-Value
+            Address_Uvalue = '{}{}'.format('IG', winComponentStartRow + glass_Count) # U-Value
+            
+            # Create the PHPP write Objects
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gname, gNm))# Glass Type Name
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Gvalue, gV))# g-Value
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uvalue, uG, 'W/M2K', 'BTU/HR-FT2-F' ))# U-Value
+            
+            glass_Count +=1
+            
+        # Add the new PHPP UD Glass Name to the Window:Simple Object
+        setattr(eachWin, 'UD_glass_Name', glassNameDict[gNm] )
+        
+        ########## Frames ##########
+        # Get the Frame info
+        fNm = getattr(eachWin.Type_Frame, 'Name')
+        uF_L, uF_R, uF_B, uF_T  = eachWin.Type_Frame.uLeft, eachWin.Type_Frame.uRight, eachWin.Type_Frame.uBottom, eachWin.Type_Frame.uTop
+        wF_L, wF_R, wF_B, wF_T  = eachWin.Type_Frame.fLeft, eachWin.Type_Frame.fRight, eachWin.Type_Frame.fBottom, eachWin.Type_Frame.fTop
+        psiG_L, psiG_R, psiG_B, psiG_T  = eachWin.Type_Frame.psigLeft, eachWin.Type_Frame.psigRight, eachWin.Type_Frame.psigBottom, eachWin.Type_Frame.psigTop
+        psiI_L, psiI_R, psiI_B, psiI_T  = eachWin.Type_Frame.psiInstLeft, eachWin.Type_Frame.psiInstRight, eachWin.Type_Frame.psiInstBottom, eachWin.Type_Frame.psiInstTop
+        
+        if fNm not in frameNameDict.keys():
+            # Add the new frame type to the dict of UD Names:
+            # ie: {'Ikon: SDH': '01ud-Ikon: SDH', ....}
+            frameNameDict[fNm] = '{:02d}ud-{}'.format(frame_Count+1, fNm) # was glass_count????
+            
+            # Set the frame range address
+            Address_Fname = '{}{}'.format('IL', winComponentStartRow + frame_Count)
+            Address_Uf_Left = '{}{}'.format('IM', winComponentStartRow + frame_Count)
+            Address_Uf_Right = '{}{}'.format('IN', winComponentStartRow + frame_Count)
+            Address_Uf_Bottom = '{}{}'.format('IO', winComponentStartRow + frame_Count)
+            Address_Uf_Top = '{}{}'.format('IP', winComponentStartRow + frame_Count)
+            Address_W_Left = '{}{}'.format('IQ', winComponentStartRow + frame_Count)
+            Address_W_Right = '{}{}'.format('IR', winComponentStartRow + frame_Count)
+            Address_W_Bottom = '{}{}'.format('IS', winComponentStartRow + frame_Count)
+            Address_W_Top = '{}{}'.format('IT', winComponentStartRow + frame_Count)
+            Address_Psi_g_Left = '{}{}'.format('IU', winComponentStartRow + frame_Count)
+            Address_Psi_g_Right = '{}{}'.format('IV', winComponentStartRow + frame_Count)
+            Address_Psi_g_Bottom = '{}{}'.format('IW', winComponentStartRow + frame_Count)
+            Address_Psi_g_Top = '{}{}'.format('IX', winComponentStartRow + frame_Count)
+            Address_Psi_I_Left = '{}{}'.format('IY', winComponentStartRow + frame_Count)
+            Address_Psi_I_Right = '{}{}'.format('IZ', winComponentStartRow + frame_Count)
+            Address_Psi_I_Bottom = '{}{}'.format('JA', winComponentStartRow + frame_Count)
+            Address_Psi_I_Top = '{}{}'.format('JB', winComponentStartRow + frame_Count)
+            
+            # Create the PHPP Objects for the Frames
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Fname, fNm))# Frame Type Name
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Left, uF_L, 'W/M2K', 'BTU/HR-FT2-F')) # Frame Type U-Values
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Right, uF_R, 'W/M2K', 'BTU/HR-FT2-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Bottom, uF_B, 'W/M2K', 'BTU/HR-FT2-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Uf_Top, uF_T, 'W/M2K', 'BTU/HR-FT2-F'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Left, wF_L, 'M', 'IN')) # Frame Type Widths
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Right, wF_R, 'M', 'IN'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Bottom, wF_B, 'M', 'IN'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_W_Top, wF_T, 'M', 'IN'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Left, psiG_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Glazing
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Right, psiG_R, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Bottom, psiG_B, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_g_Top, psiG_T, 'W/MK', 'BTU/HR-FT-F'))
+            
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Left, psiI_L, 'W/MK', 'BTU/HR-FT-F')) # Frame Type Psi-Installs
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Right, psiI_R, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Bottom, psiI_B, 'W/MK', 'BTU/HR-FT-F'))
+            winComponentsList.append( PHPP_XL_Obj('Components', Address_Psi_I_Top, psiI_T, 'W/MK', 'BTU/HR-FT-F'))
+            
+            frame_Count +=1
+            
+        # Add the PHPP UD Frame Name to the Window:Simple Object
+        setattr(eachWin, 'UD_frame_Name', frameNameDict[fNm] )
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    return winComponentsList
 
-class IDF_Obj_Construction:
-    """
-    For holding onto Params for EnergPlus 'Construction' objects (Assemblies)
-    Note that when created, the new Object will clean up its name to remove any 
-    '__Int_' flags and then set the 'IntInsul' attribute as appropriate
+def phpp_getAreas(_inputBranch, _modelIndex):
+    """ Creates the 'Areas' worksheet Objects for the Opaque Surfaces in the Model_Index's Zones
+    
+    Sets each Surface's 'UD_Srfc_Name' and adds it to the Model_Index, for phpp_getWindows()
     """
-    def __init__(self, _idfObj):
-        self.Name = getattr(_idfObj, 'Name')
-        self.getLayerNames(_idfObj)
-        self.checkInteriorInsul()
     
-    def checkInteriorInsul(self):
-        if '__Int__' in self.Name:
-            self.IntInsul = 'x'
-            self.Name = self.Name.replace('__Int__', '')
-        else:
-            self.IntInsul = None
+    areasRowStart = 41
+    areaCount = 0
+    uID_Count = 1
+    areasList = []
+    for surface in _inputBranch:
+        # for each Opaque Surface in the model....
+        
+        # First, see if the Surface should be included in the output
+        if _modelIndex.includeZone(surface.HostZoneName):
+            # Get the Surface Parameters
+            nm = getattr(surface, 'Name')
+            groupNum = getattr(surface, 'GroupNum')
+            quantity = 1
+            surfaceArea = getattr(surface, 'SurfaceArea')
+            assemblyName = getattr(surface, 'AssemblyName')
+            angleFromNorth = getattr(surface, 'AngleFromNorth')
+            angleFromHoriz = getattr(surface, 'AngleFromHoriz')
+            shading = getattr(surface, 'Factor_Shading')
+            abs = getattr(surface, 'Factor_Absorptivity')
+            emmis = getattr(surface, 'Factor_Emissivity')
             
-    def getLayerNames(self, _idfObj):
-        # Set the self.Layers list of names
-        self.Layers = []
-        self.LayerNames = []
-        
-        for eachKey in _idfObj.__dict__.keys():
-            if 'Layer' in eachKey:
-                layerNum = eachKey
-                layerName = getattr(_idfObj, eachKey)
-                layerName = layerName.replace('__Int__', '')
-                self.Layers.append( [layerNum, layerName]  )
-                self.LayerNames.append(layerName)
-    
-    def __unicode__(self):
-        return u'EnergyPlus Construction Params: [{}]'.format(self.Name)
+            # Find the right UID name (with the numeric prefix)
+            assemblyName = _modelIndex.getConstructionUD(assemblyName)
+            
+            # Setup the Excel Address Locations
+            Address_Name = '{}{}'.format('L', areasRowStart + areaCount)
+            Address_GroupNum = '{}{}'.format('M', areasRowStart + areaCount)
+            Address_Quantity = '{}{}'.format('P', areasRowStart + areaCount)
+            Address_Area = '{}{}'.format('V', areasRowStart + areaCount)
+            Address_Assembly = '{}{}'.format('AC', areasRowStart + areaCount)
+            Address_AngleNorth = '{}{}'.format('AG', areasRowStart + areaCount)
+            Address_AngleHoriz = '{}{}'.format('AH', areasRowStart + areaCount)
+            Address_ShadingFac = '{}{}'.format('AJ', areasRowStart + areaCount)
+            Address_Abs = '{}{}'.format('AK', areasRowStart + areaCount)
+            Address_Emmis = '{}{}'.format('AL', areasRowStart + areaCount)
+            
+            areasList.append( PHPP_XL_Obj('Areas', Address_Name, nm))# Surface Name
+            areasList.append( PHPP_XL_Obj('Areas', Address_GroupNum, groupNum))# Surface Group Number
+            areasList.append( PHPP_XL_Obj('Areas', Address_Quantity, quantity))# Surface Quantity
+            areasList.append( PHPP_XL_Obj('Areas', Address_Area, surfaceArea, 'M2', 'FT2'))# Surface Area (m2)
+            areasList.append( PHPP_XL_Obj('Areas', Address_Assembly, assemblyName))# Assembly Type Name
+            areasList.append( PHPP_XL_Obj('Areas', Address_AngleNorth, angleFromNorth))# Orientation Off North
+            areasList.append( PHPP_XL_Obj('Areas', Address_AngleHoriz, angleFromHoriz))# Orientation Off Horizontal
+            areasList.append( PHPP_XL_Obj('Areas', Address_ShadingFac, shading))# Shading Factor
+            areasList.append( PHPP_XL_Obj('Areas', Address_Abs, abs))# Absorptivity
+            areasList.append( PHPP_XL_Obj('Areas', Address_Emmis, emmis))# Emmissivity
+            
+            # Add the PHPP UD Surface Name to the Surface Object
+            setattr(surface, 'UD_Srfc_Name', '{:d}-{}'.format(uID_Count, nm) )
+            
+            # Keep track of which Surfaces are included in the output
+            _modelIndex.addSurface(nm, surface.UD_Srfc_Name)
+            
+            uID_Count += 1
+            areaCount += 1
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
+    areasList.append( PHPP_XL_Obj('Areas', 'L19', 'Suspended Floor') )
+    return areasList
 
-class IDF_Obj_surfaceWindow:
-    # For holding onto Params for
-    # FenestrationSurface:Detailed Objects
+def phpp_getWindows(_inputBranch, _modelIndex):
+    """ Creates the 'Windows' worksheet Objects for the Windows hosted by a Surface in the Model_Index """
+    
+    windowsRowStart = 24
+    windowsCount = 0
+    winSurfacesList = []
+    
+    for window in _inputBranch:
+        # for each Window Surface Object in the model....
+        # Get the window's basic params
+        quant = getattr(window, 'Quantity')
+        nm = getattr(window, 'Name')
+        w = getattr(window, 'Width')
+        h = getattr(window, 'Height')
+        host = getattr(window, 'HostSrfc')
+        glassType = getattr(window.Type_Glass, 'Name')
+        frameType = getattr(window.Type_Frame, 'Name')
+        glassTypeUD = getattr(window, 'UD_glass_Name')
+        frameTypeUD = getattr(window, 'UD_frame_Name')
+        variantType = getattr(window, 'Type_Variant', 'a')
+        
+        # See if the Window should be included in the output
+        if _modelIndex.includeSurface(host):
+            # Find the Window's Host Surface UD
+            hostUD = _modelIndex.SurfaceUDs[host]
+            
+            # Get the Window Range Addresses
+            Address_varType = '{}{}'.format('F', windowsRowStart + windowsCount)
+            Address_winQuantity = '{}{}'.format('L', windowsRowStart + windowsCount)
+            Address_winName = '{}{}'.format('M', windowsRowStart + windowsCount)
+            Address_w = '{}{}'.format('Q', windowsRowStart + windowsCount)
+            Address_h = '{}{}'.format('R', windowsRowStart + windowsCount)
+            Address_hostName = '{}{}'.format('S', windowsRowStart + windowsCount)
+            Address_glassType = '{}{}'.format('T', windowsRowStart + windowsCount)
+            Address_frameType = '{}{}'.format('U', windowsRowStart + windowsCount)
+            Address_install_Left = '{}{}'.format('AA', windowsRowStart + windowsCount)
+            Address_install_Right = '{}{}'.format('AB', windowsRowStart + windowsCount)
+            Address_install_Bottom = '{}{}'.format('AC', windowsRowStart + windowsCount)
+            Address_install_Top = '{}{}'.format('AD', windowsRowStart + windowsCount)
+            
+            # Create the PHPP Window Object
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_varType, variantType)) # Quantity
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winQuantity, quant)) # Quantity
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_winName, nm)) # Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_w, w, 'M', 'FT')) # Width
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_h, h, 'M', 'FT')) # Height
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_hostName, hostUD)) # Host Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_glassType, glassTypeUD)) # Glass UD Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_frameType, frameTypeUD)) # Frame UD Name
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Left, window.Installs.Inst_L)) # Install Condition Left
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Right, window.Installs.Inst_R)) # Install Condition Right
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Bottom, window.Installs.Inst_B)) # Install Condition Bottom
+            winSurfacesList.append( PHPP_XL_Obj('Windows', Address_install_Top, window.Installs.Inst_T)) # Install Condition Top
+            
+            windowsCount += 1
     
-    def __init__(self, _idfObj, _winSimpleMat, _wShadFac=None, _sShadFac=None):
-        self.Quantity = 1
-        self.Name = getattr(_idfObj, 'Name')
-        self.Dims = phpp_GetWindowSize(  phpp_geomFromVerts(_idfObj)[1]  )
-        self.Width = self.Dims[0]
-        self.Height = self.Dims[1]
-        self.HostSrfc = getattr(_idfObj, 'Building Surface Name')
-        self.winterShadingFac = _wShadFac
-        self.summerShadingFac = _sShadFac
-        self.EPConstuctionName = getattr(_idfObj, "Construction Name")
+    return winSurfacesList
+
+#-------------------------------------------------------------------------------
+#### Write-Diff Snapshot ####
+XL_SNAPSHOT_VERSION = 1 # Bump whenever the saved snapshot format changes
+
+class XL_WriteSnapshot:
+    """ The {(Worksheet, Range): Value} cells last written to a workbook
+    
+    BT_XLWriteWorkbook diffs against this so only the cells which changed since
+    the last write are sent to the workbook. Whenever the workbook itself is saved,
+    the snapshot is saved next to it ('PHPP.xlsx' -> 'PHPP.xlsx.idf2phdiff') along with
+    the template's hash and the workbook's size and modified-time. Opening the same
+    workbook again picks it back up (see xl_loadWriteSnapshot) so incremental writes
+    carry over from one session to the next.
+    
+    'Generation' counts the writes which changed any cells, so values read back
+    from the workbook can be re-used until the next write changes something.
+    """
+    
+    def __init__(self, _workbookPath=None, _templateHash=None):
+        """
+        Args:
+            _workbookPath (str): The full path to the workbook. None for a snapshot which is never saved.
+            _templateHash (str): The md5 hash of the template the workbook was copied from
+        """
+        self.WorkbookPath = _workbookPath
+        self.TemplateHash = _templateHash
+        self.Cells = {}
+        self.Generation = 0
+    
+    def getPath(self):
+        if not self.WorkbookPath:
+            return None
+        return self.WorkbookPath + '.idf2phdiff'
+    
+    def getKey(self):
+        """ The snapshot's key: workbook path, template hash and the workbook file's size / modified-time """
         
-        # This will take in an EP 'WindowMaterial:SimpleGlazingSystem' and build PHPP style frame / glass
-        self.setPHPPConstruction(self.EPConstuctionName, _winSimpleMat)
+        fileStat = os.stat(self.WorkbookPath)
+        return {'version': XL_SNAPSHOT_VERSION,
+                'path': os.path.abspath(self.WorkbookPath),
+                'template': self.TemplateHash,
+                'size': fileStat.st_size,
+                'mtime': fileStat.st_mtime}
     
-    def setPHPPConstruction(self, _constructionName, _winSimpleMat, _installs=[1,1,1,1]):
-        # Sets the PHPP Style Frame, Glass and Installs 
-        self.Type_Glass = PHPP_Glazing(
-                _constructionName, # Name
-                _winSimpleMat.gValue, # g-Value
-                _winSimpleMat.uValue # U-Value
-                )
+    def diff(self, _newCells):
+        """ Finds the cells to write, to go from the last write to the new cells
         
-        self.Type_Frame = PHPP_Frame(
-                _constructionName, # Name
-                [_winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue, _winSimpleMat.uValue], # Frame U-Values
-                [0.12, 0.12, 0.12, 0.12], # Frame Widths (Default to 0.1m)
-                [0.00, 0.00, 0.00, 0.00], # Psi-Glazing Edge Defaults
-                [0.00, 0.00, 0.00, 0.00] # Psi-Installs Defaults)
-                ) 
+        Args:
+            _newCells (dict): {(Worksheet, Range): Value} for everything to be in the workbook now
+        Returns:
+            (list): (worksheet, range, value) items for the new or changed cells. Any cells
+                which are no longer written are cleared ('')
+        """
         
-        self.Installs = PHPP_Window_Install(_installs)
-    
-    def setShadingDims_Simple(self, _in):
-        self.ShadingDimensions = _in
+        oldCells = self.Cells
+        newKeys = set(_newCells)
+        oldKeys = set(oldCells)
+        
+        items = [(key[0], key[1], _newCells[key]) for key in newKeys - oldKeys]
+        items.extend( (key[0], key[1], _newCells[key]) for key in newKeys & oldKeys if oldCells[key] != _newCells[key] )
+        items.extend( (key[0], key[1], '') for key in oldKeys - newKeys )
+        
+        return items
     
-    def getShadingDims_Simple(self):
-        try:
-            return self.ShadingDimensions
-        except AttributeError as e:
-            return None
+    def update(self, _newCells):
+        """ Records the cells now in the workbook, after a write
+        
+        'Generation' only moves on if the cells actually changed, so a write with
+        nothing new in it doesn't make anyone read the workbook again.
+        
+        Returns:
+            (bool): True if the cells changed
+        """
+        
+        if _newCells == self.Cells:
+            return False
+        
+        self.Cells = _newCells
+        self.Generation += 1
+        return True
     
-    def getShadingFactors(self):
+    def save(self):
+        """ Saves the snapshot next to the workbook. Only call this once the workbook itself is saved """
+        
+        path = self.getPath()
+        if not path or not os.path.exists(self.WorkbookPath):
+            return False
+        
         try:
-            return self.winterShadingFac, self.summerShadingFac
-        except AttributeError as e:
-            return None
+            with open(path, 'wb') as snapshotFile:
+                pickle.dump(self.getKey(), snapshotFile, 2)
+                pickle.dump(self.Cells, snapshotFile, 2)
+        except Exception as e:
+            print 'Unable to write the write-diff snapshot: {}'.format(e)
+            return False
+        
+        return True
     
     def __unicode__(self):
-        return u'FenestrationSurface:Detailed: [{}]'.format(self.Name)
-    
+        return u"XL Write Snapshot | Workbook: {}  |  Cells: {}  |  Generation: {}".format(self.WorkbookPath, len(self.Cells), self.Generation)
     def __str__(self):
         return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _workbookPath={!r}, _templateHash={!r} )".format(
+               self.__class__.__name__,
+               self.WorkbookPath,
+               self.TemplateHash)
 
-class IDF_Obj_surfaceOpaque:
-    # For holding onto Params for
-    # BuildingSurface:Detailed Objects
+def xl_loadWriteSnapshot(_workbookPath, _templatePath=None):
+    """ Returns the workbook's saved write-diff snapshot, or a new empty one
     
-    def __init__(self, _idfObj, _northAngle):
-        self.Name = getattr(_idfObj, 'Name')
-        self.AssemblyName = getattr(_idfObj, 'Construction Name')
-        self.srfcType = getattr(_idfObj, 'Surface Type')
-        self.exposure = getattr(_idfObj, 'Outside Boundary Condition')
-        self.HostZoneName = getattr(_idfObj, 'Zone Name')
-        self.findGroupNumber(self.srfcType, self.exposure)
-        self.getGeometryData(_idfObj, _northAngle)
+    The saved snapshot is only used if it is for the same workbook path and
+    template, and the workbook hasn't been saved anywhere else since (same size
+    and modified-time). Otherwise the workbook may not hold what the snapshot
+    says it does, so everything will be written again.
+    
+    Args:
+        _workbookPath (str): The full path to the workbook
+        _templatePath (str): The full path to the template the workbook was copied from
+    Returns:
+        XL_WriteSnapshot
+    """
+    
+    templateHash = None
+    if _templatePath and os.path.exists(_templatePath):
+        templateHash = idf_fileHash(_templatePath)
+    
+    snapshot = XL_WriteSnapshot(_workbookPath, templateHash)
+    path = snapshot.getPath()
+    
+    if not os.path.exists(path) or not os.path.exists(_workbookPath):
+        return snapshot
+    
+    try:
+        with open(path, 'rb') as snapshotFile:
+            if pickle.load(snapshotFile) == snapshot.getKey():
+                snapshot.Cells = pickle.load(snapshotFile)
+    except Exception as e:
+        print 'Unable to read the write-diff snapshot: {}'.format(e)
+    
+    return snapshot
+
+#-------------------------------------------------------------------------------
+#### Result Map ####
+XL_ResultField = namedtuple('XL_ResultField', ['Label', 'Worksheet', 'Range'])
+
+def xl_typedValue(_value):
+    """ Cleans up a value read from the workbook: numbers (and numeric text) as float, other text as unicode, blanks as None """
+    
+    if _value is None or isinstance(_value, bool):
+        return _value
+    elif isinstance(_value, (int, long, float)):
+        return float(_value)
+    
+    text = unicode(_value).strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+class XL_ResultMap:
+    """ A set of result cells to read back from the workbook, ie: the 'Verification' worksheet results
+    
+    The cells on each Worksheet are grouped into as few rectangular ranges as
+    possible (see getReadRanges) so each range is a single read, instead of one
+    read per cell. The results are kept against the workbook's XL_WriteSnapshot
+    'Generation', so if nothing has been written since the last read, the
+    workbook isn't read again.
+    """
+    
+    maxGap = 2 # Blank rows / columns to read through, rather than starting a new range
+    
+    def __init__(self, _fields):
+        """
+        Args:
+            _fields (list): (label, worksheet, range) for each result, in the order to output them
+        """
+        self.Fields = [XL_ResultField(*[unicode(item).strip() for item in field]) for field in _fields]
+        self.ReadRanges = self.getReadRanges()
+        self.Results = None
+        self.ReadFrom = None
     
-    def getGeometryData(self, idfObj, _northAngle):
-        # Build the Geometry from the Vertex points
-        self.Boundary, self.Srfc, self.SurfaceArea, self.Centroid, self.NormalVector = phpp_geomFromVerts(idfObj)
+    def getReadRanges(self):
+        """ Groups the Fields on each Worksheet into rectangular ranges to read
         
-        # Find the Rotation off North Vector
-        self.AngleFromNorth = phpp_calcNorthAngle(self.NormalVector, _northAngle)
+        Cells in the same column (up to 'maxGap' blank rows apart) are joined into
+        runs, then runs over the same rows in neighbouring columns are joined side
+        by side. Anything which isn't a single cell address is left as its own range.
         
-        # Find the Rotation off Horizontal
-        self.AngleFromHoriz = ghc.Degrees(ghc.Angle(self.NormalVector, ghc.UnitZ(1)))[0]
+        Returns:
+            (list): (worksheet, range, [(field index, row offset, col offset), ...]) for each range
+        """
         
-        # Use Defaults at this time.
-        # Someday calc the shading factors and have inputs for the rest?
-        self.Factor_Shading = 0.5 # Default
-        self.Factor_Absorptivity = 0.6  # Default
-        self.Factor_Emissivity = 0.9   # Default
+        readRanges = []
+        cellsBySheet = {}
+        
+        for i, field in enumerate(self.Fields):
+            cell = xl_splitAddress(field.Range)
+            if cell is None:
+                readRanges.append( (field.Worksheet, field.Range, [(i, 0, 0)]) )
+            else:
+                cellsBySheet.setdefault(field.Worksheet, {}).setdefault(cell, []).append(i)
+        
+        for sheet, cells in sorted(cellsBySheet.items()):
+            # Find the runs of rows in each column
+            cols = {}
+            for col, row in cells.keys():
+                cols.setdefault(col, []).append(row)
+            
+            runs = {} # {(startRow, endRow): [col, col, ...]}
+            for col, rows in cols.items():
+                rows.sort()
+                start = prev = rows[0]
+                for row in rows[1:] + [None]:
+                    if row != None and row - prev <= self.maxGap + 1:
+                        prev = row
+                        continue
+                    runs.setdefault((start, prev), []).append(col)
+                    start = prev = row
+            
+            # Join runs over the same rows in neighbouring columns into rectangles
+            for (top, bottom), runCols in sorted(runs.items()):
+                runCols.sort()
+                left = right = runCols[0]
+                for col in runCols[1:] + [None]:
+                    if col != None and col - right <= self.maxGap + 1:
+                        right = col
+                        continue
+                    
+                    if top == bottom and left == right:
+                        address = '{}{}'.format(xl_numToCol(left), top)
+                    else:
+                        address = '{}{}:{}{}'.format(xl_numToCol(left), top, xl_numToCol(right), bottom)
+                    
+                    offsets = [(i, r - top, c - left)
+                                for (c, r), indexes in cells.items() if left <= c <= right and top <= r <= bottom
+                                for i in indexes]
+                    readRanges.append( (sheet, address, offsets) )
+                    
+                    left = right = col
+        
+        return readRanges
     
-    def findGroupNumber(self, _srfcType, _exposureType):
-        # Figure out the 'Group Number' for PHPP based on the EP Exposure type
-        if _exposureType == 'Surface':
-            pass
-        elif _srfcType == 'Wall' and _exposureType == 'Outdoors':
-            self.GroupNum = 8
-        elif _srfcType == 'Wall' and _exposureType == 'Ground':
-            self.GroupNum = 9
-        elif _srfcType == 'Roof' and _exposureType == 'Outdoors':
-            self.GroupNum = 10
-        elif _srfcType == 'Floor' and _exposureType == 'Ground':
-            self.GroupNum = 11
-        elif _srfcType == 'Floor' and _exposureType == 'Outdoors':
-            self.GroupNum = 12
-        elif _exposureType == 'Adiabatic':
-            self.GroupNum = 18
-        else:
-            self.GroupNum = 13
-            print _srfcType, _exposureType
-            groupWarning = "Couldn't figure out the Group Number for surface '{}'?".format(self.Name)
-            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, groupWarning)
+    def read(self, _workbook):
+        """ Reads the result values from the workbook, or returns the last ones if nothing has been written since
+        
+        Args:
+            _workbook (XL_WorkbookBackend): The open workbook
+        Returns:
+            (list): (label, value) for each Field on a Worksheet in the workbook. Values are
+                float for numbers, unicode for text and None for blank cells.
+        """
+        
+        snapshot = _workbook.writeSnapshot
+        readFrom = (snapshot, snapshot.Generation) if snapshot else None
+        if readFrom and self.Results is not None and self.ReadFrom == readFrom:
+            return self.Results
+        
+        sheetNames = set(_workbook.getSheetNames())
+        values = {}
+        for sheet, address, offsets in self.ReadRanges:
+            if sheet not in sheetNames:
+                continue
+            
+            if len(offsets) == 1 and xl_splitAddress(address) is None:
+                rows = [[_workbook.readCell(sheet, address)]]
+            else:
+                rows = _workbook.readRange(sheet, address)
+            
+            for i, rowOffset, colOffset in offsets:
+                values[i] = xl_typedValue(rows[rowOffset][colOffset])
+        
+        self.Results = [(field.Label, values[i]) for i, field in enumerate(self.Fields) if i in values]
+        self.ReadFrom = readFrom
+        return self.Results
     
     def __unicode__(self):
-        return u'EnergyPlus BuildingSurface:Detailed Params: [{}]'.format(self.Name)
-    
+        return u"XL Result Map | Fields: {}  |  Ranges: {}".format(len(self.Fields), len(self.ReadRanges))
     def __str__(self):
         return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _fields={!r} )".format(
+               self.__class__.__name__,
+               [tuple(field) for field in self.Fields])
 
-class IDF_Obj_location:
-    def __init__(self):
-        self.Name = getattr(_idfObj, 'Name')
-        self.Latitude = getattr(_idfObj, 'Latitude {deg}')
-        self.Longitude = getattr(_idfObj, 'Longitude {deg}')
-        self.TimeZone = getattr(_idfObj, 'Time Zone {hr}')
-        self.Elevation = getattr(_idfObj, 'Elevation {m}')
+#-------------------------------------------------------------------------------
+#### Excel Workbook Backends ####
+class XL_WorkbookBackend:
+    """ Interface for reading / writing a PHPP workbook
     
-    def __unicode__(self):
-        return u'EnergyPlus Location Params: [{}]'.format(self.Name)
+    BT_XLOpenWorkbook's ExcelInstance (COM) and XL_XlsxFileBackend (headless
+    .xlsx file) both implement this, so the Write / Read / Save components
+    don't need to know which one they are talking to.
+    """
     
-    def __str__(self):
-        return unicode(self).encode('utf-8')
-
-#-------------------------------------------------------------------------------
-# For the main Excel Object Writer #
-class PHPP_XL_Obj:
-    """ A holder for an Excel writable datapoint with a worksheet, range and value """
+    writeSnapshot = None # The XL_WriteSnapshot for the open workbook, see BT_XLOpenWorkbook
     
-    # {Unit You have: {Unit you Want}, {...}, ...}
-    conversionSchema = {
-            'C'    : {'SI':'*1', 'C':'*1', 'F':'*(9/5)+32'},
-            'LITER': {'SI':'*1', 'LITER':'*1', 'GALLON':'*0.264172'},
-            'MM'   : {'SI':'*1', 'MM':'*1', 'FT':'*0.00328084', 'IN':'*0.0394'},
-            'M'    : {'SI':'*1', 'M':'*1', 'FT':'*3.280839895', 'IN':'*39.3701'},
-            'M/DAY': {'SI':'*1', 'M/DAY':'*1', 'FT/DAY':'*3.280839895'},
-            'M2'   : {'SI':'*1', 'M2':'*1', 'FT2':'*10.76391042'},
-            'M3'   : {'SI':'*1', 'M3':'*1', 'FT3':'*35.31466672'},
-            'M3/H' : {'SI':'*1', 'M3/H':'*1', 'CFM':'*0.588577779'},
-            'WH/M3': {'SI':'*1', 'WH/M3':'*1', 'W/CFM':'*1.699010796'},
-            'WH/KM2':{'SI':'*1', 'WH/KM2':'*1', 'BTU/FT2':'*0.176110159'},
-            'MJ/M3K':{'SI':'*1', 'MJ/M3K':'*1', 'BTU/FT3-F':'*14.91066014'},
-            'W/M2K': {'SI':'*1', 'W/M2K':'*1', 'BTU/HR-FT2-F':'*0.176110159','HR-FT2-F/BTU':'**-1*5.678264134' },
-            'M2K/W': {'SI':'*1', 'M2K/W':'*1', 'HR-FT2-F/BTU':'*5.678264134'},
-            'W/MK' : {'SI':'*1', 'W/MK':'*1', 'HR-FT2-F/BTU-IN':'**-1*0.144227909', 'BTU/HR-FT-F':'*0.577789236'},
-            'W/K'  : {'SI':'*1', 'W/K':'*1', 'BTU/HR-F':'*1.895633976'},
-            'KW'   : {'SI':'*1', 'KW':'*1','BTU/H':'*3412.141156'},
-            'W/W'  : {'SI':'*1', 'W/W':'*1', 'BTU/HW':'*3.412141156'} # SEER
-            }
+    def hasWorkbook(self):
+        raise NotImplementedError
     
-    def __init__(self, _shtNm, _rangeAddress, _val, _unitSI=None, _unitIP='SI'):
-        """
+    def getSheetNames(self):
+        raise NotImplementedError
+    
+    def readCell(self, _sheet, _address):
+        raise NotImplementedError
+    
+    def readRange(self, _sheet, _range):
+        """ Returns the values in the range as a list of rows (each a list of values) """
+        raise NotImplementedError
+    
+    def writeBlocks(self, _blocks, _highlight=True):
+        """ Writes XL_Block data to the workbook
+        
         Args:
-            _shtNm (str): The Name of the Worksheet to write to
-            _rangeAddress (str): The Cell Range (A1, B12, etc...) to write to on the Worksheet
-            _val (str): The Value to write to the Cell Range (Value2)
-            _unitSI: (str) The SI unit for the item
-            _unitIP: (str) The IP unit for the item
+            _blocks (list): XL_Block tuples, see xl_groupIntoBlocks()
+            _highlight (bool): Mark the written cells
+        Returns:
+            (list): The Worksheet names which couldn't be found. Any other error is raised.
         """
-        self.Worksheet = _shtNm
-        self.Range = _rangeAddress
-        self.Value = _val
-        self.Unit_SI = _unitSI
-        self.Unit_IP = _unitIP
+        raise NotImplementedError
     
-    def getWorksheet(self, _units='SI'):
-        if _units == 'SI':
-            return self.Worksheet
+    def writeItems(self, _items, _highlight=True):
+        """ Groups the (worksheet, range, value) items into blocks, then writes them
         
-        if self.Worksheet == 'U-Values':
-            return 'R-Values'
-        elif self.Worksheet == 'Additional Vent':
-            return 'Addl vent'
-        else:
-            return self.Worksheet
+        Returns:
+            (tuple): The list of XL_Blocks written, and list of Worksheet names not found
+        """
+        
+        blocks = xl_groupIntoBlocks(_items)
+        return blocks, self.writeBlocks(blocks, _highlight)
     
-    def getValue(self, _targetUnit='SI'):
-        """ Get the Item Value properly. Allows for unit conversion.
+    def calculate(self):
+        pass
+    
+    def save(self):
+        raise NotImplementedError
+    
+    def saveAndQuit(self, closeIfUser):
+        self.save()
+    
+    def saveWriteSnapshot(self):
+        """ Saves the write-diff snapshot next to the workbook. Call after a successful save() """
         
-        For instance calling "obj.getValue(obj.Unit_IP)" will return the 
-        converted value into Inch-Pound units. Pass 'SI' or leave 
-        input blank for no conversion (return = self.Value x 1.0)
+        if self.writeSnapshot:
+            self.writeSnapshot.save()
+
+def xl_xmlEscape(_text):
+    return _text.replace(u'&', u'&amp;').replace(u'<', u'&lt;').replace(u'>', u'&gt;').replace(u'"', u'&quot;')
+
+def xl_xmlUnescape(_text):
+    def _replaceEntity(match):
+        entity = match.group(1)
+        if entity.startswith(u'#x'):
+            return unichr(int(entity[2:], 16))
+        elif entity.startswith(u'#'):
+            return unichr(int(entity[1:]))
+        return {u'amp':u'&', u'lt':u'<', u'gt':u'>', u'quot':u'"', u'apos':u"'"}.get(entity, match.group(0))
+    
+    return re.sub(u'&(#?\\w+);', _replaceEntity, _text)
+
+class XL_XlsxFileBackend(XL_WorkbookBackend):
+    """ Headless workbook backend which reads / patches the .xlsx package directly
+    
+    No Excel (COM) is needed. Written cells are held until save() and then patched
+    into the worksheet XML, keeping each cell's existing style. Excel can't be asked to
+    recalculate here, so the workbook is flagged to do a full recalculation when it is next
+    opened, and readCell() returns the values cached in the file (or any pending writes).
+    Highlighting is not applied.
+    """
+    
+    reRow = re.compile(u'<row\\b[^>]*?(?:/>|>.*?</row>)', re.DOTALL)
+    reCell = re.compile(u'<c\\b[^>]*?(?:/>|>.*?</c>)', re.DOTALL)
+    reAttr = re.compile(u'([\\w:]+)="([^"]*)"')
+    reNumber = re.compile(u'^\\s*[-+]?(\\d+\\.?\\d*|\\.\\d+)([eE][-+]?\\d+)?\\s*$')
+    reFormula = re.compile(u'<f\\b([^>]*?)(?:/>|>(.*?)</f>)', re.DOTALL)
+    reCellRef = re.compile(u'(?<![\\w.$])(\\$?)([A-Z]{1,3})(\\$?)(\\d+)(?![\\w(!])')
+    
+    def __init__(self, _filePath):
+        self.activeWorkbookName = _filePath
+        self.activeWorkbook = None
+        self.sheetPaths = {}    # {Sheet Name: 'xl/worksheets/sheet1.xml', ...}
+        self.sheetXML = {}      # {Sheet Name: u'<worksheet...', ...} only the sheets touched
+        self.sheetCells = {}    # {Sheet Name: {(col, row): cell xml, ...}, ...} for reading
+        self.pending = {}       # {Sheet Name: {(col, row): value, ...}, ...}
+        self.sharedStrings = None
+        
+        self.activeWorkbook = zipfile.ZipFile(_filePath, 'r')
+        self.loadSheets()
+    
+    def loadSheets(self):
+        """ Finds each Worksheet's XML part from the workbook and its relationships """
+        
+        workbookXML = self._readPart('xl/workbook.xml')
+        relsXML = self._readPart('xl/_rels/workbook.xml.rels')
+        
+        targets = {}
+        for rel in re.findall(u'<Relationship\\b[^>]*>', relsXML):
+            attrs = dict(self.reAttr.findall(rel))
+            target = attrs.get(u'Target', u'')
+            if target.startswith(u'/'):
+                target = target[1:]
+            elif not target.startswith(u'xl/'):
+                target = u'xl/' + target
+            targets[attrs.get(u'Id')] = target
+        
+        for sheet in re.findall(u'<sheet\\b[^>]*>', workbookXML):
+            attrs = dict(self.reAttr.findall(sheet))
+            relId = [v for k, v in attrs.items() if k.endswith(u':id')]
+            if relId and relId[0] in targets:
+                self.sheetPaths[xl_xmlUnescape(attrs[u'name'])] = targets[relId[0]]
+    
+    def _readPart(self, _name):
+        return self.activeWorkbook.read(_name).decode('utf-8')
+    
+    def _getSheetXML(self, _sheet):
+        if _sheet not in self.sheetXML:
+            self.sheetXML[_sheet] = self._readPart(self.sheetPaths[_sheet])
+        return self.sheetXML[_sheet]
+    
+    def _getSharedStrings(self):
+        if self.sharedStrings is None:
+            self.sharedStrings = []
+            if 'xl/sharedStrings.xml' in self.activeWorkbook.namelist():
+                for si in re.findall(u'<si>(.*?)</si>', self._readPart('xl/sharedStrings.xml'), re.DOTALL):
+                    text = u''.join(re.findall(u'<t\\b[^>]*>(.*?)</t>', si, re.DOTALL))
+                    self.sharedStrings.append(xl_xmlUnescape(text))
+        return self.sharedStrings
+    
+    def _cellValue(self, _cellXML):
+        """ Returns the (cached) value of a single <c> cell element, the way COM's Value2 would """
+        
+        typ = dict(self.reAttr.findall(_cellXML[:_cellXML.find(u'>')])).get(u't', u'n')
+        
+        if typ == u'inlineStr':
+            return xl_xmlUnescape(u''.join(re.findall(u'<t\\b[^>]*>(.*?)</t>', _cellXML, re.DOTALL)))
+        
+        val = re.search(u'<v>(.*?)</v>', _cellXML, re.DOTALL)
+        if not val:
+            return None
+        val = val.group(1)
+        
+        if typ == u's':
+            return self._getSharedStrings()[int(val)]
+        elif typ == u'b':
+            return val == u'1'
+        elif typ in (u'str', u'e'):
+            return xl_xmlUnescape(val)
+        else:
+            return float(val)
+    
+    def hasWorkbook(self):
+        return self.activeWorkbook != None
+    
+    def getSheetNames(self):
+        return self.sheetPaths.keys()
+    
+    def readCell(self, _sheet, _address):
+        cell = xl_splitAddress(_address)
+        pending = self.pending.get(_sheet, {})
+        if cell in pending:
+            return pending[cell]
+        
+        if _sheet not in self.sheetCells:
+            cells = {}
+            for cellXML in self.reCell.findall(self._getSheetXML(_sheet)):
+                address = re.search(u'\\br="([A-Z]+\\d+)"', cellXML[:cellXML.find(u'>')+1])
+                if address:
+                    cells[xl_splitAddress(address.group(1))] = cellXML
+            self.sheetCells[_sheet] = cells
+        
+        cellXML = self.sheetCells[_sheet].get(cell)
+        return self._cellValue(cellXML) if cellXML else None
+    
+    def readRange(self, _sheet, _range):
+        start, end = (_range.split(':') + [_range])[:2]
+        startCol, startRow = xl_splitAddress(start)
+        endCol, endRow = xl_splitAddress(end)
+        
+        return [[self.readCell(_sheet, '{}{}'.format(xl_numToCol(col), row))
+                    for col in range(startCol, endCol + 1)]
+                    for row in range(startRow, endRow + 1)]
+    
+    def writeBlocks(self, _blocks, _highlight=True):
+        missing = []
+        for block in _blocks:
+            if block.Worksheet not in self.sheetPaths:
+                missing.append(block.Worksheet)
+                continue
+            
+            start = block.Range.split(':')[0]
+            cell = xl_splitAddress(start)
+            if cell is None:
+                raise ValueError("Can't write to '{}'!{} without Excel, only cell addresses (ie: 'L12') can be used".format(block.Worksheet, block.Range))
+            
+            pending = self.pending.setdefault(block.Worksheet, {})
+            for i, row in enumerate(block.Values):
+                for j, val in enumerate(row):
+                    pending[(cell[0] + j, cell[1] + i)] = val
+        
+        return missing
+    
+    def _newCellXML(self, _address, _style, _value):
+        """ Builds the <c> element for a value, like Excel would if it was typed in """
+        
+        styleAttr = u' s="{}"'.format(_style) if _style else u''
+        
+        if isinstance(_value, basestring) and self.reNumber.match(_value):
+            _value = float(_value)
+        
+        if _value is None or _value == '':
+            return u'<c r="{}"{}/>'.format(_address, styleAttr)
+        elif isinstance(_value, basestring) and _value.startswith('=') and len(_value) > 1:
+            # No cached <v>, Excel works the value out on open (fullCalcOnLoad)
+            if not isinstance(_value, unicode):
+                _value = str(_value).decode('utf-8')
+            return u'<c r="{}"{}><f>{}</f></c>'.format(_address, styleAttr, xl_xmlEscape(_value[1:]))
+        elif isinstance(_value, bool):
+            return u'<c r="{}"{} t="b"><v>{}</v></c>'.format(_address, styleAttr, int(_value))
+        elif isinstance(_value, (int, long, float)):
+            return u'<c r="{}"{}><v>{}</v></c>'.format(_address, styleAttr, repr(float(_value)))
+        else:
+            if not isinstance(_value, unicode):
+                _value = str(_value).decode('utf-8')
+            return u'<c r="{}"{} t="inlineStr"><is><t xml:space="preserve">{}</t></is></c>'.format(
+                    _address, styleAttr, xl_xmlEscape(_value))
+    
+    def _shiftFormula(self, _formula, _cols, _rows):
+        """ Moves the relative cell references in a formula, the way Excel does when it is copied ie: 'D17*$B$2' -> 'E18*$B$2' """
+        
+        def shift(match):
+            colAbs, col, rowAbs, row = match.groups()
+            if not colAbs:
+                col = xl_numToCol(xl_colToNum(col) + _cols)
+            if not rowAbs:
+                row = str(int(row) + _rows)
+            return u'{}{}{}{}'.format(colAbs, col, rowAbs, row)
+        
+        # Leave anything inside "quoted text" alone
+        parts = _formula.split(u'"')
+        parts[::2] = [self.reCellRef.sub(shift, part) for part in parts[::2]]
+        return u'"'.join(parts)
+    
+    def _detachSharedFormulas(self, _sheetDataXML, _pendingCells):
+        """ Gives each cell sharing a formula with a cell about to be overwritten its own copy of the formula
+        
+        A shared formula is only written out in full on its first ('master') cell, the
+        other cells just refer to it by its 'si' index. Once the master is overwritten they
+        would lose their formula, so each is written out in full, shifted to the cell.
         
         Args:
-            _targetUnit: (str) The unit to convert the value to. 'SI' or 'IP'
+            _sheetDataXML (unicode): The worksheet's <sheetData> XML
+            _pendingCells (dict): {(col, row): value, ...} the cells about to be written
         Returns:
-            value converted into the right units
+            (unicode): The <sheetData> XML
         """
         
-        if not self.Unit_SI:
-            return self.Value
-        
-        if _targetUnit == 'IP':
-            targetUnit = self.Unit_IP
-        elif _targetUnit == 'SI':
-            targetUnit = self.Unit_SI
+        masters = {} # {si: ((col, row), formula)}
+        cellXMLs = self.reCell.findall(_sheetDataXML)
+        for cellXML in cellXMLs:
+            if u'shared' not in cellXML:
+                continue
+            formula = self.reFormula.search(cellXML)
+            if not formula:
+                continue
+            attrs = dict(self.reAttr.findall(formula.group(1)))
+            if attrs.get(u't') == u'shared' and u'ref' in attrs:
+                cell = xl_splitAddress(re.search(u'\\br="([A-Z]+\\d+)"', cellXML).group(1))
+                if cell in _pendingCells:
+                    masters[attrs[u'si']] = (cell, xl_xmlUnescape(formula.group(2) or u''))
+        
+        if not masters:
+            return _sheetDataXML
+        
+        def detach(match):
+            cellXML = match.group(0)
+            formula = self.reFormula.search(cellXML)
+            if not formula or formula.group(2):
+                return cellXML
+            attrs = dict(self.reAttr.findall(formula.group(1)))
+            if attrs.get(u't') != u'shared' or attrs.get(u'si') not in masters:
+                return cellXML
+            
+            cell = xl_splitAddress(re.search(u'\\br="([A-Z]+\\d+)"', cellXML).group(1))
+            if cell in _pendingCells:
+                return cellXML
+            
+            (masterCol, masterRow), masterFormula = masters[attrs[u'si']]
+            newFormula = self._shiftFormula(masterFormula, cell[0] - masterCol, cell[1] - masterRow)
+            return cellXML.replace(formula.group(0), u'<f>{}</f>'.format(xl_xmlEscape(newFormula)), 1)
+        
+        return self.reCell.sub(detach, _sheetDataXML)
+    
+    def _patchRow(self, _rowNum, _rowXML, _values):
+        """ Replaces / inserts the cells in a single <row> element """
+        
+        if _rowXML is None:
+            head, cellsXML = u'<row r="{}">'.format(_rowNum), u''
+        elif _rowXML.endswith(u'/>') and u'</row>' not in _rowXML:
+            head, cellsXML = _rowXML[:-2] + u'>', u''
+        else:
+            head = _rowXML[:_rowXML.find(u'>')+1]
+            cellsXML = _rowXML[len(head):-len(u'</row>')]
+        
+        head = re.sub(u'\\sspans="[^"]*"', u'', head) # optional, and may no longer be right
+        
+        cells = {}
+        for cellXML in self.reCell.findall(cellsXML):
+            address = re.search(u'\\br="([A-Z]+)\\d+"', cellXML[:cellXML.find(u'>')+1])
+            cells[xl_colToNum(address.group(1))] = cellXML
+        
+        for col, val in _values.items():
+            style = None
+            if col in cells:
+                style = dict(self.reAttr.findall(cells[col][:cells[col].find(u'>')])).get(u's')
+            cells[col] = self._newCellXML(u'{}{}'.format(xl_numToCol(col), _rowNum), style, val)
+        
+        return head + u''.join(cells[col] for col in sorted(cells.keys())) + u'</row>'
+    
+    def _patchSheet(self, _sheet):
+        """ Patches all the pending values for a Worksheet into its <sheetData> """
+        
+        xml = self._getSheetXML(_sheet)
+        
+        pendingRows = {}
+        for (col, row), val in self.pending[_sheet].items():
+            pendingRows.setdefault(row, {})[col] = val
+        
+        if re.search(u'<sheetData\\s*/>', xml):
+            xml = re.sub(u'<sheetData\\s*/>', u'<sheetData></sheetData>', xml)
+        start = xml.find(u'>', xml.find(u'<sheetData')) + 1
+        end = xml.find(u'</sheetData>')
+        sheetDataXML = self._detachSharedFormulas(xml[start:end], self.pending[_sheet])
+        
+        rows = []
+        for rowXML in self.reRow.findall(sheetDataXML):
+            rowNum = int(re.search(u'\\br="(\\d+)"', rowXML[:rowXML.find(u'>')+1]).group(1))
+            if rowNum in pendingRows:
+                rowXML = self._patchRow(rowNum, rowXML, pendingRows.pop(rowNum))
+            rows.append( (rowNum, rowXML) )
+        
+        for rowNum, values in pendingRows.items():
+            rows.append( (rowNum, self._patchRow(rowNum, None, values)) )
+        rows.sort(key=lambda row: row[0])
+        
+        self.sheetXML[_sheet] = xml[:start] + u''.join(row[1] for row in rows) + xml[end:]
+        self.sheetCells.pop(_sheet, None)
+    
+    def _patchWorkbook(self, _parts):
+        """ Drop the calc chain and flag Excel to fully recalculate the workbook on open """
+        
+        workbookXML = self._readPart('xl/workbook.xml')
+        if u'<calcPr' in workbookXML:
+            calcPr = re.search(u'<calcPr\\b[^>]*?/?>', workbookXML).group(0)
+            newCalcPr = re.sub(u'\\sfullCalcOnLoad="[^"]*"', u'', calcPr)
+            newCalcPr = newCalcPr.replace(u'<calcPr', u'<calcPr fullCalcOnLoad="1"', 1)
+            workbookXML = workbookXML.replace(calcPr, newCalcPr)
+        else:
+            for tag in (u'</definedNames>', u'</sheets>'):
+                if tag in workbookXML:
+                    workbookXML = workbookXML.replace(tag, tag + u'<calcPr fullCalcOnLoad="1"/>', 1)
+                    break
+        _parts['xl/workbook.xml'] = workbookXML
+        
+        relsXML = self._readPart('xl/_rels/workbook.xml.rels')
+        _parts['xl/_rels/workbook.xml.rels'] = re.sub(u'<Relationship\\b[^>]*calcChain[^>]*/>', u'', relsXML)
+        
+        typesXML = self._readPart('[Content_Types].xml')
+        _parts['[Content_Types].xml'] = re.sub(u'<Override\\b[^>]*calcChain[^>]*/>', u'', typesXML)
+    
+    def save(self):
+        if not self.pending:
+            self.saveWriteSnapshot()
+            return True
+        
+        parts = {}
+        for sheet in self.pending.keys():
+            self._patchSheet(sheet)
+            parts[self.sheetPaths[sheet]] = self.sheetXML[sheet]
+        self._patchWorkbook(parts)
+        
+        # Write to a temp file first. The original is only moved aside to a .bak
+        # (never deleted) until the temp is in its place, so a failure can't lose it.
+        tempPath = self.activeWorkbookName + '.tmp'
+        backupPath = self.activeWorkbookName + '.bak'
+        try:
+            with zipfile.ZipFile(tempPath, 'w', zipfile.ZIP_DEFLATED) as newFile:
+                for item in self.activeWorkbook.infolist():
+                    if item.filename == 'xl/calcChain.xml':
+                        continue
+                    if item.filename in parts:
+                        newFile.writestr(item, parts[item.filename].encode('utf-8'))
+                    else:
+                        newFile.writestr(item, self.activeWorkbook.read(item.filename))
+            
+            self.activeWorkbook.close()
+            if os.path.exists(backupPath):
+                os.remove(backupPath)
+            os.rename(self.activeWorkbookName, backupPath)
+            try:
+                os.rename(tempPath, self.activeWorkbookName)
+            except Exception:
+                os.rename(backupPath, self.activeWorkbookName)
+                raise
+        except Exception as e:
+            print('Unable to save the workbook: {}'.format(e))
+            if os.path.exists(tempPath) and os.path.exists(self.activeWorkbookName):
+                os.remove(tempPath)
+            return False
         else:
-            targetUnit = _targetUnit
+            try:
+                os.remove(backupPath)
+            except OSError:
+                pass
+        finally:
+            self.activeWorkbook.close()
+            if os.path.exists(self.activeWorkbookName):
+                self.activeWorkbook = zipfile.ZipFile(self.activeWorkbookName, 'r')
+            else:
+                self.activeWorkbook = None
         
-        try:
-            schema = self.conversionSchema.get(self.Unit_SI, {'SI':1})
-            conversionFactor = schema.get(targetUnit, 1)
-            return eval( str(self.Value)+str(conversionFactor))
-        except:
-            return self.Value
+        self.pending = {}
+        self.saveWriteSnapshot()
+        return True
+    
+    def saveAndQuit(self, closeIfUser):
+        self.save()
+        if self.activeWorkbook:
+            self.activeWorkbook.close()
+        self.activeWorkbook = None
     
     def __unicode__(self):
-        return u"PHPP Obj | Worksheet: {self.Worksheet}  |  Cell: {self.Range}  |  Value: {self.Value}".format(self=self)
+        return u"Excel File (headless) | Active Worksheet: {self.activeWorkbookName}".format(self=self)
     def __str__(self):
-        return unicode(self).encode('utf-8')
+        return unicode(self).encode("utf-8")
     def __repr__(self):
-       return "{}( _nm={!r}, _shtNm={!r}, _rangeAddress={!r}, _val={!r}, _unitSI={!r}, _unitIP={!r}".format(
+        return "{}( _filePath={!r} )".format(
                self.__class__.__name__,
-               self.Worksheet,
-               self.Range,
-               self.Value,
-               self.Unit_SI,
-               self.Unit_IP)
+               self.activeWorkbookName )
 
 ####################################
 # Add the Classes to the Scriptcontext
@@ -4434,6 +6848,8 @@ sc.sticky['phpp_ClimateData'] = getClimateData()
 # PHPP Conversion Defs
 sc.sticky['phpp_calcNorthAngle'] = phpp_calcNorthAngle
 sc.sticky['phpp_GetWindowSize'] = phpp_GetWindowSize
+sc.sticky['phpp_geomDataFromVerts'] = phpp_geomDataFromVerts
+sc.sticky['phpp_geomDataFromVertsBulk'] = phpp_geomDataFromVertsBulk
 sc.sticky['phpp_makeHBMaterial'] = phpp_makeHBMaterial
 sc.sticky['phpp_makeHBMaterial_NoMass'] =  phpp_makeHBMaterial_NoMass
 sc.sticky['phpp_makeHBMaterial_Opaque'] =  phpp_makeHBMaterial_Opaque
@@ -4444,7 +6860,29 @@ sc.sticky['phpp_convertValueToMetric'] = phpp_convertValueToMetric
 
 # PHPP Object Classes
 sc.sticky['PHPP_XL_Obj'] = PHPP_XL_Obj
+sc.sticky['xl_getWriteItems'] = xl_getWriteItems
+sc.sticky['xl_splitAddress'] = xl_splitAddress
+sc.sticky['xl_groupIntoBlocks'] = xl_groupIntoBlocks
+sc.sticky['Model_Index'] = Model_Index
+sc.sticky['phpp_getMaterialIndex'] = phpp_getMaterialIndex
+sc.sticky['phpp_getUvalues'] = phpp_getUvalues
+sc.sticky['phpp_getComponents'] = phpp_getComponents
+sc.sticky['phpp_getAreas'] = phpp_getAreas
+sc.sticky['phpp_getWindows'] = phpp_getWindows
+sc.sticky['XL_WorkbookBackend'] = XL_WorkbookBackend
+sc.sticky['XL_XlsxFileBackend'] = XL_XlsxFileBackend
+sc.sticky['XL_WriteSnapshot'] = XL_WriteSnapshot
+sc.sticky['xl_loadWriteSnapshot'] = xl_loadWriteSnapshot
+sc.sticky['XL_ResultMap'] = XL_ResultMap
+sc.sticky['PHPP_ShadingBVH'] = PHPP_ShadingBVH
+sc.sticky['phpp_shadingCandidates'] = phpp_shadingCandidates
+sc.sticky['PHPP_ZoneIndex'] = PHPP_ZoneIndex
+sc.sticky['PHPP_DocLibrary'] = PHPP_DocLibrary
+sc.sticky['phpp_getDocLibrary'] = phpp_getDocLibrary
+sc.sticky['PHPP_UserTextRecord'] = PHPP_UserTextRecord
+sc.sticky['PHPP_UserTextSnapshot'] = PHPP_UserTextSnapshot
 sc.sticky['PHPP_WindowObject'] = PHPP_WindowObject
+sc.sticky['PHPP_Window_Shading_Calculator'] = PHPP_Window_Shading_Calculator
 sc.sticky['PHPP_Glazing'] = PHPP_Glazing
 sc.sticky['PHPP_Frame'] = PHPP_Frame
 sc.sticky['PHPP_Window_Install'] = PHPP_Window_Install
@@ -4469,6 +6907,14 @@ sc.sticky['PHPP_grnd_SuspendedFloor'] = PHPP_grnd_SuspendedFloor
 sc.sticky['PHPP_ClimateDataSet'] = PHPP_ClimateDataSet
 
 # IDF Object Classes
+sc.sticky['IDF_Schema'] = IDF_Schema
+sc.sticky['IDF_Class'] = IDF_Class
+sc.sticky['idf_tokenizeFile'] = idf_tokenizeFile
+sc.sticky['idf_iterObjects'] = idf_iterObjects
+sc.sticky['IDF_ObjectStore'] = IDF_ObjectStore
+sc.sticky['idf_storeFromInput'] = idf_storeFromInput
+sc.sticky['idf_loadStore'] = idf_loadStore
+sc.sticky['idf_getCacheStats'] = idf_getCacheStats
 sc.sticky['IDF_Zone'] = IDF_Zone
 sc.sticky['IDF_ZoneInfilFlowRate'] = IDF_ZoneInfilFlowRate
 sc.sticky['IDF_ZoneList'] = IDF_ZoneList
@@ -25,6 +25,7 @@ Will determine the fresh-air ventilation flow rates for all the PHPP Rooms in th
 >  If you want to use this component to align a PHPP and EP model, use an HB 'Constant Schedule' object and set the zone's ventilation schedule to '1'.
 -
 EM September 1, 2020
+Updated October 17, 2026
 
     Args:
         _HBZones: List. A list of all the HB Zones to use.
@@ -39,7 +40,7 @@ EM September 1, 2020
 
 ghenv.Component.Name = "BT_CalcVentFlowRates"
 ghenv.Component.NickName = "Room Vent Flowrates"
-ghenv.Component.Message = 'SEP_01_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -48,14 +49,13 @@ ghenv.Component.SubCategory = "01 | Model"
 import scriptcontext as sc
 import Grasshopper.Kernel as gh
 import os
-from collections import deque
-import itertools
 from datetime import date
 from System import Object
 from Grasshopper import DataTree
 from Grasshopper.Kernel.Data import GH_Path
 import ghpythonlib.components as ghc
 from collections import namedtuple
+from array import array
 
 # Defs and Classes
 PHPP_Sys_Ventilation = sc.sticky['PHPP_Sys_Ventilation']
@@ -64,67 +64,84 @@ HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
 # ------------------------------------------------------------------------------
 ########            FROM HB 'convertEPSCHValues' COMPONENT              ########
+def getWeekdayDOYs(weekStartWith):
+    # The Days-of-Year (0-364) falling on each weekday (0-6), for a year starting on 'weekStartWith'
+    
+    weekdayDOYs = [[] for i in range(7)]
+    for day in range(365):
+        weekdayDOYs[(day + weekStartWith) % 7].append(day)
+    
+    return weekdayDOYs
+
 def getNationalHols(country, weekStartWith):
+    # The national holiday table only depends on the year start day and the country
+    # so build it once per session and hand back copies (addHolidays extends the list)
+    
+    holidayCache = sc.sticky.setdefault('IDF2PHPP_NationalHolidays', {})
+    key = (country, weekStartWith)
+    if key not in holidayCache:
+        holidayCache[key] = tuple(buildNationalHols(country, weekStartWith))
+    
+    return list(holidayCache[key])
+
+def buildNationalHols(country, weekStartWith):
     # Dictionary of national hoildays arranged by country.
     # All countries are accounted for with the exception of:
     # BLZ (CENTRAL AMERICA), BRN (SOUTH PACIFIC), GUM (SOUTH PACIFIC), MHL (SOUTH PACIFIC), PLW (SOUTH PACIFIC), UMI (SOUTH PACIFIC)
     # https://energyplus.net/weather
     ###################################################
     # Source: http://www.officeholidays.com/countries/ ------ http://www.officeholidays.com/countries/
-    listOfValues = [0, 1, 2, 3, 4, 5, 6]
-    week = deque(listOfValues)
-    week.rotate(-weekStartWith)
-    dayWeekList = list(itertools.chain.from_iterable(itertools.repeat(week, 53)))[:365]
+    wd = getWeekdayDOYs(weekStartWith)
     countries = {
-    'USA':[0,[i for i, x in enumerate(dayWeekList) if x == 2][2],[i for i, x in enumerate(dayWeekList) if x == 2][21],184,[i for i, x in enumerate(dayWeekList) if x == 2][35],314,[i for i, x in enumerate(dayWeekList) if x == 5][46],359],
-    'CAN': [0,181,[i for i, x in enumerate(dayWeekList) if x == 2][35],358,359],
-    'CUB': [0,1,[i for i, x in enumerate(dayWeekList) if x == 6][12],120,205,206,207,282,358,364],
-    'GTM': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],120,180,257,292,304,358],
-    'HND': [0,[i for i, x in enumerate(dayWeekList) if x == 4][11],[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],120,257,278,358],
-    'MEX': [0,[i for i, x in enumerate(dayWeekList) if x == 2][4],[i for i, x in enumerate(dayWeekList) if x == 2][11],[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],120,258,[i for i, x in enumerate(dayWeekList) if x == 2][46],345,358,359],
-    'MTQ': [0,[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,127,[i for i, x in enumerate(dayWeekList) if x == 2][19],194,226,304,314,358],
-    'NIC': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],120,121,169,256,257,341,358],
-    'PRI': [0,5,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 2][12],127,169,327,358],
-    'SLV': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],120,129,168,215,216,217,305,358,359],
-    'VIR': [0,5,17,45,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],89,149,153,248,304,314,358,359],
-    'ARG': [0,[i for i, x in enumerate(dayWeekList) if x == 2][5],[i for i, x in enumerate(dayWeekList) if x == 3][5],82,[i for i, x in enumerate(dayWeekList) if x == 6][12],91,120,144,170,188,189,[i for i, x in enumerate(dayWeekList) if x == 2][32],282,[i for i, x in enumerate(dayWeekList) if x == 2][47],341,358],
-    'BOL': [0,21,[i for i, x in enumerate(dayWeekList) if x == 2][5],[i for i, x in enumerate(dayWeekList) if x == 3][5],[i for i, x in enumerate(dayWeekList) if x == 5][11],120,[i for i, x in enumerate(dayWeekList) if x == 5][20],171,305,358],
-    'BRA': [0,[i for i, x in enumerate(dayWeekList) if x == 2][5],[i for i, x in enumerate(dayWeekList) if x == 3][5],[i for i, x in enumerate(dayWeekList) if x == 4][5],[i for i, x in enumerate(dayWeekList) if x == 5][11],110,120,[i for i, x in enumerate(dayWeekList) if x == 5][20],249,284,305,318,323,358],
-    'CHL': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],120,140,179,196,226,261,262,303,304,341,358],
-    'COL': [0,10,79,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],120,128,149,156,[i for i, x in enumerate(dayWeekList) if x == 2][26],200,218,226,289,[i for i, x in enumerate(dayWeekList) if x == 2][44],317,341,358],
-    'ECU': [0,38,39,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 1][12],120,143,221,281,306,358],
-    'PER': [0,[i for i, x in enumerate(dayWeekList) if x == 4][11],[i for i, x in enumerate(dayWeekList) if x == 5][11],120,179,208,209,242,280,304,341,358,359],
-    'PRY': [0,59,[i for i, x in enumerate(dayWeekList) if x == 4][11],[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 1][12],120,133,134,162,227,271,284,341,358,364],
-    'URY': [0,38,39,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],108,120,169,198,284,236,305,358],
-    'VEN': [0,38,39,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],108,120,174,179,185,204,226,284,304,358,359,364],
-    'AUS': [0,25,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],114,358,359,360],
-    'FJI': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],174,249,282,303,345,359,360],
+    'USA':[0,wd[2][2],wd[2][21],184,wd[2][35],314,wd[5][46],359],
+    'CAN': [0,181,wd[2][35],358,359],
+    'CUB': [0,1,wd[6][12],120,205,206,207,282,358,364],
+    'GTM': [0,wd[5][11],wd[6][12],wd[0][12],120,180,257,292,304,358],
+    'HND': [0,wd[4][11],wd[5][11],wd[6][12],wd[0][12],120,257,278,358],
+    'MEX': [0,wd[2][4],wd[2][11],wd[5][11],wd[6][12],120,258,wd[2][46],345,358,359],
+    'MTQ': [0,wd[2][12],120,124,127,wd[2][19],194,226,304,314,358],
+    'NIC': [0,wd[5][11],wd[6][12],120,121,169,256,257,341,358],
+    'PRI': [0,5,wd[5][11],wd[2][12],127,169,327,358],
+    'SLV': [0,wd[5][11],wd[6][12],wd[0][12],120,129,168,215,216,217,305,358,359],
+    'VIR': [0,5,17,45,wd[5][11],wd[6][12],wd[2][12],89,149,153,248,304,314,358,359],
+    'ARG': [0,wd[2][5],wd[3][5],82,wd[6][12],91,120,144,170,188,189,wd[2][32],282,wd[2][47],341,358],
+    'BOL': [0,21,wd[2][5],wd[3][5],wd[5][11],120,wd[5][20],171,305,358],
+    'BRA': [0,wd[2][5],wd[3][5],wd[4][5],wd[5][11],110,120,wd[5][20],249,284,305,318,323,358],
+    'CHL': [0,wd[5][11],120,140,179,196,226,261,262,303,304,341,358],
+    'COL': [0,10,79,wd[5][11],wd[6][12],120,128,149,156,wd[2][26],200,218,226,289,wd[2][44],317,341,358],
+    'ECU': [0,38,39,wd[6][12],wd[1][12],120,143,221,281,306,358],
+    'PER': [0,wd[4][11],wd[5][11],120,179,208,209,242,280,304,341,358,359],
+    'PRY': [0,59,wd[4][11],wd[5][11],wd[1][12],120,133,134,162,227,271,284,341,358,364],
+    'URY': [0,38,39,wd[5][11],wd[6][12],108,120,169,198,284,236,305,358],
+    'VEN': [0,38,39,wd[5][11],wd[6][12],108,120,174,179,185,204,226,284,304,358,359,364],
+    'AUS': [0,25,wd[6][12],wd[2][12],114,358,359,360],
+    'FJI': [0,wd[6][12],wd[0][12],wd[2][12],174,249,282,303,345,359,360],
     'MYS': [38,120,121,140,155,186,187,242,254,258,274,345,358,359],
-    'NZL': [0,3,38,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],114,[i for i, x in enumerate(dayWeekList) if x == 2][22],[i for i, x in enumerate(dayWeekList) if x == 2][42],358,359,360],
-    'PHL': [0,1,38,55,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 0][12],98,120,162,187,232,240,253,303,304,333,357,358,363,364],
-    'SGP': [0,38,39,[i for i, x in enumerate(dayWeekList) if x == 6][12],120,121,140,218,220,254,302,358,359],
+    'NZL': [0,3,38,wd[6][12],wd[0][12],114,wd[2][22],wd[2][42],358,359,360],
+    'PHL': [0,1,38,55,wd[5][11],wd[6][12],wd[0][12],98,120,162,187,232,240,253,303,304,333,357,358,363,364],
+    'SGP': [0,38,39,wd[6][12],120,121,140,218,220,254,302,358,359],
     'DZA': [0,120,187,253,274,283,304,345],
     'EGY': [6,24,114,120,121,187,188,189,204,253,254,255,274,278,345],
     'ETH': [6,19,60,119,120,124,147,253,255,269,345],
-    'GHA': [0,64,65,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,121,144,181,186,253,263,[i for i, x in enumerate(dayWeekList) if x == 6][48],358,359],
-    'KEN': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,187,253,292,345,358,359],
+    'GHA': [0,64,65,wd[6][12],wd[2][12],120,121,144,181,186,253,263,wd[6][48],358,359],
+    'KEN': [0,wd[6][12],wd[2][12],120,187,253,292,345,358,359],
     'LBY': [47,120,187,188,252,253,254,255,258,274,295,345,357],
     'MAR': [0,10,120,188,210,225,231,232,253,274,309,321,345],
-    'MDG': [0,[i for i, x in enumerate(dayWeekList) if x == 2][12],88,120,124,135,176,226,304,345,358],
-    'SEN': [0,[i for i, x in enumerate(dayWeekList) if x == 2][12],93,120,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],187,226,255,304,345,358],
+    'MDG': [0,wd[2][12],88,120,124,135,176,226,304,345,358],
+    'SEN': [0,wd[2][12],93,120,124,wd[2][19],187,226,255,304,345,358],
     'TUN': [0,13,78,98,120,187,188,189,205,224,253,254,255,274,287,345],
-    'ZAF': [0,79,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],117,120,121,166,220,266,349,358,359],
-    'ZWE': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],107,120,144,[i for i, x in enumerate(dayWeekList) if x == 2][31],[i for i, x in enumerate(dayWeekList) if x == 3][31],355,358,359],
+    'ZAF': [0,79,wd[6][12],wd[2][12],117,120,121,166,220,266,349,358,359],
+    'ZWE': [0,wd[6][12],wd[2][12],107,120,144,wd[2][31],wd[3][31],355,358,359],
     'ARE': [0,124,186,187,252,253,254,255,274,333,335,336,344],
     'BDG': [51,75,84,103,120,140,142,181,183,185,187,226,236,253,254,255,283,284,345,349,358],
     'CHN': [0,37,38,39,40,41,42,43,93,120,121,159,257,258,273,274,275,276,277,278,279],
     'IND': [25,226,274],
     'IRN': [41,71,77,78,79,80,81,89,90,110,124,141,153,154,170,177,187,211,255,263,264,283,284,324,325,350,354],
-    'JPN': [0,[i for i, x in enumerate(dayWeekList) if x == 2][1],41,79,118,122,123,124,[i for i, x in enumerate(dayWeekList) if x == 2][28],222,[i for i, x in enumerate(dayWeekList) if x == 2][37],264,282,306,326,356],
+    'JPN': [0,wd[2][1],41,79,118,122,123,124,wd[2][28],222,wd[2][37],264,282,306,326,356],
     'KAZ': [0,6,59,66,79,80,81,91,98,187,241,253,334,349,352],
     'KOR': [0,37,38,39,40,59,124,133,156,226,256,257,258,275,281,358],
     'KWT': [2,55,56,124,156,157,158,252,253,254,255,274,345],
-    'LKA': [14,22,34,52,65,80,[i for i, x in enumerate(dayWeekList) if x == 6][12],102,103,110,120,140,141,169,186,199,228,254,284,301,317,345,346,358],
+    'LKA': [14,22,34,52,65,80,wd[6][12],102,103,110,120,140,141,169,186,199,228,254,284,301,317,345,346,358],
     'MAC': [0,38,39,40,94,120,258,273,293,353],
     'MDV': [0,11,120,156,186,206,253,254,274,306,314,334,345,364],
     'MNG': [0,38,191,192,193,194,195,362],
@@ -136,40 +153,40 @@ def getNationalHols(country, weekStartWith):
     'TWN': [0,37,38,39,40,41,42,93,120,128,257,282],
     'UZB': [0,13,66,79,98,187,243,255,273,341],
     'VNM': [0,36,37,38,39,40,105,106,119,120,121,122,244],
-    'AUT': [0,5,[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],145,226,298,304,311,341,358,359],
-    'BEL': [0,[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],201,226,304,314,358],
-    'BRG': [0,61,62,[i for i, x in enumerate(dayWeekList) if x == 6][17],120,[i for i, x in enumerate(dayWeekList) if x == 2][17],125,141,247,248,264,265,357,358,359],
+    'AUT': [0,5,wd[2][12],120,124,wd[2][19],145,226,298,304,311,341,358,359],
+    'BEL': [0,wd[2][12],120,124,wd[2][19],201,226,304,314,358],
+    'BRG': [0,61,62,wd[6][17],120,wd[2][17],125,141,247,248,264,265,357,358,359],
     'BIH': [0,1,120,121],
     'BLR': [0,6,7,65,66,120,128,129,183,310,358],
-    'CHE': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],124,212,358],
-    'CYP': [0,5,[i for i, x in enumerate(dayWeekList) if x == 2][10],83,90,[i for i, x in enumerate(dayWeekList) if x == 6][17],120,[i for i, x in enumerate(dayWeekList) if x == 2][17],[i for i, x in enumerate(dayWeekList) if x == 2][24],226,273,300,358,359],
-    'CZE': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,127,185,186,270,300,320,357,358,359],
-    'DEU': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],275,358,359],
-    'DNK': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],[i for i, x in enumerate(dayWeekList) if x == 6][16],124,[i for i, x in enumerate(dayWeekList) if x == 2][19],155,357,358,359],
-    'ESP': [0,5,[i for i, x in enumerate(dayWeekList) if x == 6][12],120,226,284,304,339,341,358],
-    'FIN': [0,5,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,174,175,308,340,357,358,359],
-    'FRA': [0,[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,127,[i for i, x in enumerate(dayWeekList) if x == 2][19],194,226,304,314,358],
-    'GBR': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],121,149,359,360],
-    'GRC': [0,5,[i for i, x in enumerate(dayWeekList) if x == 2][10],83,[i for i, x in enumerate(dayWeekList) if x == 6][17],120,[i for i, x in enumerate(dayWeekList) if x == 2][17],[i for i, x in enumerate(dayWeekList) if x == 2][24],226,300,358],
-    'HUN': [0,73,[i for i, x in enumerate(dayWeekList) if x == 1][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,[i for i, x in enumerate(dayWeekList) if x == 1][19],[i for i, x in enumerate(dayWeekList) if x == 2][19],231,295,304,358,359],
-    'IRL': [0,75,[i for i, x in enumerate(dayWeekList) if x == 2][12],[i for i, x in enumerate(dayWeekList) if x == 2][17],[i for i, x in enumerate(dayWeekList) if x == 2][22],[i for i, x in enumerate(dayWeekList) if x == 2][30],303,358,359,360],
-    'ISL': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 1][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],110,120,124,[i for i, x in enumerate(dayWeekList) if x == 1][19],[i for i, x in enumerate(dayWeekList) if x == 2][19],167,212,357,358,359,364],
+    'CHE': [0,wd[6][12],124,212,358],
+    'CYP': [0,5,wd[2][10],83,90,wd[6][17],120,wd[2][17],wd[2][24],226,273,300,358,359],
+    'CZE': [0,wd[6][12],wd[2][12],120,127,185,186,270,300,320,357,358,359],
+    'DEU': [0,wd[6][12],wd[2][12],120,124,wd[2][19],275,358,359],
+    'DNK': [0,wd[5][11],wd[6][12],wd[2][12],wd[6][16],124,wd[2][19],155,357,358,359],
+    'ESP': [0,5,wd[6][12],120,226,284,304,339,341,358],
+    'FIN': [0,5,wd[6][12],wd[2][12],120,124,174,175,308,340,357,358,359],
+    'FRA': [0,wd[2][12],120,124,127,wd[2][19],194,226,304,314,358],
+    'GBR': [0,wd[6][12],121,149,359,360],
+    'GRC': [0,5,wd[2][10],83,wd[6][17],120,wd[2][17],wd[2][24],226,300,358],
+    'HUN': [0,73,wd[1][12],wd[2][12],120,wd[1][19],wd[2][19],231,295,304,358,359],
+    'IRL': [0,75,wd[2][12],wd[2][17],wd[2][22],wd[2][30],303,358,359,360],
+    'ISL': [0,wd[5][11],wd[6][12],wd[1][12],wd[2][12],110,120,124,wd[1][19],wd[2][19],167,212,357,358,359,364],
     'ISR': [82,113,119,131,163,225,275,276,284,289,297],
-    'ITA': [0,5,[i for i, x in enumerate(dayWeekList) if x == 2][12],114,120,152,226,304,341,358,359],
-    'LTU': [0,46,69,[i for i, x in enumerate(dayWeekList) if x == 2][12],120,[i for i, x in enumerate(dayWeekList) if x == 1][22],174,186,226,304,357,358,359],
-    'NLD': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],116,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],358],
-    'NOR': [0,[i for i, x in enumerate(dayWeekList) if x == 5][11],[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,[i for i, x in enumerate(dayWeekList) if x == 2][19],136,358,359],
-    'POL': [0,5,[i for i, x in enumerate(dayWeekList) if x == 1][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,122,134,145,226,304,314,358,359],
-    'PRT': [0,[i for i, x in enumerate(dayWeekList) if x == 6][12],114,120,160,226,341,357,358],
-    'ROU': [0,1,23,120,[i for i, x in enumerate(dayWeekList) if x == 2][17],170,226,333,334,358,359],
+    'ITA': [0,5,wd[2][12],114,120,152,226,304,341,358,359],
+    'LTU': [0,46,69,wd[2][12],120,wd[1][22],174,186,226,304,357,358,359],
+    'NLD': [0,wd[6][12],wd[2][12],116,124,wd[2][19],358],
+    'NOR': [0,wd[5][11],wd[6][12],wd[2][12],120,124,wd[2][19],136,358,359],
+    'POL': [0,5,wd[1][12],wd[2][12],120,122,134,145,226,304,314,358,359],
+    'PRT': [0,wd[6][12],114,120,160,226,341,357,358],
+    'ROU': [0,1,23,120,wd[2][17],170,226,333,334,358,359],
     'RUS': [0,3,4,5,6,53,66,120,128,163,307],
-    'SRB': [0,1,6,7,45,46,[i for i, x in enumerate(dayWeekList) if x == 6][17],[i for i, x in enumerate(dayWeekList) if x == 0][17],[i for i, x in enumerate(dayWeekList) if x == 1][17],[i for i, x in enumerate(dayWeekList) if x == 2][17],128,283],
-    'SVK': [0,5,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,127,155,240,243,257,273,289,357,358,359],
-    'SVN': [0,38,[i for i, x in enumerate(dayWeekList) if x == 2][12],116,120,121,175,226,303,304,358,359],
-    'SWE': [0,5,[i for i, x in enumerate(dayWeekList) if x == 6][12],[i for i, x in enumerate(dayWeekList) if x == 2][12],120,124,156,174,175,277,357,358,359,364],
+    'SRB': [0,1,6,7,45,46,wd[6][17],wd[0][17],wd[1][17],wd[2][17],128,283],
+    'SVK': [0,5,wd[6][12],wd[2][12],120,127,155,240,243,257,273,289,357,358,359],
+    'SVN': [0,38,wd[2][12],116,120,121,175,226,303,304,358,359],
+    'SWE': [0,5,wd[6][12],wd[2][12],120,124,156,174,175,277,357,358,359,364],
     'SYR': [0,66,106,120,125,187,255,275,278,345,358],
     'TUR': [0,112,120,138,157,158,159,241,253,254,255,256,301],
-    'UKR': [0,6,66,120,[i for i, x in enumerate(dayWeekList) if x == 2][17],127,128,[i for i, x in enumerate(dayWeekList) if x == 2][24],235,286,324]
+    'UKR': [0,6,66,120,wd[2][17],127,128,wd[2][24],235,286,324]
     }
     
     return countries[country]
@@ -369,36 +386,33 @@ def checkInputs(_HBZoneObjects, _type):
         return 'EP'
 
 def histogram(_data, _nbins):
-    # Creates a dictionary Histogram of some data in n-bins
+    # Creates a Histogram of some data in n-bins, in a single pass over the data
     
-    #print _data
     min_val = min(_data)
     max_val = max(_data)
-    hist_bins = {} # The number of items in each bin
-    hist_vals = {} # The avg value for each bin
-    total = 0
-    
-    # Initialize the dict
-    for k in range(_nbins+1):
-        hist_bins[k] = 0
-        hist_vals[k] = 0
+    hist_bins = [0.0] * (_nbins+1) # The number of items in each bin
+    hist_vals = [0.0] * (_nbins+1) # The avg value for each bin
+    total = len(_data)
     
     # Create the Histogram
-    for d in _data:
-        bin_number = int(_nbins * ((d - min_val) / (max_val - min_val)))
-        
-        hist_bins[bin_number] += 1
-        hist_vals[bin_number] += d
-        total += 1
+    if max_val > min_val:
+        binFactor = _nbins / (max_val - min_val)
+        for d in _data:
+            bin_number = int((d - min_val) * binFactor)
+            hist_bins[bin_number] += 1
+            hist_vals[bin_number] += d
+    else:
+        # Constant data, everything lands in the first bin
+        hist_bins[0] = float(total)
+        hist_vals[0] = min_val * total
     
     # Clean up / fix the data for output
-    for n in hist_vals.keys():
-        hist_vals[n] =  hist_vals[n] / hist_bins[n]
-    
-    for h in hist_bins.keys():
-        hist_bins[h] = hist_bins[h] / total
+    for n in range(_nbins+1):
+        if hist_bins[n]:
+            hist_vals[n] = hist_vals[n] / hist_bins[n]
+        hist_bins[n] = hist_bins[n] / total
     
-    return hist_bins, hist_vals # The number of items in each bin, the avg value of the items in the bin
+    return hist_bins, hist_vals # The fraction of items in each bin, the avg value of the items in the bin
 
 def getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea):
     # Finds and returns the zone total floor area
@@ -415,7 +429,34 @@ def getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea):
     
     return zoneFloorArea
 
-def getHBLoadAndSched(_HBzoneObj):
+# Hourly values, annual average and PHPP-Style (3 bin) histogram of one HB Schedule
+SchedSummary = namedtuple('SchedSummary', 'values average bins vals')
+
+def getSchedSummary(_schedCache, _schName, _startDayOfTheWeek=None, _epwFile=None, _customHol=[]):
+    # Reads the HB Schedule only the first time it is asked for. Zones which share
+    # a Program (and so a schedule) will all use the same hourly values, average and bins
+    
+    key = (_schName.upper(), _startDayOfTheWeek, _epwFile, tuple(_customHol))
+    if key in _schedCache:
+        return _schedCache[key]
+    
+    result = main(_schName, _startDayOfTheWeek, _epwFile, _customHol)[0]
+    
+    # Clean up the HB/EP Schdeule (remove text header)
+    values = array('d')
+    for eachItem in result:
+        try:
+            values.append(float(eachItem))
+        except:
+            pass
+    
+    bins, vals = histogram(values, 2)
+    summary = SchedSummary(values, sum(values) / len(values), bins, vals)
+    _schedCache[key] = summary
+    
+    return summary
+
+def getHBLoadAndSched(_HBzoneObj, _schedCache):
     ############################################################################
     # Get the HB/EP Ventilation Loads and Sched for the Zone from the Hive
     ############################################################################
@@ -431,20 +472,13 @@ def getHBLoadAndSched(_HBzoneObj):
     HBZoneSchedules = _HBzoneObj.getCurrentSchedules(True, ghenv.Component)
     occupancySchedule = HBZoneSchedules['occupancySchedule']
     
+    HBoccupancySched = None
     if occupancySchedule:
-        result = main(occupancySchedule, None, None, [])[0]
-    
-    # Clean up the HB/EP Occupancy Schdeule (remove text header)
-    HBoccupancySchedualAsValues_ = []
-    for eachItem in result:
-        try:
-            HBoccupancySchedualAsValues_.append(float(eachItem))
-        except:
-            pass
+        HBoccupancySched = getSchedSummary(_schedCache, occupancySchedule)
     
-    return HBnumOfPeoplePerArea, HBventilationPerArea, HBventilationPerPerson, HBoccupancySchedualAsValues_
+    return HBnumOfPeoplePerArea, HBventilationPerArea, HBventilationPerPerson, HBoccupancySched
 
-def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _userVentSched, _zoneGrossFloorArea):
+def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _zoneLoadAndSched, _userVentSched, _zoneGrossFloorArea):
     # Figure out the HB Zone's Floor Area to use (different than TFA)
     zoneFloorArea = getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea)
     
@@ -452,21 +486,16 @@ def calcZoneAnnualVentFlowRateFromHB(_HBzoneObj, _userVentSched, _zoneGrossFloor
         warning = "Something wrong with the floor area - are you sure there is at least one Floor surface in the zone?"
         ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
     
-    # Pull the Ventilaiton loads, Occupancy Schedule from the Hive
-    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSchedAsValues = getHBLoadAndSched(_HBzoneObj)
+    # Ventilaiton loads, Occupancy Schedule from the Hive
+    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSched = _zoneLoadAndSched
     
     # Calc the Avg Zone Occupancy
-    avgZoneOccupancy = (sum(zoneOccSchedAsValues) / len(zoneOccSchedAsValues)) * numOfPeoplePerArea * zoneFloorArea
+    avgZoneOccupancy = zoneOccSched.average * numOfPeoplePerArea * zoneFloorArea
     
-    # Calc the Hourly Flow rates (m3/h) from the HB Hive Schedule
-    zoneVentilation_forArea = [ventilationPerArea * zoneFloorArea * 60 * 60] * 8760 # m3/s---> m3/h
-    zoneVentilation_forPeople = []
-    for eachHourOccRate in zoneOccSchedAsValues:
-        #zoneVentilation_forPeople.append(eachHourOccRate * numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60) # m3/s---> m3/h
-        zoneVentilation_forPeople.append( numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60) # m3/s---> m3/h
-    
-    zoneVentilation_forArea_Avg = sum(zoneVentilation_forArea) / len(zoneVentilation_forArea)
-    zoneVentilation_forPeople_Avg = sum(zoneVentilation_forPeople) / len(zoneVentilation_forPeople)
+    # Calc the Annual Average Flow rates (m3/h) from the HB Hive Loads
+    # Both are constant every hour of the year (no occupancy sched applied) so the average is the hourly rate
+    zoneVentilation_forArea_Avg = ventilationPerArea * zoneFloorArea * 60 * 60 # m3/s---> m3/h
+    zoneVentilation_forPeople_Avg = numOfPeoplePerArea * zoneFloorArea * ventilationPerPerson * 60 * 60 # m3/s---> m3/h
     zoneVentilation_Total_AnnualAvg = zoneVentilation_forArea_Avg + zoneVentilation_forPeople_Avg
     
     # Return the average Annual Ventialtion Flow rate (m3/h) based on the Zone's HB Schedules
@@ -523,13 +552,13 @@ def setRoomVentFlowRates(_HBzoneObj, _type, _zoneAnnualAvgVentRate):
                     # don't do anything. Leave the rooms as-is
                     pass
 
-def setRoomVentSchedule(_HBzoneObj, _type, _userVentSched, _zoneVentilation_Total_AnnualAvg, _annualAvgZoneFlowRate_Area, _annualAvgZoneFlowRate_PPl, _zoneGrossFloorArea):
-    # Pull the Ventilation loads, Occupancy Schedule from the Hive
-    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSchedAsValues = getHBLoadAndSched(_HBzoneObj)
+def setRoomVentSchedule(_HBzoneObj, _zoneLoadAndSched, _type, _userVentSched, _zoneVentilation_Total_AnnualAvg, _annualAvgZoneFlowRate_Area, _annualAvgZoneFlowRate_PPl, _zoneGrossFloorArea):
+    # Ventilation loads, Occupancy Schedule from the Hive
+    numOfPeoplePerArea, ventilationPerArea, ventilationPerPerson, zoneOccSched = _zoneLoadAndSched
     zoneFloorArea = getHBzoneFloorArea(_HBzoneObj, _zoneGrossFloorArea)
     
-    # Convert the HB Sched Values for the zone as PHPP-Stly (bined 3)
-    bins, vals = histogram(zoneOccSchedAsValues, 2)
+    # HB Sched Values for the zone as PHPP-Stly (bined 3)
+    bins, vals = zoneOccSched.bins, zoneOccSched.vals
     bined_Sched = namedtuple('phppSched', 'speed_high time_high speed_med time_med speed_low time_low')
     hbRoomVentSched = bined_Sched(vals[2], bins[2], vals[1], bins[1], vals[0], bins[0] )
     
@@ -646,6 +675,7 @@ if len(_HBZones) > 0:
     etaAirflow = []
     transAirflow = []
     zoneFloorArea = []
+    schedCache = {}
     for zone in HBZoneObjects:
         # 1) Figure out the Zone's Annual Average Ventilation Flow Rate
         #    (People + Area) based on HB Program (Load / Schedule)
@@ -658,15 +688,18 @@ if len(_HBZones) > 0:
         print '- - '*25
         print 'Looking at Zone {}'.format(zone.name)
         
+        zoneLoadAndSched = getHBLoadAndSched(zone, schedCache)
+        
         (annualAvgZoneFlowRate,
         annualAvgZoneFlowRate_Area,
-        annualAvgZoneFlowRate_PPl) = calcZoneAnnualVentFlowRateFromHB(zone, _phppVentSched, zoneGrossFloorArea_)
+        annualAvgZoneFlowRate_PPl) = calcZoneAnnualVentFlowRateFromHB(zone, zoneLoadAndSched, _phppVentSched, zoneGrossFloorArea_)
         
         setRoomVentFlowRates(zone,
                             type,
                             annualAvgZoneFlowRate)
         
         setRoomVentSchedule(zone,
+                            zoneLoadAndSched,
                             type,
                             _phppVentSched,
                             annualAvgZoneFlowRate,
@@ -682,6 +715,9 @@ if len(_HBZones) > 0:
         transAirflow += trans
         zoneFloorArea.append(getHBzoneFloorArea(zone, zoneGrossFloorArea_))
     
+    print '- - '*25
+    print 'Read {} unique HB Schedule(s) for {} Zone(s)'.format(len(schedCache), len(HBZoneObjects))
+    
     #---------------------------------------------------------------------------
     # Figure out the Right airflow to use for the whole building
     # These values get passed back to Honeybee for the E+ model
@@ -27,6 +27,7 @@ Note that this method is much faster, but a bit less accurate than other methods
 For background and reference on the methodology used, see: "Solar Gains in a Passive House: A Monthly Approach to Calculating Global Irradiaton Entering a Shaded Window" By Andrew Peel, 2007.
 -
 EM October 10, 2020
+Updated October 17, 2026
     Args:
         runIt_: (bool) Set to 'True' to run the shading calcuation. May take a few seconds. 
         _latitude: (float) A value for the building's latitude. Use the Ladybug 'ImportEPW' to get this value.
@@ -45,7 +46,7 @@ EM October 10, 2020
 
 ghenv.Component.Name = "BT_CalcWindowShadingFactors_Simple"
 ghenv.Component.NickName = "Shading Factors | Simple"
-ghenv.Component.Message = 'OCT_10_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -54,6 +55,9 @@ import rhinoscriptsyntax as rs
 import scriptcontext as sc
 import Grasshopper.Kernel as ghk
 
+PHPP_Window_Shading_Calculator = sc.sticky['PHPP_Window_Shading_Calculator']
+PHPP_ShadingBVH = sc.sticky['PHPP_ShadingBVH']
+
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
@@ -94,6 +98,12 @@ for branch in _windowSurrounds.Branches:
 
 # Calc the Shading Factors for each Window
 if runIt_ and len(_HBZones)>0:
+    # Index all the shading geometry once, so each window's search lines / planes
+    # only get tested against the objects whose bounding-boxes they cross
+    shadingBVH = PHPP_ShadingBVH(shadingObjs)
+    
+    # Find the shading dims for each window
+    phppWindowObjs = []
     for zone in HBZoneObjects:
         for srfc in zone.surfaces:
             if srfc.hasChild == False:
@@ -101,18 +111,29 @@ if runIt_ and len(_HBZones)>0:
             
             for childSrfc in srfc.childSrfs:
                 phppWindowObj = zone.phppWindowDict.get(childSrfc.name, None)
-                dims = phppWindowObj.calcShadingDims_Simple( shadingObjs, limit)
+                dims = phppWindowObj.calcShadingDims_Simple( shadingBVH, limit)
                 
                 checklines_.append(phppWindowObj.ShadingDimensions.Horizon.checkline)
                 checklines_.append(phppWindowObj.ShadingDimensions.Overhang.checkline)
                 checklines_.append(phppWindowObj.ShadingDimensions.Reveal.checkline1)
                 checklines_.append(phppWindowObj.ShadingDimensions.Reveal.checkline2)
                 
-                # Calculated same as PHPP, except I don't think they are calcing correctly yet...
-                winter, summer = phppWindowObj.calcShadingFactor_Simple(latitude, shadingObjs, limit )
                 windowNames_.append(childSrfc.name)
-                winterShadingFactors_.append(winter)
-                summerShadingFactors_.append(summer)
+                phppWindowObjs.append(phppWindowObj)
+    
+    avgTested = float(shadingBVH.tested) / shadingBVH.queries if shadingBVH.queries else 0.0
+    msg = 'Shading search: {:.1f} of {} shading objects tested per query on average ({} queries)'.format(
+            avgTested, len(shadingBVH), shadingBVH.queries)
+    print msg
+    ghenv.Component.AddRuntimeMessage(ghk.GH_RuntimeMessageLevel.Remark, msg)
+    
+    # Calculated same as PHPP, except I don't think they are calcing correctly yet...
+    # All the windows in one go, so the latitude factors are only calculated once
+    calculator = PHPP_Window_Shading_Calculator(latitude)
+    allFactors = calculator.calcShadingFactors( [win.getShadingInputs() for win in phppWindowObjs] )
+    for factors in allFactors:
+        winterShadingFactors_.append( factors.Winter_Horiz * factors.Winter_Overhang * factors.Winter_Reveal )
+        summerShadingFactors_.append( factors.Summer_Horiz * factors.Summer_Overhang * factors.Summer_Reveal )
 
 # Add modified Surfaces / Zones back to the HB dictionary
 if len(_HBZones)>0:
@@ -70,7 +70,7 @@ if _PHPPObjs.BranchCount >0:
     for srfc in _PHPPObjs.Branch(4):
         if srfc.HostZoneName in zones:
             PHPPObjs_.Add(srfc, GH_Path(4))
-            ZoneGeom_.Add(srfc.Srfc, GH_Path(4))
+            ZoneGeom_.Add(srfc.getSrfc(), GH_Path(4))
     
     for tfa in _PHPPObjs.Branch(6):
         if tfa.HostZoneName in zones:
@@ -26,6 +26,7 @@ surface's 'Attribute User Text'. Use the Rhino-scene Set Params tool to set surf
 trying to import it here. 
 -
 EM July 31, 2020
+Updated October 17, 2026
     Args:
         _srfcs: The Zone's Opaque surfaces as a list (walls, floors, ceilings, etc...). By Default Type-Hint is set to 'GUID' in order to get geom data parameters from the Rhino scene. If passing in Grasshopper generated surfaces be sure to set Type-Hint to 'No Type Hint'.
         autoOrientation_: (bool Default='False') Set to 'True' to have this component automatically assign surface type ('wall', 'floor', 'roof'). useful if you are testing massings / geometry and don't want to assign explicit type everytime. If you have already assigned the surface type in Rhino, leave this set to False. If 'True' this will override any values found in the Rhino scene.
@@ -40,7 +41,7 @@ EM July 31, 2020
 
 ghenv.Component.Name = "BT_GetSurfaceParams"
 ghenv.Component.NickName = "Get Surface Params"
-ghenv.Component.Message = 'JUL_31_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -65,6 +66,7 @@ phpp_makeHBMaterial_Opaque = sc.sticky['phpp_makeHBMaterial_Opaque']
 phpp_makeHBConstruction = sc.sticky['phpp_makeHBConstruction']
 phpp_createSrfcHBMatAndConst = sc.sticky['phpp_createSrfcHBMatAndConst']
 idf2ph_rhDoc = sc.sticky['idf2ph_rhDoc']
+phpp_getDocLibrary = sc.sticky['phpp_getDocLibrary']
 
 #################################################################
 class Outputs:
@@ -384,13 +386,8 @@ srfcEPConstructions_ =  outputs.getEPConstructions()
 srfcRADMaterials_ =  outputs.getRADMaterials()
 
 # Get the Library of EP Construction Params from the Rhino Document User Text dictionary
-udConstParams = {}
-with idf2ph_rhDoc():
-    if rs.IsDocumentUserText():
-        for eachKey in rs.GetDocumentUserText():
-            if 'PHPP_lib_Assmbly_' in eachKey:
-                assmblyName = json.loads(rs.GetDocumentUserText(eachKey)).get('Name')
-                udConstParams[assmblyName] = json.loads(rs.GetDocumentUserText(eachKey))
+# (parsed once and shared, until the library is edited)
+udConstParams = phpp_getDocLibrary().getLib('PHPP_lib_Assmbly')
 
 #################################################################
 # For each construction, make a new EP Material for it, then a new EP Construction
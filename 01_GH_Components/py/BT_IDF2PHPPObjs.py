@@ -26,7 +26,7 @@ EM October 10, 2020
 
     Args:
         _HBZones: <Optional> If connected, the component will try and read detailed 'Frame' and 'Glass' Object data for each window in building. If this isn't hooked up, the normal EP windows will be used to create PHPP-Style Window Components. 
-        _IDF_Objs_List: Takes in a list if IDF objects. Connect to the 'IDF_Objs_List' output on the 'IDF Reader' Component
+        _IDF_Objs_List: Takes in the indexed store of IDF objects (or a list of IDF objects). Connect to the 'IDF_Objs_List' output on the 'IDF Reader' Component
     Returns:
         opaqueSurfaces: A List of the opaque surface IDF Objects found 
         windowObjects: A List of the window surface IDF Objects found
@@ -58,6 +58,7 @@ from collections import namedtuple
 preview=sc.sticky['Preview']
 phpp_calcNorthAngle=sc.sticky['phpp_calcNorthAngle']
 phpp_GetWindowSize=sc.sticky['phpp_GetWindowSize']
+phpp_geomDataFromVertsBulk=sc.sticky['phpp_geomDataFromVertsBulk']
 phpp_makeHBMaterial=sc.sticky['phpp_makeHBMaterial']
 phpp_makeHBConstruction=sc.sticky['phpp_makeHBConstruction']
 
@@ -81,11 +82,12 @@ IDF_Obj_Construction=sc.sticky['IDF_Obj_Construction']
 IDF_Obj_surfaceWindow=sc.sticky['IDF_Obj_surfaceWindow']
 IDF_Obj_surfaceOpaque=sc.sticky['IDF_Obj_surfaceOpaque']
 IDF_Obj_location = sc.sticky['IDF_Obj_location']
+idf_storeFromInput = sc.sticky['idf_storeFromInput']
 
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
-def parseIDFObjects(_IDF_Objs):
+def parseIDFObjects(_IDF_Store):
     # Looks at the IDF Objects and parses them  out
     # Builds class objects as appropriate
     zones = []
@@ -100,63 +102,48 @@ def parseIDFObjects(_IDF_Objs):
     location = []
     
     # First, need to find the North Direction. Have to do that before the rest
-    for each in _IDF_Objs:
-    # Look at each of the IDF objects coming in....
-        try:
-            idfObjName = getattr(each, 'objName')
-        except:
-            idfObjName = ''
-        
-        if idfObjName == 'Building':
-            # If the IDF Obj is a 'Building'
-            # Create the Building Object and get the Project's North Angle Vector
-            bldg = IDF_Obj_building(each)
-            bldgNorthVec = bldg.NorthVector
-    
-    # Now go through and pull out each class object
-    for eachIDFobj in _IDF_Objs:
-        try:
-            idfObjName = getattr(eachIDFobj, 'objName')
-        except:
-            idfObjName = ''
-        
-        # If its an opaque Building Surface object
-        if 'BuildingSurface:Detailed' in idfObjName:
-            opaqueSurfaces.append(  IDF_Obj_surfaceOpaque(eachIDFobj, bldgNorthVec)  )
-        
-        # If its a 'Material' or 'Material:AirGap' object
-        elif idfObjName == 'Material:AirGap' or idfObjName == 'Material':
-            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj) )
-        
-        elif idfObjName == 'Material:NoMass':
-            opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj, noMass=True) )
-        
-        # If its a simple EP Style Window Material
-        elif 'WindowMaterial:SimpleGlazingSystem' in idfObjName:
-            windowMaterialsSimple[eachIDFobj.Name] = IDF_Obj_MaterialWindowSimple(eachIDFobj)
-        
-        elif 'WindowMaterial:Gas' in idfObjName:
-            windowMaterialGas[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGas( eachIDFobj )
-        
-        elif 'WindowMaterial:Glazing' in idfObjName:
-            windowMaterialGlazing[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGlazing( eachIDFobj )
-        
-        elif 'Construction' in idfObjName:
-            allConstructions.append( IDF_Obj_Construction( eachIDFobj )  )
-        
-        elif idfObjName == 'Zone':
-            newObj = IDF_Zone( eachIDFobj )
-            zones.append( IDF_Zone( eachIDFobj ) )
-        
-        elif idfObjName == 'ZoneList':
-            zonesList.append( IDF_ZoneList( eachIDFobj ) )
-            
-        elif 'ZoneInfiltration:DesignFlowRate' in idfObjName:
-            zoneInfiltrationRates.append( IDF_ZoneInfilFlowRate( eachIDFobj  ) )
-        
-        elif 'Site:Location' in idfObjName:
-            location = eachIDFobj
-            
+    # Create the Building Object and get the Project's North Angle Vector
+    bldg = IDF_Obj_building( _IDF_Store.getFirst('Building') )
+    bldgNorthVec = bldg.NorthVector
+    
+    # Now pull out each class object, by IDF Class
+    # Calc all the surface geometry (areas, normals, etc) in one go from the Vertices
+    srfcObjs = _IDF_Store.getObjects('BuildingSurface:Detailed')
+    srfcGeomData = phpp_geomDataFromVertsBulk( [obj.Vertices for obj in srfcObjs] )
+    for eachIDFobj, eachGeomData in zip(srfcObjs, srfcGeomData):
+        opaqueSurfaces.append(  IDF_Obj_surfaceOpaque(eachIDFobj, bldgNorthVec, eachGeomData)  )
+    
+    # 'Material' or 'Material:AirGap' objects
+    for eachIDFobj in _IDF_Store.getObjects('Material', 'Material:AirGap'):
+        opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj) )
+    
+    for eachIDFobj in _IDF_Store.getObjects('Material:NoMass'):
+        opaqueMaterials.append( IDF_Obj_MaterialLayer(eachIDFobj, noMass=True) )
+    
+    # Simple EP Style Window Materials
+    for eachIDFobj in _IDF_Store.getObjectsLike('WindowMaterial:SimpleGlazingSystem'):
+        windowMaterialsSimple[eachIDFobj.Name] = IDF_Obj_MaterialWindowSimple(eachIDFobj)
+    
+    for eachIDFobj in _IDF_Store.getObjectsLike('WindowMaterial:Gas'):
+        windowMaterialGas[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGas( eachIDFobj )
+    
+    for eachIDFobj in _IDF_Store.getObjectsLike('WindowMaterial:Glazing'):
+        windowMaterialGlazing[eachIDFobj.Name]  = IDF_Obj_MaterialWindowGlazing( eachIDFobj )
+    
+    for eachIDFobj in _IDF_Store.getObjectsLike('Construction'):
+        allConstructions.append( IDF_Obj_Construction( eachIDFobj )  )
+    
+    for eachIDFobj in _IDF_Store.getObjects('Zone'):
+        zones.append( IDF_Zone( eachIDFobj ) )
+    
+    for eachIDFobj in _IDF_Store.getObjects('ZoneList'):
+        zonesList.append( IDF_ZoneList( eachIDFobj ) )
+    
+    for eachIDFobj in _IDF_Store.getObjectsLike('ZoneInfiltration:DesignFlowRate'):
+        zoneInfiltrationRates.append( IDF_ZoneInfilFlowRate( eachIDFobj  ) )
+    
+    location = _IDF_Store.getFirst('Site:Location', location)
+    
     return opaqueSurfaces, opaqueMaterials, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing, allConstructions, zones, zoneInfiltrationRates, zonesList, location
 
 def materialWindowSimpleFromLayers(_const):
@@ -253,23 +240,14 @@ def getPHPPRooms(_HBZoneObjects):
         
     return HBZonePHPPRooms, HBZoneVentSystems
 
-def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsSimple):
+def getIDFWindowObjects(_IDF_Store, _windowConstructionsSimple, _windowMaterialsSimple):
     # Finds all  the widnow surfaces and builds window objects
     windowSurfaces = []
-    windowObjs_raw = []
     windowObjs_filtered = []
     windowObjs_triangulated = {}
     
-    for eachIDFobj in _IDF_Objs:
-        try:
-            idfObjName = getattr(eachIDFobj, 'objName')
-            
-        except:
-            idfObjName = ''
-        
-        # If its an EP Window Object
-        if 'FenestrationSurface:Detailed' in idfObjName:
-            windowObjs_raw.append(eachIDFobj)
+    # All the EP Window Objects
+    windowObjs_raw = _IDF_Store.getObjects('FenestrationSurface:Detailed')
     
     ##################################################
     # Fix for window triangulation
@@ -277,10 +255,7 @@ def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsS
         # Honeybee adds the code '..._glzP_0, ..._glzP_1, etc..' suffix to the name for its triangulated windows
         if '_glzP_' in windowObj.Name:
             # See if it has only 3 vertices as well just to double check
-            numOfVerts = 0
-            for key in windowObj.__dict__.keys():
-                if 'XYZ Vertex' in key:
-                    numOfVerts += 1
+            numOfVerts = len(windowObj.Vertices) // 3
             if numOfVerts == 3:
                 # Ok, so its a triangulated window.
                 # File the triangulated window in the dictionary using its name as key
@@ -301,12 +276,8 @@ def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsS
         for windowObj in windowObjs_triangulated[key]:
             triangleVerts = []
             # Get the verts
-            for key in windowObj.__dict__.keys():
-                if 'XYZ Vertex' in key:
-                    verts = getattr(windowObj, key).split(' ')
-                    verts = [float(x) for x in verts]
-                    point = ghc.ConstructPoint(verts[0], verts[1], verts[2])
-                    triangleVerts.append( point )
+            for vertX, vertY, vertZ in windowObj.getVertexPoints():
+                triangleVerts.append( ghc.ConstructPoint(vertX, vertY, vertZ) )
             
             # Union the Segments, find the outside perimeter
             perim = ghc.PolyLine(triangleVerts, closed=True)
@@ -315,19 +286,18 @@ def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsS
         unionedPerim = ghc.RegionUnion(perims)
         
         # Build a new Window Obj using this now unioned geometry
-        newVertPoints = ghc.ControlPoints(unionedPerim).points #windowObj.__dict__
-        newWindowObj = copy.deepcopy(windowObj)
-        
-        for i in range(len(newVertPoints)):
-            setattr(newWindowObj, 'XYZ Vertex {} {}'.format(i+1, '{m}'), str(newVertPoints[i]).replace(',',' '))
-            setattr(newWindowObj, 'Name', windowObj.Name[:-7])
+        newVertPoints = ghc.ControlPoints(unionedPerim).points
+        newWindowObj = windowObj.copy()
+        newWindowObj.setVertexPoints( [(pt.X, pt.Y, pt.Z) for pt in newVertPoints] )
+        setattr(newWindowObj, 'Name', windowObj.Name[:-7])
         
         windowObjs_filtered.append(newWindowObj)
     
     ##################################################
     
     # Build the Window Objects
-    for eachWindowObj in windowObjs_filtered:
+    windowGeomData = phpp_geomDataFromVertsBulk( [obj.Vertices for obj in windowObjs_filtered] )
+    for eachWindowObj, eachGeomData in zip(windowObjs_filtered, windowGeomData):
             # Find the windows's CONSTRUCTION and MATERIAL information in the IDF
             thisWindowEP_CONST_Name = getattr(eachWindowObj, 'Construction Name')                         # Get the name of the Windows' Construction  
             thisWindowEP_MAT_Name = _windowConstructionsSimple[  thisWindowEP_CONST_Name  ].Layers[0][1]  # Find the Material name of 'Layer 1' in the Window's Construction
@@ -336,7 +306,7 @@ def getIDFWindowObjects(_IDF_Objs, _windowConstructionsSimple, _windowMaterialsS
             summerShadingFactor = None
             
             # Create the new IDF_Obj_surfaceWindow Object
-            windowSurfaces.append( IDF_Obj_surfaceWindow(eachWindowObj, thisWindowEP_WinSimp_Obj, winterShadingFactor, summerShadingFactor) )
+            windowSurfaces.append( IDF_Obj_surfaceWindow(eachWindowObj, thisWindowEP_WinSimp_Obj, winterShadingFactor, summerShadingFactor, eachGeomData) )
     
     return windowSurfaces
 
@@ -382,17 +352,26 @@ def filterSurfaces(_surfaces):
         
     return exposedSurfaces
 
+def groupSurfacesByZone(_opaqueSurfaces):
+    # Files each surface under its Host Zone's name so they don't need to be searched for
+    srfcsByZone = defaultdict(list)
+    
+    for srfc in _opaqueSurfaces:
+        srfcsByZone[srfc.HostZoneName].append(srfc)
+    
+    return srfcsByZone
+
 def buildZoneBrep(_zoneObjs, _opaqueSurfaces):
     # Takes in the IDF Surfaces and builds Zone Breps from them
     # Sets the ZoneObj as an attr using the new Brep
     
     zoneBreps = []
+    srfcsByZone = groupSurfacesByZone(_opaqueSurfaces)
     
     for zone in _zoneObjs:    
         zoneSurfaces = []
-        for srfc in _opaqueSurfaces:
-            if srfc.HostZoneName == zone.ZoneName:
-                zoneSurfaces.append( ghc.BoundarySurfaces(srfc.Boundary) )
+        for srfc in srfcsByZone[zone.ZoneName]:
+            zoneSurfaces.append( srfc.getSrfc() )
         zoneBrep = ghc.BrepJoin( zoneSurfaces ).breps
         zoneBreps.append( zoneBrep )
         setattr(zone, 'ZoneBrep', zoneBrep)
@@ -573,11 +552,11 @@ def calcFootprint(_zoneObjs, _opaqueSurfaces):
     
     #-----
     zoneBreps = []
+    srfcsByZone = groupSurfacesByZone(_opaqueSurfaces)
     for zone in _zoneObjs:    
         zoneSurfaces = []
-        for srfc in _opaqueSurfaces:
-            if srfc.HostZoneName == zone.ZoneName:
-                zoneSurfaces.append( ghc.BoundarySurfaces(srfc.Boundary) )
+        for srfc in srfcsByZone[zone.ZoneName]:
+            zoneSurfaces.append( srfc.getSrfc() )
         zoneBrep = ghc.BrepJoin( zoneSurfaces ).breps
         zoneBreps.append( zoneBrep )
     
@@ -608,6 +587,9 @@ def calcFootprint(_zoneObjs, _opaqueSurfaces):
 #-------------------------------------------------------------------------------
 ##### Read the IDF Objects and Build class objects  ##########
 
+# The indexed IDF Object store from the Reader
+idfStore = idf_storeFromInput(_IDF_Objs_List)
+
 # Get Material Layers, Constructions, Surfaces
 (opaqueSurfaces,
 opaqueMaterials,
@@ -618,7 +600,7 @@ allConstructions,
 zones,
 zoneInfiltrationRates,
 zonesList,
-location) = parseIDFObjects(_IDF_Objs_List)
+location) = parseIDFObjects(idfStore)
 
 opaqueSurfaces_Exposed = filterSurfaces(opaqueSurfaces)
 
@@ -628,10 +610,10 @@ windowConstructionsSimple,
 windowMaterialsSimple) = filterConstructions(allConstructions, windowMaterialsSimple, windowMaterialGas, windowMaterialGlazing)
 
 # IDf Window Objects
-windowObjects = getIDFWindowObjects(_IDF_Objs_List, windowConstructionsSimple, windowMaterialsSimple)
+windowObjects = getIDFWindowObjects(idfStore, windowConstructionsSimple, windowMaterialsSimple)
 
 # Zone Rooms, Ventialtion from HB, Update windows to Detailed data from HB Zones
-if len(_HBZones)>0 and len(_IDF_Objs_List)>1:
+if len(_HBZones)>0 and len(idfStore)>1:
     HBZonePHPPRooms, HBZoneVentSystems = getPHPPRooms(HBZoneObjects)
     updatePHPPStyleWindows(HBZoneObjects, windowObjects)
     
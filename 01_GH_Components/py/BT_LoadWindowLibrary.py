@@ -23,7 +23,10 @@
 This will read in the contents of a PHPP-Style Excel file window library ('Components' worksheet). You can certainly point this at any actual PHPP file, but that will probably be slow. Recomended to extract the 'Components' worksheeet from a PHPP file into a dedicated 'Libary' Excel file (Duplicate). That will allow this to run much faster. Will read only the 'Glazing' and 'Frames' portions of the 'Components' worksheet (blocks IE15:IG113 and IL15:JC113).
 -Input *.xls or *.xlsx files only.
 -
+*.xlsx files are read directly from the file, without Excel. *.xls files still need Excel to be installed.
+-
 EM Feb. 25, 2020
+Updated October 17, 2026
     Args:
         _LoadLib: Set to 'True' to run.
         _libFolderPath: (string) The folder where the Window Library file is located
@@ -35,7 +38,7 @@ EM Feb. 25, 2020
 
 ghenv.Component.Name = "BT_LoadWindowLibrary"
 ghenv.Component.NickName = "Load Window Lib"
-ghenv.Component.Message = 'FEB_25_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -46,12 +49,12 @@ import random
 import json
 import Grasshopper.Kernel as ghK
 import clr
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from Microsoft.Office.Interop import Excel
+import zipfile
 import scriptcontext as sc
 
 PHPP_Glazing = sc.sticky['PHPP_Glazing']
 PHPP_Frame = sc.sticky['PHPP_Frame']
+XL_XlsxFileBackend = sc.sticky['XL_XlsxFileBackend']
 
 def getLibraryPath(_libFolderPath=None, _libFileName=None):
     # Finds the right Library File Path
@@ -87,9 +90,33 @@ def getLibraryPath(_libFolderPath=None, _libFileName=None):
         print 'Input the folder path and filename to proceed.'
         return None
 
+def getDataFromXlsxFile(_filePath):
+    # Pulls the Glass and Frame data straight from the .xlsx file, no Excel needed
+    
+    print '  >Reading the .xlsx file contents....'
+    workbook = XL_XlsxFileBackend(_filePath)
+    
+    if 'Components' not in workbook.getSheetNames():
+        print "Could not find the 'Components' Worksheet in the taget file?"
+    
+    # Flatten the rows the same way list() does on the Excel 2D Arrays
+    xlArrayGlazing_ = [val for row in workbook.readRange('Components', 'IE15:IG113') for val in row]
+    xlArrayFrames_ = [val for row in workbook.readRange('Components', 'IL15:JC113') for val in row]
+    
+    workbook.activeWorkbook.close()
+    os.remove(_filePath) # Remove the temporary read-file
+    
+    return xlArrayGlazing_, xlArrayFrames_
+
 def getDataFromExcel(_filePath):
     # Pulls the Glass and Frame data from the Excel file
     
+    if zipfile.is_zipfile(_filePath):
+        return getDataFromXlsxFile(_filePath)
+    
+    clr.AddReferenceByName('Microsoft.Office.Interop.Excel, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
+    from Microsoft.Office.Interop import Excel
+    
     # Open an Excel Instance and the Temporary Lib File
     print '  >Opening Excel document and reading contents....'
     ex = Excel.ApplicationClass()
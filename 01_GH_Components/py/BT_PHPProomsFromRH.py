@@ -29,6 +29,7 @@ Will try and figure out the 'Rooms' inside each of the HB zones.
 > This component will need to be able to read TFA and Room Name/Number data from the Rhino Scene (User-Text 'Object Name', 'Room_Number', 'TFA_Factor').
 -
 EM July 31, 2020
+Updated October 17, 2026
 
     Args:
         _roomTFASurfaces: (List) An input for the user-determined room floor area(s) to use.
@@ -48,7 +49,7 @@ EM July 31, 2020
 
 ghenv.Component.Name = "BT_PHPProomsFromRH"
 ghenv.Component.NickName = "PHPP Rooms from Rhino"
-ghenv.Component.Message = 'JUL_31_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -67,11 +68,16 @@ preview=sc.sticky['Preview']
 PHPP_TFA_Surface = sc.sticky['PHPP_TFA_Surface']
 PHPP_Room = sc.sticky['PHPP_Room']
 PHPP_RoomVolume = sc.sticky['PHPP_RoomVolume']
+PHPP_ZoneIndex = sc.sticky['PHPP_ZoneIndex']
+PHPP_UserTextSnapshot = sc.sticky['PHPP_UserTextSnapshot']
 PHPP_Sys_Ventilation = sc.sticky['PHPP_Sys_Ventilation']
 
 hb_hive = sc.sticky["honeybee_Hive"]()
 HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
 
+# Index the zones once, so each TFA surface only tests the zones which could hold it
+zoneIndex = PHPP_ZoneIndex(HBZoneObjects)
+
 @contextmanager
 def rhDoc():
     """For reaching into the Rhino document
@@ -126,10 +132,13 @@ def createTFASurfaces(_tfaSrfcs, _HBZoneObjects):
     tfaSurfacObjs = []
     tfaSurfacObjsDict = {}
     
+    # Read all the surfaces' UserText in one go
+    userText = PHPP_UserTextSnapshot(_tfaSrfcs)
+    
     for srfc in _tfaSrfcs:
         # Create a new TFA Surface Object for the geometry item (Curve, Surface) input
         try:
-            newTFASurfaceObj = PHPP_TFA_Surface(srfc, _HBZoneObjects, _roomVentFlowRates='Automatic', _inset=0, _offsetZ=0)
+            newTFASurfaceObj = PHPP_TFA_Surface(srfc, _HBZoneObjects, _roomVentFlowRates='Automatic', _inset=0, _offsetZ=0, _userText=userText)
             tfaSurfacObjs.append(newTFASurfaceObj)
             
             # Add to the dictionary
@@ -144,27 +153,69 @@ def createTFASurfaces(_tfaSrfcs, _HBZoneObjects):
         
     return tfaSurfacObjsDict
 
+def getSrfcBounds(_srfcObj, _tol=0.001):
+    """Returns the (min, max) tuples of the TFA Surface's bounding box, grown by the tolerance"""
+    
+    geom = _srfcObj.Surface
+    if not isinstance(geom, (list, tuple)):
+        geom = [geom]
+    
+    bbox = Rhino.Geometry.BoundingBox.Empty
+    for each in geom:
+        brep = rs.coercebrep(each)
+        if brep:
+            bbox.Union( brep.GetBoundingBox(True) )
+    
+    return ( (bbox.Min.X-_tol, bbox.Min.Y-_tol, bbox.Min.Z-_tol),
+             (bbox.Max.X+_tol, bbox.Max.Y+_tol, bbox.Max.Z+_tol) )
+
+def findCandidatePairs(_bounds):
+    """Sweep-and-prune along X: returns the index pairs whose bounding boxes overlap"""
+    
+    order = sorted(range(len(_bounds)), key=lambda i: _bounds[i][0][0])
+    active = []
+    pairs = []
+    
+    for i in order:
+        minI, maxI = _bounds[i]
+        # Drop anything which ends before this one starts
+        active = [k for k in active if _bounds[k][1][0] >= minI[0]]
+        
+        for k in active:
+            minK, maxK = _bounds[k]
+            if (minK[1] <= maxI[1] and maxK[1] >= minI[1] and
+                minK[2] <= maxI[2] and maxK[2] >= minI[2]):
+                pairs.append( (min(i, k), max(i, k)) )
+        
+        active.append(i)
+    
+    return sorted(pairs)
+
 def findNeighbors(_srfcList):
     """ Takes in a list of surfaces. tests against others in the
-    set to see if they are touching. Adds a 'Neighbor' marker if so"""
+    set to see if they are touching. Adds a 'Neighbor' marker if so.
+    
+    Only surfaces with overlapping bounding boxes get the exact BrepXBrep test,
+    and touching sets are merged with a union-find so that chains of surfaces 
+    (A touches B, B touches C) all end up with the same marker"""
+    
+    parents = range(len(_srfcList))
+    
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+    
+    bounds = [getSrfcBounds(srfc) for srfc in _srfcList]
+    for i, k in findCandidatePairs(bounds):
+        if ghc.BrepXBrep(_srfcList[i].Surface, _srfcList[k].Surface).curves:
+            rootI, rootK = find(i), find(k)
+            if rootI != rootK:
+                parents[max(rootI, rootK)] = min(rootI, rootK)
     
     for i, srfc in enumerate(_srfcList):
-        
-        for k in range(0, len(_srfcList)):
-            #print 'Surface: {} looking at Surface: {}...'.format(i, k)
-            vertsI =  ghc.DeconstructBrep( _srfcList[i].Surface ).vertices
-            vertsK =  ghc.DeconstructBrep( _srfcList[k].Surface ).vertices
-            
-            if ghc.BrepXBrep(_srfcList[i].Surface, _srfcList[k].Surface).curves:
-                if _srfcList[i].Neighbors != None:
-                    matchSetID = _srfcList[i].Neighbors
-                elif _srfcList[k].Neighbors != None:
-                    matchSetID = _srfcList[k].Neighbors
-                else:
-                    matchSetID = i
-                
-                _srfcList[i].addNeighbor(matchSetID) #branch[k].ID)
-                _srfcList[k].addNeighbor(matchSetID) #branch[i].ID)
+        srfc.addNeighbor( find(i) )
     
     return _srfcList
 
@@ -186,6 +237,55 @@ def binByNeighbor(_srfcList):
     
     return srfcSets
 
+def getEdgeSignature(_geom, _tol=None):
+    """Returns a signature for the open (naked) edges of the geometry: the set of
+    edge end-points, quantized to the tolerance (the Rhino document's absolute 
+    tolerance by default). A room Brep left open at the bottom and the TFA surface 
+    which closes it should have the same signature."""
+    
+    if _tol is None:
+        _tol = sc.doc.ModelAbsoluteTolerance
+    
+    if not isinstance(_geom, (list, tuple)):
+        _geom = [_geom]
+    
+    pts = set()
+    for each in _geom:
+        brep = rs.coercebrep(each)
+        if not brep:
+            continue
+        
+        for crv in brep.DuplicateNakedEdgeCurves(True, True):
+            for pt in (crv.PointAtStart, crv.PointAtEnd):
+                pts.add( (int(round(pt.X/_tol)), int(round(pt.Y/_tol)), int(round(pt.Z/_tol))) )
+    
+    return frozenset(pts)
+
+def indexRoomGeometry(_roomBreps):
+    """Bins the room Breps by their naked-edge signature. Returns a dict of 
+    signature: [room index, ...]"""
+    
+    roomIndex = defaultdict(list)
+    for i, roomGeom in enumerate(_roomBreps):
+        if roomGeom is None:
+            continue
+        sig = getEdgeSignature(roomGeom)
+        if sig:
+            roomIndex[sig].append(i)
+    
+    return roomIndex
+
+def joinRoomGeometry(_tfaSrfcObj, _roomBreps, _roomIndices):
+    """Tries to close each of the room Breps with the TFA surface. Returns the
+    index of the first one that makes a closed Brep, or None"""
+    
+    for i in _roomIndices:
+        tfaFloorJoinedToGeom = ghc.BrepJoin([_roomBreps[i], _tfaSrfcObj.Surface])
+        if tfaFloorJoinedToGeom.closed==True:
+            return i
+    
+    return None
+
 roomGeomBreps = []
 roomBreps_ = []
 tfaSrfcBreps = []
@@ -200,7 +300,7 @@ roomsDict = defaultdict()
 with rhDoc():
     for i, brepGUID in enumerate(_roomGeometry): roomGeomBreps.append(rs.coercebrep(brepGUID) )
     for i, brepGUID in enumerate(_roomTFASurfaces): tfaSrfcBreps.append(rs.coercebrep(brepGUID) )
-    if len(_roomTFASurfaces)>0 and len(_HBZones)>0: tfaSrfcObjs = createTFASurfaces(_roomTFASurfaces, HBZoneObjects)
+    if len(_roomTFASurfaces)>0 and len(_HBZones)>0: tfaSrfcObjs = createTFASurfaces(_roomTFASurfaces, zoneIndex)
 
 #------------------------------------------------------------------------------
 # Build a Default room if nothing is passed in
@@ -215,7 +315,7 @@ if len(_HBZones)>0 and len(_roomTFASurfaces)==0:
                 except:
                     ventFlowRates = ['Automatic']
                 try:
-                    newTFASurfaceObj = PHPP_TFA_Surface(surface.geometry, HBZoneObjects, ventFlowRates, _inset=0.1, _offsetZ=0.1)
+                    newTFASurfaceObj = PHPP_TFA_Surface(surface.geometry, zoneIndex, ventFlowRates, _inset=0.1, _offsetZ=0.1)
                 except:
                     errorMsg = "Something went wrong building the TFA Floor Surfaces."\
                     "Are you sure you applied TFA and Room Name info for all the surfaces?"
@@ -231,13 +331,19 @@ for k, tfaSrfcObjList in tfaSrfcObjs.items():
         srfcSets_Joined = binByNeighbor(srfcSets)
         for k, each in srfcSets_Joined.items():
             if len(each)>1:
-                joinedSrfc = joinTouchingTFAsurfaces(each, HBZoneObjects)
+                joinedSrfc = joinTouchingTFAsurfaces(each, zoneIndex)
                 tfaSrfcObjs_Unioned.append( joinedSrfc )
             else:
                 tfaSrfcObjs_Unioned.append( each[0] )
     else:
         tfaSrfcObjs_Unioned.append( tfaSrfcObjList[0] )
 
+#------------------------------------------------------------------------------
+# Index the room geometry by its open-edge signature, so each TFA surface
+# only has to try joining with its matching room Brep
+roomGeomIndex = indexRoomGeometry(roomGeomBreps)
+usedRoomGeom = set()
+
 #------------------------------------------------------------------------------
 # Build the Rooms for each TFA Surface
 # Sort the rooms into a dict based on RoomNumber and RoomName
@@ -252,26 +358,37 @@ for tfaSrfcObj in tfaSrfcObjs_Unioned:
         continue
     
     # If Room Geometry passed in, do:
-    # See if you can make a closed room Brep
-    # If you can, create a new Room Volume from the closed Brep set
-    # Then remove that Room's Geom from the set to test (to speed future search?)
+    # Look up the room geometry with the same open-edge signature as the TFA surface
+    # If the join makes a closed Brep, create a new Room Volume from the closed Brep set
+    # Then mark that Room's Geom as used so it isn't matched again
+    # If the signature doesn't match (or the join fails), fall back to trying each remaining room
     # If no closables match found, create a default room volume
     # If no room geom input, just build a default size room for each
     if len(roomGeomBreps)>0:
-        for i, roomGeom in enumerate(roomGeomBreps):
-            tfaFloorJoinedToGeom = ghc.BrepJoin([roomGeom, tfaSrfcObj.Surface])
-            if tfaFloorJoinedToGeom.closed==True:
-                newRmVol = PHPP_RoomVolume(tfaSrfcObj, roomGeom)
-                roomGeomBreps.pop(i)
-                break
+        roomName = getattr(tfaSrfcObj, 'RoomName', 'No Room Name')
+        roomNum = getattr(tfaSrfcObj, 'RoomNumber', 'No Room Number')
+        
+        candidates = [i for i in roomGeomIndex.get(getEdgeSignature(tfaSrfcObj.Surface), []) if i not in usedRoomGeom]
+        if len(candidates) > 1:
+            msg = "More than one piece of room geometry has the same open edges as\n"\
+            "the TFA surface for room: '{}-{}'. Using the first one that joins.".format(roomNum, roomName)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg)
+        
+        matchID = joinRoomGeometry(tfaSrfcObj, roomGeomBreps, candidates)
+        if matchID is None:
+            remaining = [i for i, roomGeom in enumerate(roomGeomBreps)
+                            if roomGeom is not None and i not in usedRoomGeom and i not in candidates]
+            matchID = joinRoomGeometry(tfaSrfcObj, roomGeomBreps, remaining)
+        
+        if matchID is not None:
+            newRmVol = PHPP_RoomVolume(tfaSrfcObj, roomGeomBreps[matchID])
+            usedRoomGeom.add(matchID)
         else:
             newRmVol = PHPP_RoomVolume(tfaSrfcObj, _roomGeom=None, _roomHeightUD=2.5)
-            roomName = getattr(tfaSrfcObj, 'RoomName', 'No Room Name')
-            roomNum = getattr(tfaSrfcObj, 'RoomNumber', 'No Room Number')
             msg = "I could not join the room TFA surface and any room\n"\
             "geometry together to make a closed Brep for room: '{}-{}'.\n"\
             "Please ensure that the geometry can be joined and try again.".format(roomNum, roomName)
-            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, msg)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg)
     else:
         newRmVol = PHPP_RoomVolume(tfaSrfcObj, _roomGeom=None, _roomHeightUD=2.5)
     
@@ -20,14 +20,14 @@
 # @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
 #
 """
-Use this to Read and parse an IDF file (EnergyPlus). This will go thorugh the IDF and pull out all the 'Objects'. It finds the empty newlines in the .IDF to identify each 'new' object and create a new object for each using the standard '!-' marker to establish keys. Will create key/value for EACH key found. Can use the getattr() method for keys with spaces in the name
+Use this to Read and parse an IDF file (EnergyPlus). This will stream through the IDF and pull out all the 'Objects'. It uses the ',' and ';' terminators in the .IDF to identify each field and each 'new' object and create a new object for each using the standard '!-' marker to establish keys. Will create key/value for EACH key found. Can use the getattr() method for keys with spaces in the name. The parsed objects are cached next to the IDF file ('.idf2phcache') and re-used as long as the IDF file hasn't changed.
 -
 EM Mar. 26, 2020
 
     Args:
         _idfFileAddress: Input the path/file location of the .IDF file used for the EnergyPlus simulation. Connect to the 'idfFileAddress' output from the Honeybee 'exportToOpenStudio' Component.
     Returns:
-        IDF_Objs_List: A list of IDF-Objects found in the source file containing all their relevant parameters. Connect this to the '_IDF_Objs_List' input on the 'IDF-->PHPP' component in order to create PHPP writable objects from these.
+        IDF_Objs_List: An indexed store of all the IDF-Objects found in the source file containing all their relevant parameters. Objects can be looked up by their IDF Class and Name. Connect this to the '_IDF_Objs_List' input on the 'IDF-->PHPP' component in order to create PHPP writable objects from these.
         surfaces_: A text preview of all the Opaque surface objects found in the IDF along with all their parameters
         fenestration_: A text preview of all the Fenestration objects found in the IDF along with all their parameters
         constuctions_: A text preview of all the EP-Construction objects found in the IDF along with all their parameters
@@ -38,44 +38,30 @@ EM Mar. 26, 2020
 
 ghenv.Component.Name = "BT_ReadIDFfile"
 ghenv.Component.NickName = "Read IDF File"
-ghenv.Component.Message = 'MAR_26_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
 
-from System import Object
-from Grasshopper import DataTree
-from Grasshopper.Kernel.Data import GH_Path
-from shutil import copyfile
+import scriptcontext as sc
 import os
 
-class IDF_Class:
-    # A simple class to hold onto the IDF object data
-    
-    def __init__(self, _varName, *_initial_data):   
-        """Setting up the IDF Class Object and bringing in all its attributes
-        """
-        self.objName = _varName
-        for dictionary in _initial_data:
-            for key in dictionary:
-                if key != None and dictionary[key] != None:
-                    setattr(self, key, dictionary[key])
-    def __repr__(self):
-        return "An IDF File object with all its Params"
+# Classes and Defs
+idf_loadStore = sc.sticky['idf_loadStore']
+idf_getCacheStats = sc.sticky['idf_getCacheStats']
 
 def idfObjPreview(_obj):
     outputList = []
     
-    outputList.append(_obj.__dict__.get('objName') + '::')
-    for k, v in _obj.__dict__.items():
+    outputList.append(_obj.objName + '::')
+    for k, v in _obj.items():
         outputList.append(' > {}: {}'.format(k, v) )
     outputList.append('-------')
     
     return outputList
 
 # Clear out the temporary variables
-file = ''
-lines_clean = []
+IDF_Objs_List = None
 idfFilePath = None
 
 if _idfFileAddress:
@@ -87,60 +73,16 @@ elif resultFileAddress_:
 
 ##### Bring in the data from the IDF file
 if idfFilePath: 
-    # Make a copy of the IDF file as a text file
-    newFile = idfFilePath.replace('.idf', '.txt')
-    copyfile(idfFilePath, newFile)
-    
-    print('>>>Opening the file to read....')
-    
-    # Open file for reading
-    file = open(newFile, 'r')
-    
-    # Read lines into variable called lines
-    lines = file.readlines()
-    
-    print('>>>Read the file successfully. Closing file.')
-    # Close the file
-    file.close()
-
-if file:
-    # Clean up the file a bit (get rid of the line breaks)
-    for line in lines:
-        if line != '\n': # get rid of the empty lines
-            newLine = line.strip() # Get ride of any newlines at end of str
-            newLineAsList = newLine.split('!- ') # Break into pieces
-            
-            # Get rid of all the extra white spaces, remove commas
-            newLineAsList_Clean = []
-            for each in newLineAsList:
-                each = each.replace(",", "")
-                each = each.replace(";", "")
-                each = each.rstrip()
-                newLineAsList_Clean.append( each )
-            
-            lines_clean.append(newLineAsList_Clean)
+    print('>>>Reading the IDF file....')
     
-    # Organize the date into Class blocks (break at each 'header')
-    tempTree = DataTree[Object]()
-    p = 0
-    # Go through the imported Data and create a new branch for each item
-    for i in range(len(lines_clean)):
-        if len(lines_clean[i]) == 1:
-            p += 1
-        tempTree.Add(lines_clean[i], GH_Path(p))
+    # Stream the IDF file directly into the indexed store
+    # The IDF Objects themselves are only built when asked for
+    # If the file hasn't changed since the last read, the cached store is used instead
+    IDF_Objs_List = idf_loadStore(idfFilePath)
     
-    # Create all the IDF Class object blocks
-    IDF_Objs_List = []
-    for each in tempTree.Branches:
-        tempDict = {}
-        Name = ''
-        for eachListItem in each:
-            if len(eachListItem) == 1:
-                objName = eachListItem[0]
-            else:
-                tempDict[eachListItem[1]] = eachListItem[0]
-        
-        IDF_Objs_List.append(IDF_Class(objName, tempDict))
+    cacheStats = idf_getCacheStats()
+    print('>>>Read {} IDF objects successfully. (IDF cache hits: {}, misses: {})'.format(
+            len(IDF_Objs_List), cacheStats['hits'], cacheStats['misses']))
 
 # Output the preview items
 surfaces_ = []
@@ -149,13 +91,17 @@ constuctions_ = []
 materials_ = []
 
 if IDF_Objs_List != None:
-    for each in IDF_Objs_List:
-        if 'BuildingSurface' in each.__dict__.get('objName', None):
-            surfaces_ =  surfaces_ + idfObjPreview(each)
-        elif 'Fenestration' in each.__dict__.get('objName', None):
-            fenestration_ =  fenestration_ + idfObjPreview(each)
-        elif 'Construction' in each.__dict__.get('objName', None):
-            constuctions_ =  constuctions_ + idfObjPreview(each)
-        elif 'Material' in each.__dict__.get('objName', None):
-            materials_ =  materials_ + idfObjPreview(each)
-
+    for objClass in IDF_Objs_List.getClassNames():
+        if 'BuildingSurface' in objClass:
+            previewList = surfaces_
+        elif 'Fenestration' in objClass:
+            previewList = fenestration_
+        elif 'Construction' in objClass:
+            previewList = constuctions_
+        elif 'Material' in objClass:
+            previewList = materials_
+        else:
+            continue
+        
+        for each in IDF_Objs_List.getObjects(objClass):
+            previewList.extend( idfObjPreview(each) )
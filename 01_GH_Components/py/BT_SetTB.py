@@ -23,6 +23,7 @@
 Builds Thermal Bridge (linear, point) objects to add to the PHPP. Note that these objects are generally not inluced in the EnergyPlus model and so may be a source or discrepancy between the EnergyPlus reslults and the PHPP results. It will be more accurate to include these items in the final model.
 -
 EM August 1, 2020
+Updated October 17, 2026
 
     Args:
         estimated_tb_: <Optional> A single number (0 to 1) which represents the % increase in heat loss due to thermal bridging.
@@ -44,7 +45,7 @@ EM August 1, 2020
 
 ghenv.Component.Name = "BT_SetTB"
 ghenv.Component.NickName = "Thermal Bridges"
-ghenv.Component.Message = 'AUG_01_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "01 | Model"
@@ -58,6 +59,8 @@ from contextlib import contextmanager
 import json
 
 preview=sc.sticky['Preview']
+phpp_getDocLibrary = sc.sticky['phpp_getDocLibrary']
+PHPP_UserTextSnapshot = sc.sticky['PHPP_UserTextSnapshot']
 
 class PHPP_ThermalBridge:
     def __init__(self, _nm, _len, _psi, _geom, _groupNo=15, _fRsi=None):
@@ -112,24 +115,17 @@ def getTBLibFromDocText():
     """ Goes and gets the TB library items from the Document User-Text
     Will return a dict of dicts, ie:
         {'TB_Name_01':{'Name':'example', 'fRsi':0.77, 'Psi-Value':0.1},... }
+    The library is parsed once and shared, until it is edited.
     """
-    dict = {}
     
-    with rhDoc():
-        if rs.IsDocumentUserText():
-            keys = rs.GetDocumentUserText()
-            
-            tbKeys = [key for key in keys if 'PHPP_lib_TB_' in key]
-            for key in tbKeys:
-                try:
-                    val = json.loads( rs.GetDocumentUserText(key) )
-                    name = val.get('Name', 'Name Not Found')
-                    dict[name] = val
-                except:
-                    msg = "Problem getting Psi-Values for '{}' from the File. Check the\n"\
-                    "DocumentUserText and make sure the TBs are loaded properly".format(name)
-                    ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg)
-    return dict
+    docLib = phpp_getDocLibrary()
+    for key in docLib.errors:
+        if 'PHPP_lib_TB_' in key:
+            msg = "Problem getting Psi-Values for '{}' from the File. Check the\n"\
+            "DocumentUserText and make sure the TBs are loaded properly".format(key)
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg)
+    
+    return docLib.getLib('PHPP_lib_TB')
 
 def getTBfromRhino(_tbEdges, _tbLib, _unames, _ulengths, _uPsiVals):
     """Looks at the edges passed in and tries to pull relevant params from Rhino
@@ -147,12 +143,16 @@ def getTBfromRhino(_tbEdges, _tbLib, _unames, _ulengths, _uPsiVals):
     tbrfRSIs_ = []
     
     with rhDoc():
+        # Read all the edges' UserText in one go
+        userText = PHPP_UserTextSnapshot(_tbEdges)
+        
         for i, edge in enumerate(_tbEdges):
             # Get the params from the Rhino Object
             crv = rs.coercecurve(edge)
             tbLen = ghc.Length(crv)
-            nm = rs.GetUserText(edge, 'Typename')
-            grp = rs.GetUserText(edge, 'Group')
+            edgeUserText = userText.record(edge)
+            nm = edgeUserText.get('Typename')
+            grp = edgeUserText.get('Group')
             
             
             if nm not in _tbLib.keys():
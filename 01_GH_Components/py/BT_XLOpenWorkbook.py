@@ -24,9 +24,13 @@ Enables the COM interface connecting Rhino to Excel on the user's computer.
 > This should identify a running excel instance or start excel if it is not already running.
 > Copies a file if the target file name doesn't already exist. 
 > Passes the full file name out, along with whether or not a copy was made.
+> If Excel isn't available on this computer (no COM Interop), the copied .xlsx file is opened 
+directly instead and written without Excel. The workbook will recalculate the next time it is opened in Excel.
+> The cells last written are saved next to the workbook ('.idf2phdiff') each time it is saved, and picked 
+back up when it is opened again, so BT_XLWriteWorkbook's useDiff_ carries on from the last session.
 -
 Original component by Jack Hymowitz, Pinnacle Scholar Summer Research Student, Stevens Institute of Technology
-Updated October 24, 2020
+Updated October 17, 2026
 
     Args:
         _run: Set to true to enable the excel application, false saves the open sheet and stops the application
@@ -41,7 +45,7 @@ Updated October 24, 2020
 
 ghenv.Component.Name = "BT_XLOpenWorkbook"
 ghenv.Component.NickName = "Open XL Workbook"
-ghenv.Component.Message = 'OCT_24_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -54,16 +58,24 @@ import rhinoscriptsyntax as rs
 import scriptcontext as sc
 import clr
 import os
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel')#, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from System.Runtime.InteropServices import Marshal
-from Microsoft.Office.Interop import Excel
+try:
+    clr.AddReferenceByName('Microsoft.Office.Interop.Excel')#, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
+    from System.Runtime.InteropServices import Marshal
+    from Microsoft.Office.Interop import Excel
+    excelAvailable = True
+except:
+    excelAvailable = False
 
 from shutil import copyfile
 import Grasshopper.Kernel as ghK
 import inspect
+from contextlib import contextmanager
 
+XL_WorkbookBackend = sc.sticky['XL_WorkbookBackend']
+XL_XlsxFileBackend = sc.sticky['XL_XlsxFileBackend']
+xl_loadWriteSnapshot = sc.sticky['xl_loadWriteSnapshot']
 
-class ExcelInstance:
+class ExcelInstance(XL_WorkbookBackend):
     """A holder for the methods we use to interact with the Excel COM interface"""
     
     #Run once on startup, defines the variables that we will use
@@ -138,6 +150,67 @@ class ExcelInstance:
         
         self.ex.ScreenUpdating = True
     
+    @contextmanager
+    def writingToExcel(self):
+        """ Changes the Excel Doc settings to help speed up """
+        
+        # Note: xlCalculationManual / Automatic set only works AFTER the workbook is opened
+        
+        try:
+            self.ex.Calculation = -4135 
+            self.ex.ScreenUpdating = False
+            yield
+        finally:
+            self.ex.Calculation = -4105 
+            self.ex.ScreenUpdating = True
+    
+    @staticmethod
+    def toArray2D(_values):
+        """ Turns a list of rows into a 2D .NET array Excel can take in a single Value2 write """
+        
+        if len(_values) == 1 and len(_values[0]) == 1:
+            return _values[0][0]
+        
+        arr = System.Array.CreateInstance(System.Object, len(_values), len(_values[0]))
+        for i, row in enumerate(_values):
+            for j, val in enumerate(row):
+                arr[i, j] = val
+        return arr
+    
+    def hasWorkbook(self):
+        return self.activeWorkbook!=None and len(self.sheetsDict)>0
+    
+    def getSheetNames(self):
+        return self.sheetsDict.keys()
+    
+    def readCell(self, sheet, address):
+        return self.sheetsDict[sheet].Range[address].Value2
+    
+    def readRange(self, sheet, address):
+        values = self.sheetsDict[sheet].Range[address].Value2
+        if not isinstance(values, System.Array):
+            return [[values]]
+        return [[values[i, j] for j in range(values.GetLowerBound(1), values.GetUpperBound(1)+1)]
+                    for i in range(values.GetLowerBound(0), values.GetUpperBound(0)+1)]
+    
+    def writeBlocks(self, blocks, highlight=True):
+        """Write each block of adjacent cells with a single Value2 call"""
+        missing=[]
+        with self.writingToExcel():
+            for block in blocks:
+                if block.Worksheet not in self.sheetsDict:
+                    missing.append(block.Worksheet)
+                    continue
+                
+                rng = self.sheetsDict[block.Worksheet].Range[block.Range]
+                rng.Value2 = self.toArray2D(block.Values)
+                if highlight:
+                    rng.Interior.ColorIndex=8
+        return missing
+    
+    def calculate(self):
+        self.ex.Calculate()
+    
     def saveAndQuit(self,closeIfUser):
         """Close the running excel instance, and save first
         Args:
@@ -151,9 +224,11 @@ class ExcelInstance:
     def save(self):
         try:
             self.ex.activeWorkbook.Save()
-            return True
         except:
             return False
+        
+        self.saveWriteSnapshot()
+        return True
     
     def close(self, closeIfUser):
         """Close the open excel workbook
@@ -253,15 +328,46 @@ class MyComponent(component):
         filename = self.doCopy(oldFilename, newDirectory, newFilename)
         
         if excel.openWorkbook(filename): #If we need to open a new sheet, set it up
-            if "XLSdata" in sc.sticky: 
-                del sc.sticky["XLSdata"]
+            excel.writeSnapshot = xl_loadWriteSnapshot(filename, oldFilename)
             excel.loadSheets()
         
         return True
     
+    def OpenHeadless(self, oldFilename, newDirectory, newFilename):
+        """No Excel on this computer, so open the copied .xlsx file directly"""
+        
+        if not (oldFilename and newFilename):
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, "Not running, either run is false or filename not set.")
+            return None
+        
+        filename = self.doCopy(oldFilename, newDirectory, newFilename)
+        if not filename:
+            return None
+        
+        if "excel" in sc.sticky:
+            if sc.sticky["excel"].activeWorkbookName == filename:
+                return sc.sticky["excel"]
+            self.StopExcel()
+        
+        try:
+            excel = XL_XlsxFileBackend(filename)
+        except Exception as e:
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, "Unable to open workbook: {}".format(e))
+            return None
+        
+        excel.writeSnapshot = xl_loadWriteSnapshot(filename, oldFilename)
+        sc.sticky["excel"]=excel
+        
+        msg1 = "Excel not found. Writing to the .xlsx file directly, it will recalculate when next opened in Excel."
+        ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Remark, msg1)
+        return excel
+    
     def RunScript(self, run, visible, useUserWorkbook, oldFilename, newDirectory, newFilename):
         newFilename = self._clean_filename(newFilename)
         
+        if run and not excelAvailable:
+            return self.OpenHeadless(oldFilename, newDirectory, newFilename)
+        
         if not run:
             self.StopExcel()
             ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, "Excel Not Started")
@@ -22,8 +22,10 @@
 """
 Read a list of fields from an Excel workbook.
 To configure this module, provide three comma separated lists of the same length for the sheet name, cell name, and the label of the result. Alternatively, use the form entry option.
+The fields are read in as few blocks of cells as possible, and aren't read again until something new is written to the workbook.
 -
 Component by Jack Hymowitz, August 29, 2020
+Updated October 17, 2026
 
     Args:
         excel: A running excel instance
@@ -31,13 +33,13 @@ Component by Jack Hymowitz, August 29, 2020
         fields: A comma separated list of the cells to read for each output
         labels: A comma separated list of what to  label each read cell
     Returns:
-        data: The values of the requested fields in a list of length-2 tuple (label, value)
-        text: The information from data written out to a string.
+        data: The values of the requested fields in a list of length-2 tuple (label, value). Numbers are output as floats, blank cells as None.
+        text: The information from data written out to a string (numbers rounded to 4 significant figures).
 """
 
 ghenv.Component.Name = "BT_XLReadWorkbook"
 ghenv.Component.NickName = "Read XL Workbook"
-ghenv.Component.Message = 'AUG_29_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -51,8 +53,29 @@ import scriptcontext as sc
 import Grasshopper.Kernel as ghK
 from math import floor,log10
 
+# Classes and Defs
+XL_ResultMap = sc.sticky['XL_ResultMap']
+
+#Default, verification page
+DEFAULT_FIELDS=[
+    ["TFA","Verification","I34"],
+    ["Heating Demand","Verification","I35"],
+    ["Heating Load","Verification","I36"],
+    ["Cooling + Dehum Demand","Verification","I38"],
+    ["Cooling Load","Verification","I39"],
+    ["Frequency of Overheating","Verification","I40"],
+    ["Frequency of excessively high humidity","Verification","I41"],
+    ["Pressurization test result","Verification","I43"],
+    ["Non-Renewable PE","Verification","I53"],
+    ["PER Demand","Verification","I55"],
+    ["PER","Verification","I56"],
+    ["Heating Total","Heating","O27"],
+    ["Cooling Total","Cooling","O28"]
+    ]
+
 class MyComponent(component):
-    def doRead(self, excel, sheets, fields, labels):
+    def getResultMap(self, sheets, fields, labels):
+        #The XL_ResultMap for the requested fields. Kept between runs so unchanged results aren't read again
         if sheets:
             sheetsList=sheets.split(",")
             fieldsList=fields.split(",")
@@ -60,48 +83,34 @@ class MyComponent(component):
             if len(sheetsList) != len(fieldsList) or len(sheetsList) != len(labelsList):
                 msg1 = "Fields and Labels don't match!"
                 ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, msg1)
-                return (None,None)
-            labelList=[]
-            for i in range(len(sheetsList)):
-                labelList.append([labelsList[i],sheetsList[i],fieldsList[i]])
+                return None
+            labelList=zip(labelsList,sheetsList,fieldsList)
+        elif "displayFields" in sc.sticky:
+            labelList=sc.sticky["displayFields"]
         else:
-            if not "displayFields" in sc.sticky:
-                #msg1 = "No Fields Found!"
-                #ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Error, msg1)
-                #return (None,None)
-                #Default, verification page
-                labelList=[
-                    ["TFA","Verification","I34"],
-                    ["Heating Demand","Verification","I35"],
-                    ["Heating Load","Verification","I36"],
-                    ["Cooling + Dehum Demand","Verification","I38"],
-                    ["Cooling Load","Verification","I39"],
-                    ["Frequency of Overheating","Verification","I40"],
-                    ["Frequency of excessively high humidity","Verification","I41"],
-                    ["Pressurization test result","Verification","I43"],
-                    ["Non-Renewable PE","Verification","I53"],
-                    ["PER Demand","Verification","I55"],
-                    ["PER","Verification","I56"],
-                    ["Heating Total","Heating","O27"],
-                    ["Cooling Total","Cooling","O28"]
-                    ]
-            else:
-                labelList=sc.sticky["displayFields"]
-        data=[]
+            labelList=DEFAULT_FIELDS
+        
+        key=tuple(tuple(cell[:3]) for cell in labelList)
+        resultMaps=sc.sticky.setdefault('IDF2PHPP_ResultMaps', {})
+        if key not in resultMaps:
+            resultMaps[key]=XL_ResultMap(key)
+        return resultMaps[key]
+    
+    def doRead(self, excel, sheets, fields, labels):
+        resultMap=self.getResultMap(sheets, fields, labels)
+        if not resultMap:
+            return (None,None)
+        
+        data=resultMap.read(excel)
         text=""
-        for cell in labelList:
-            label=cell[0].strip()
-            sheet=cell[1].strip()
-            field=cell[2].strip()
-            if sheet in excel.sheetsDict:
-                val=excel.sheetsDict[sheet].Range[field].Value2
-                if(type(val).__name__=="float" and val!=0): #Round to 4 significant figures
-                    val=str(round(val,3-int(floor(log10(abs(val))))))
-                data.append((label,val))
-                text+=str(label)+": "+str(val)+"\n"
+        for label, val in data:
+            if isinstance(val, float) and val!=0: #Round to 4 significant figures
+                val=round(val,3-int(floor(log10(abs(val)))))
+            text+=unicode(label)+": "+unicode(val)+"\n"
         return (data,text)
+    
     def RunScript(self, excel, sheets, fields, labels):
-        if excel and excel.activeWorkbook and excel.sheetsDict:
+        if excel and excel.hasWorkbook():
             return self.doRead(excel,sheets,fields,labels)
         msg1 = "No Excel Instance!"
         ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
@@ -23,8 +23,11 @@
 Writes a series of objects to an excel sheet, then recalculates the sheet.
 These objects should be in a Treemap, and need a Worksheet, Range, and Value variable.
 Optionally only writes the differances from the last execution of this function, to reduce writing time.
+The last values written are kept with the workbook (see BT_XLOpenWorkbook) so the differance carries over between sessions.
+Adjacent cells on the same Worksheet are grouped together and written as a single block.
 -
 Component by Jack Hymowitz, August 29, 2020
+Updated October 17, 2026
 
     Args:
         _excel: A running ExcelInterface from OpenExcel Workbook
@@ -37,7 +40,7 @@ Component by Jack Hymowitz, August 29, 2020
 """
 ghenv.Component.Name = "BT_XLWriteWorkbook"
 ghenv.Component.NickName = "Write XL Workbook"
-ghenv.Component.Message = 'AUG_29_2020'
+ghenv.Component.Message = 'OCT_17_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "BT"
 ghenv.Component.SubCategory = "02 | IDF2PHPP"
@@ -51,32 +54,17 @@ import Grasshopper.Kernel as ghK
 import scriptcontext as sc
 from System import Object
 from Grasshopper.Kernel.Data import GH_Path
-import clr
-from contextlib import contextmanager
-clr.AddReferenceByName('Microsoft.Office.Interop.Excel')#, Culture=neutral, PublicKeyToken=71e9bce111e9429c')
-from Microsoft.Office.Interop import Excel
+
+# Classes and Defs
+xl_getWriteItems = sc.sticky['xl_getWriteItems']
+XL_WriteSnapshot = sc.sticky['XL_WriteSnapshot']
 
 
 class MyComponent(component):
     
-    @staticmethod
-    @contextmanager
-    def writingToExcel(_excel):
-        """ Changes the Excel Doc settings to help speed up """
-        
-        # Note: xlCalculationManual / Automatic set only works AFTER the workbook is opened
-        
-        try:
-            _excel.ex.Calculation = -4135 
-            _excel.ex.ScreenUpdating = False
-            yield
-        finally:
-            _excel.ex.Calculation = -4105 
-            _excel.ex.ScreenUpdating = True
-    
     def checkPHPPVersion(self, _excel):
         """ Looks at !Data:D3 to find version number. Returns 'SI' or 'IP' unit type"""
-        version = _excel.sheetsDict['Data'].Range['B3'].Value2
+        version = _excel.readCell('Data', 'B3')
         
         if not version:
             print('Using "SI" Units')
@@ -88,69 +76,65 @@ class MyComponent(component):
             print('Using "SI" Units')
             return 'SI'
     
-    def doReadObjs(self, objects, _unitType):
+    def getNewCells(self, objects, _unitType):
+        #Every (Worksheet, Range): Value to be in the workbook after this write
+        
+        newCells={}
+        for eachBranch in objects.Branches:
+            for sheet, rng, value in xl_getWriteItems(eachBranch, _unitType):
+                newCells[(sheet,rng)]=value
+        return newCells
+    
+    def doReadObjs(self, objects, _unitType, _snapshot):
         #If useDiff is false, this is used. Simply reads all objects in
         
         diff=[]
         for eachBranch in objects.Branches:
-            for obj in eachBranch:
-                diff.append((obj.getWorksheet(_unitType),obj.Range,obj.getValue(_unitType)))
-        return diff
+            diff.extend(xl_getWriteItems(eachBranch, _unitType))
+        
+        #Cells not written this time keep their last value in the workbook
+        newCells=dict(_snapshot.Cells)
+        newCells.update( ((sheet,rng),value) for sheet, rng, value in diff )
+        return diff, newCells
     
-    def doDiff(self, objects, _unitType):
+    def doDiff(self, objects, _unitType, _snapshot):
         #If useDiff is true (or not set), this is used. Only objects that have changed are written
         
-        newObj={}
-        for eachBranch in objects.Branches:
-            for obj in eachBranch:
-                newObj[(obj.getWorksheet(_unitType),obj.Range)]=obj.getValue(_unitType);
-        
-        diff=[]
-        if "XLSdata" in sc.sticky:    #We are checking diffs
-            oldObj=sc.sticky["XLSdata"]
-            for x in newObj.keys():
-                if not x in oldObj.keys() or oldObj[x]!=newObj[x]: #If the value didn't exist before or was changed, it's a change
-                    diff.append((x[0],x[1],newObj[x]))
-            for x in oldObj.keys():
-                if not x in newObj.keys():                         #If the value existed before and is now gone, it is a change
-                    diff.append((x[0],x[1],""))
-            
-        else:                                       #Not checking diffs
-            for x in newObj.keys():
-                diff.append((x[0],x[1],newObj[x]))
-        sc.sticky["newXLSdata"]=newObj
-        return diff
+        newCells=self.getNewCells(objects, _unitType)
+        return _snapshot.diff(newCells), newCells
     
-    def doWrite(self, excel, border, data):
-        #Write out the data we have found
+    def doWrite(self, excel, border, data, newCells):
+        #Write out the data we have found, one block of adjacent cells at a time
+        
+        highlight = border == None or border
         
-        with self.writingToExcel(excel):
-            for eachItem in data:
-                try:
-                    excel.sheetsDict[eachItem[0]].Range[eachItem[1]].Value2 = eachItem[2]
-                    if(border == None or border):
-                        excel.sheetsDict[eachItem[0]].Range[eachItem[1]].Interior.ColorIndex=8
-                except:
-                    msg1 = "Sheet not found: " + eachItem[0]
-                    ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
-            if "newXLSdata" in sc.sticky:
-                sc.sticky["XLSdata"]=sc.sticky["newXLSdata"]
+        blocks, missing = excel.writeItems(data, highlight)
+        for sheet in set(missing):
+            msg1 = "Sheet not found: " + sheet
+            ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
+        excel.writeSnapshot.update(newCells)
+        
+        callsPerWrite = 2 if highlight else 1
+        print('Wrote {} cells in {} blocks ({} Excel calls saved)'.format(len(data), len(blocks), (len(data)-len(blocks))*callsPerWrite))
     
     def RunScript(self, excel, useDiff, border, XL_Objects):
         
-        if not excel or not excel.activeWorkbook or not XL_Objects:
+        if not excel or not excel.hasWorkbook() or not XL_Objects:
             msg1 = "No Excel Instance!"
             ghenv.Component.AddRuntimeMessage(ghK.GH_RuntimeMessageLevel.Warning, msg1)
             return (None,0)
         
+        if excel.writeSnapshot is None:    #Workbook wasn't opened by BT_XLOpenWorkbook, so only keep the snapshot in memory
+            excel.writeSnapshot = XL_WriteSnapshot()
+        
         unitType = self.checkPHPPVersion(excel)
         
         if useDiff is None or useDiff:
-            diff=self.doDiff(XL_Objects, unitType)
+            diff, newCells=self.doDiff(XL_Objects, unitType, excel.writeSnapshot)
         else:
-            diff=self.doReadObjs(XL_Objects, unitType)
+            diff, newCells=self.doReadObjs(XL_Objects, unitType, excel.writeSnapshot)
         
-        self.doWrite(excel, border,diff)
-        excel.ex.Calculate()
+        self.doWrite(excel, border, diff, newCells)
+        excel.calculate()
         
         return (excel,len(diff))
@@ -90,6 +90,15 @@ class Model:
                 if k in eachKey:
                     rs.SetDocumentUserText(eachKey) # no second val = delete
     
+    def _bumpLibraryRevision(self):
+        # Let the Grasshopper components know the library changed, so they
+        # re-load it instead of using their cached copy
+        try:
+            rev = int(rs.GetDocumentUserText('PHPP_lib_Revision')) + 1
+        except:
+            rev = 1
+        rs.SetDocumentUserText('PHPP_lib_Revision', str(rev))
+    
     def setDocumentLibValues(self, _data):
         # First, clear out all the existing values in the dict
         keys = set()
@@ -102,6 +111,8 @@ class Model:
             idNum = self._idAsInt(v['Data']['ID'])
             key = "{}_{:02d}".format( v['LibType'], idNum )
             rs.SetDocumentUserText(key, json.dumps(v['Data']) )
+        
+        self._bumpLibraryRevision()
     
     def _idAsInt(self, _in):
         try:
@@ -435,6 +446,8 @@ class Model:
                                 "ID": int(i+1)
                                 }
             rs.SetDocumentUserText("PHPP_lib_Frame_{:02d}".format(i+1), json.dumps(newFrameType) )
+        
+        self._bumpLibraryRevision()
     
     def _determineInputUnits(self, _inputString):
         # If its just a number, its SI so just pass it along
@@ -0,0 +1,422 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+#
+# This component is part of IDF2PHPP.
+#
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com>
+# IDF2PHPP is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 3 of the License,
+# or (at your option) any later version.
+#
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+#
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Batch converts a folder of EnergyPlus .idf files into PHPP workbooks from the command line.
+No Rhino, Grasshopper or Excel are needed, so this can run on a server (Python 2.7).
+-
+For each .idf file: the PHPP template is copied to the output folder, the IDF is read
+(reader -> BT_IDF2PHPPObjs -> BT_CreateXLObj_Geom equivalent) and the 'U-Values', 'Components',
+'Areas' and 'Windows' worksheets are written directly into the copied .xlsx file. The
+files are spread across a pool of worker processes, and the timing / errors for each file are
+written to a report (.csv) in the output folder.
+-
+Only what can be found in the IDF itself is exported. Anything which comes from the
+Honeybee Zones in Grasshopper (PHPP Rooms, Ventilation, DHW, Ground, detailed Window
+params) is not. Honeybee's triangulated windows ('_glzP_') are written as separate windows.
+The workbooks will recalculate the next time they are opened in Excel.
+-
+Usage:
+    python IDF2PHPP_Batch.py <IDF folder> <PHPP template .xlsx> [-o OUTPUT_FOLDER] [-j PROCESSES] [--no-cache]
+-
+The parsed IDF files are cached in <OUTPUT_FOLDER>/IDF_Cache so re-running on unchanged
+files is quicker. Nothing is written to the IDF folder. Use --no-cache to turn this off.
+-
+EM October 17, 2026
+"""
+
+import os
+import sys
+import ast
+import csv
+import time
+import glob
+import math
+import re
+import shutil
+import zipfile
+import hashlib
+import argparse
+import traceback
+import multiprocessing
+import cPickle as pickle
+from array import array
+from collections import namedtuple, defaultdict, OrderedDict
+
+#-------------------------------------------------------------------------------
+# The Rhino-free parts of BT_CORE used here
+CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '01_GH_Components', 'py', 'BT_CORE.py')
+CORE_NAMES = [
+    # IDF Reader
+    'IDF_CACHE_VERSION', 'IDF_Schema', 'idf_fieldNumber', 'idf_fieldValue', 'IDF_Class',
+    'idf_cleanFieldComment', 'idf_addFieldValues', 'idf_tokenizeFile', 'IDF_ObjectStore',
+    'idf_fileHash', 'idf_loadStore', 'idf_writeCache',
+    # Geometry
+    'SrfcGeomData', 'phpp_geomDataFromVerts', 'phpp_geomDataFromVertsBulk', 'phpp_calcNorthAngle',
+    # IDF / PHPP Objects
+    'IDF_Obj_MaterialLayer', 'IDF_Obj_MaterialWindowSimple', 'IDF_Obj_MaterialWindowGlazing',
+    'IDF_Obj_MaterialWindowGas', 'IDF_Obj_Construction', 'PHPP_Window_Install', 'PHPP_Glazing', 'PHPP_Frame',
+    # Workbook
+    'PHPP_UNIT_SCHEMA', 'phpp_compileUnitConversions', 'PHPP_UNIT_CONVERSIONS', 'phpp_convertValue',
+    'PHPP_XL_Obj', 'xl_getWriteItems', 'xl_colToNum', 'xl_numToCol', 'xl_splitAddress', 'XL_Block', 'xl_groupIntoBlocks',
+    'XL_WorkbookBackend', 'xl_xmlEscape', 'xl_xmlUnescape', 'XL_XlsxFileBackend',
+    # Geometry Excel Objects
+    'Model_Index', 'phpp_getMaterialIndex', 'phpp_getUvalues', 'phpp_getComponents', 'phpp_getAreas', 'phpp_getWindows',
+    ]
+
+def loadCore(_path, _names):
+    """ Compiles the named classes / defs out of BT_CORE
+    
+    BT_CORE is written to run inside Grasshopper (it imports Rhino, scriptcontext, etc..)
+    but the parts listed are plain Python, so they're pulled out of it by name rather
+    than keeping a second copy of them here.
+    
+    Args:
+        _path (str): Full path to BT_CORE.py
+        _names (list): The class, def or variable names to load
+    Returns:
+        (dict): The namespace with the loaded names
+    """
+    
+    with open(_path, 'r') as coreFile:
+        tree = ast.parse(coreFile.read(), _path)
+    
+    def _nodeNames(node):
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            return [node.name]
+        elif isinstance(node, ast.Assign):
+            return [target.id for target in node.targets if isinstance(target, ast.Name)]
+        return []
+    
+    body = [node for node in tree.body if any(name in _names for name in _nodeNames(node))]
+    found = set(name for node in body for name in _nodeNames(node))
+    missing = [name for name in _names if name not in found]
+    if missing:
+        raise ImportError('Could not find {} in {}'.format(missing, _path))
+    
+    namespace = {'os':os, 'math':math, 're':re, 'zipfile':zipfile, 'hashlib':hashlib,
+                 'pickle':pickle, 'array':array, 'namedtuple':namedtuple,
+                 'defaultdict':defaultdict, 'OrderedDict':OrderedDict,
+                 'idf_getCacheStats':getCacheStats}
+    exec compile(ast.Module(body=body), _path, 'exec') in namespace
+    return namespace
+
+CACHE_STATS = {'hits':0, 'misses':0}
+
+def getCacheStats():
+    # Used by idf_loadStore, in place of the Grasshopper sc.sticky one
+    return CACHE_STATS
+
+core = loadCore(CORE_PATH, CORE_NAMES)
+globals().update( (name, core[name]) for name in CORE_NAMES )
+
+Vector = namedtuple('Vector', ['X', 'Y', 'Z'])
+
+# PHPP 'Group Number' for the EP (Surface Type, Outside Boundary Condition)
+GROUP_NUMBERS = {('Wall', 'Outdoors'): 8,
+                 ('Wall', 'Ground'): 9,
+                 ('Roof', 'Outdoors'): 10,
+                 ('Floor', 'Ground'): 11,
+                 ('Floor', 'Outdoors'): 12}
+
+#-------------------------------------------------------------------------------
+# BT_IDF2PHPPObjs equivalent
+class BatchSurface:
+    """ The Opaque Surface params needed for the PHPP 'Areas' worksheet (see IDF_Obj_surfaceOpaque) """
+    
+    def __init__(self, _idfObj, _northVec, _geomData):
+        self.Name = getattr(_idfObj, 'Name')
+        self.AssemblyName = getattr(_idfObj, 'Construction Name')
+        self.srfcType = getattr(_idfObj, 'Surface Type')
+        self.exposure = getattr(_idfObj, 'Outside Boundary Condition')
+        self.HostZoneName = getattr(_idfObj, 'Zone Name')
+        self.SurfaceArea = _geomData.Area
+        self.AngleFromNorth = phpp_calcNorthAngle(Vector(*_geomData.Normal), _northVec)
+        self.AngleFromHoriz = _geomData.Tilt
+        self.Factor_Shading = 0.5 # Default
+        self.Factor_Absorptivity = 0.6  # Default
+        self.Factor_Emissivity = 0.9   # Default
+        
+        if self.exposure == 'Adiabatic':
+            self.GroupNum = 18
+        else:
+            self.GroupNum = GROUP_NUMBERS.get((self.srfcType, self.exposure), 13)
+    
+    def __unicode__(self):
+        return u'Batch Opaque Surface: [{}]'.format(self.Name)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _name={!r}, _area={!r} )".format(
+               self.__class__.__name__,
+               self.Name,
+               self.SurfaceArea)
+
+class BatchWindow:
+    """ The Window params needed for the PHPP 'Windows' / 'Components' worksheets (see IDF_Obj_surfaceWindow) """
+    
+    def __init__(self, _idfObj, _winSimpleMat, _geomData):
+        self.Quantity = 1
+        self.Name = getattr(_idfObj, 'Name')
+        self.Width = _geomData.Width
+        self.Height = _geomData.Height
+        self.HostSrfc = getattr(_idfObj, 'Building Surface Name')
+        self.Type_Variant = 'a'
+        
+        constName = getattr(_idfObj, 'Construction Name')
+        uValue = _winSimpleMat.uValue
+        self.Type_Glass = PHPP_Glazing(constName, _winSimpleMat.gValue, uValue)
+        self.Type_Frame = PHPP_Frame(constName, [uValue]*4, [0.12]*4, [0.00]*4, [0.00]*4)
+        self.Installs = PHPP_Window_Install([1, 1, 1, 1])
+    
+    def __unicode__(self):
+        return u'Batch Window: [{}]'.format(self.Name)
+    def __str__(self):
+        return unicode(self).encode('utf-8')
+    def __repr__(self):
+        return "{}( _name={!r}, _host={!r} )".format(
+               self.__class__.__name__,
+               self.Name,
+               self.HostSrfc)
+
+class WindowSimpleFromLayers:
+    """ Stands in for the 'WindowMaterial:SimpleGlazingSystem' IDF Object (see materialWindowSimpleFromLayers) """
+    
+    def __init__(self, _name, _uValue):
+        setattr(self, 'Name', _name)
+        setattr(self, 'U-Factor {W/m2-K}', _uValue)
+        setattr(self, 'Solar Heat Gain Coefficient', 0.4)
+        setattr(self, 'Visible Transmittance', 0.75)
+
+def getNorthVector(_idfStore):
+    # Same as IDF_Obj_building: rotate the Y-Axis by the Building 'North Axis'
+    bldg = _idfStore.getFirst('Building')
+    northAngle = math.radians( float(getattr(bldg, 'North Axis {deg}', 0) or 0) )
+    return Vector(math.sin(northAngle), math.cos(northAngle), 0)
+
+def buildPHPPObjects(_idfStore):
+    """ Builds the Materials, Constructions, Surfaces and Windows from the IDF Objects
+    
+    Args:
+        _idfStore (IDF_ObjectStore): The IDF file's Objects
+    Returns:
+        (dict): 'Materials', 'Constructions', 'Surfaces' and 'Windows' lists
+    """
+    
+    northVec = getNorthVector(_idfStore)
+    
+    #---------------------------------------------------------------------------
+    # Materials
+    opaqueMaterials = [IDF_Obj_MaterialLayer(obj) for obj in _idfStore.getObjects('Material', 'Material:AirGap')]
+    opaqueMaterials.extend( IDF_Obj_MaterialLayer(obj, noMass=True) for obj in _idfStore.getObjects('Material:NoMass') )
+    
+    winMatsSimple = dict( (obj.Name, IDF_Obj_MaterialWindowSimple(obj)) for obj in _idfStore.getObjectsLike('WindowMaterial:SimpleGlazingSystem') )
+    winMatsGas = dict( (obj.Name, IDF_Obj_MaterialWindowGas(obj)) for obj in _idfStore.getObjectsLike('WindowMaterial:Gas') )
+    winMatsGlazing = dict( (obj.Name, IDF_Obj_MaterialWindowGlazing(obj)) for obj in _idfStore.getObjectsLike('WindowMaterial:Glazing') )
+    
+    #---------------------------------------------------------------------------
+    # Constructions, split into Opaque / Window
+    opaqueConstructions = []
+    windowConstructions = {}
+    for obj in _idfStore.getObjectsLike('Construction'):
+        construction = IDF_Obj_Construction(obj)
+        windowLayers = [nm for nm in construction.LayerNames if nm in winMatsSimple or nm in winMatsGas or nm in winMatsGlazing]
+        
+        if not windowLayers:
+            opaqueConstructions.append(construction)
+            continue
+        
+        if len(construction.Layers) > 1:
+            # Built up window, approximate it as a 'Simple' window (surface films + glass + 1/2 gas)
+            resistances = [0.04, 0.13]
+            for layerName in construction.LayerNames:
+                if layerName in winMatsGlazing:
+                    resistances.append( 1 / winMatsGlazing[layerName].uValue )
+                elif layerName in winMatsGas:
+                    resistances.append( 1 / winMatsGas[layerName].uValue * 0.5 )
+            
+            winMatsSimple[construction.Name] = IDF_Obj_MaterialWindowSimple( WindowSimpleFromLayers(construction.Name, 1/sum(resistances)) )
+            construction.Layers = [ ['Layer1', construction.Name] ]
+        windowConstructions[construction.Name] = construction
+    
+    #---------------------------------------------------------------------------
+    # Surfaces and Windows
+    srfcObjs = _idfStore.getObjects('BuildingSurface:Detailed')
+    surfaces = [BatchSurface(obj, northVec, geom) for obj, geom in zip(srfcObjs, phpp_geomDataFromVertsBulk([obj.Vertices for obj in srfcObjs]))]
+    surfaces = [srfc for srfc in surfaces if srfc.exposure != 'Surface']
+    
+    windows = []
+    winObjs = _idfStore.getObjects('FenestrationSurface:Detailed')
+    for obj, geom in zip(winObjs, phpp_geomDataFromVertsBulk([obj.Vertices for obj in winObjs])):
+        winMatName = windowConstructions[ getattr(obj, 'Construction Name') ].Layers[0][1]
+        windows.append( BatchWindow(obj, winMatsSimple[winMatName], geom) )
+    
+    return {'Materials': opaqueMaterials,
+            'Constructions': opaqueConstructions,
+            'Surfaces': surfaces,
+            'Windows': windows}
+
+#-------------------------------------------------------------------------------
+# BT_CreateXLObj_Geom equivalent
+def createXLObjects(_phppObjs):
+    """ Builds all the PHPP_XL_Obj's for the Materials, Constructions, Surfaces and Windows
+    
+    Uses the same builders as BT_CreateXLObj_Geom (from BT_CORE). Every Zone is included.
+    """
+    
+    materialIndex = phpp_getMaterialIndex(_phppObjs['Materials'])
+    uValuesList, uValueUID_Names = phpp_getUvalues(_phppObjs['Constructions'], materialIndex)
+    zones = set(srfc.HostZoneName for srfc in _phppObjs['Surfaces'])
+    modelIndex = Model_Index(zones, [], uValueUID_Names)
+    componentsList = phpp_getComponents(_phppObjs['Windows'])
+    areasList = phpp_getAreas(_phppObjs['Surfaces'], modelIndex)
+    windowsList = phpp_getWindows(_phppObjs['Windows'], modelIndex)
+    
+    return uValuesList + componentsList + areasList + windowsList
+
+#-------------------------------------------------------------------------------
+# Workbook
+def getUnitType(_workbook):
+    # Looks at !Data:B3 to find version number. Returns 'SI' or 'IP' unit type
+    version = _workbook.readCell('Data', 'B3') if 'Data' in _workbook.getSheetNames() else None
+    return 'IP' if version and 'IP' in version else 'SI'
+
+def convertFile(_args):
+    """ Runs the full IDF -> PHPP conversion for one file. Run in the worker processes.
+    
+    Args:
+        _args (tuple): (IDF file path, PHPP template path, output folder, IDF cache folder or None for no cache)
+    Returns:
+        (dict): The file's results and timing (seconds) for each step, for the report
+    """
+    
+    idfPath, templatePath, outputFolder, cacheFolder = _args
+    result = {'IDF': idfPath, 'Workbook': None, 'Status': 'OK', 'Error': '', 'Cells': 0,
+              'Read': 0.0, 'Convert': 0.0, 'Objects': 0.0, 'Write': 0.0, 'Total': 0.0}
+    start = time.time()
+    step = 'Read'
+    
+    try:
+        # Reader
+        t = time.time()
+        idfStore = idf_loadStore(idfPath, cacheFolder is not None, cacheFolder, cacheFolder is not None)
+        if not idfStore.getObjects('BuildingSurface:Detailed'):
+            raise ValueError('No BuildingSurface:Detailed objects found in the IDF file')
+        result['Read'] = time.time() - t
+        
+        # BT_IDF2PHPPObjs
+        step = 'Convert'
+        t = time.time()
+        phppObjs = buildPHPPObjects(idfStore)
+        result['Convert'] = time.time() - t
+        
+        # BT_CreateXLObj_Geom
+        step = 'Objects'
+        t = time.time()
+        xlObjs = createXLObjects(phppObjs)
+        result['Objects'] = time.time() - t
+        
+        # BT_XLWriteWorkbook
+        step = 'Write'
+        t = time.time()
+        workbookPath = os.path.join(outputFolder, os.path.splitext(os.path.basename(idfPath))[0] + '.xlsx')
+        shutil.copyfile(templatePath, workbookPath)
+        result['Workbook'] = workbookPath
+        
+        workbook = XL_XlsxFileBackend(workbookPath)
+        unitType = getUnitType(workbook)
+        items = xl_getWriteItems(xlObjs, unitType)
+        blocks, missing = workbook.writeItems(items, False)
+        if missing:
+            raise KeyError('Worksheets not found in the template: {}'.format(sorted(set(missing))))
+        if not workbook.save():
+            raise IOError('Unable to save {}'.format(workbookPath))
+        workbook.activeWorkbook.close()
+        
+        result['Cells'] = len(items)
+        result['Write'] = time.time() - t
+    except Exception:
+        result['Status'] = 'FAILED ({})'.format(step)
+        result['Error'] = traceback.format_exc()
+    
+    result['Total'] = time.time() - start
+    return result
+
+def writeReport(_results, _reportPath):
+    fields = ['IDF', 'Status', 'Workbook', 'Cells', 'Read', 'Convert', 'Objects', 'Write', 'Total', 'Error']
+    with open(_reportPath, 'wb') as reportFile:
+        writer = csv.DictWriter(reportFile, fields)
+        writer.writeheader()
+        for result in sorted(_results, key=lambda r: r['IDF']):
+            writer.writerow( dict((k, round(v, 3) if isinstance(v, float) else v) for k, v in result.items()) )
+
+def main(_argv=None):
+    parser = argparse.ArgumentParser(description='Batch convert EnergyPlus .idf files into PHPP workbooks.')
+    parser.add_argument('idfFolder', help='Folder with the .idf files to convert')
+    parser.add_argument('template', help='The PHPP (.xlsx) template to write to. It is copied for each .idf file')
+    parser.add_argument('-o', '--output', help='Folder for the new workbooks and the report. Default: <idfFolder>/PHPP')
+    parser.add_argument('-j', '--processes', type=int, default=multiprocessing.cpu_count(), help='Number of worker processes')
+    parser.add_argument('--no-cache', dest='cache', action='store_false', help='Don\'t cache the parsed IDF files (in <OUTPUT_FOLDER>/IDF_Cache)')
+    args = parser.parse_args(_argv)
+    
+    idfPaths = sorted(glob.glob(os.path.join(args.idfFolder, '*.idf')))
+    if not idfPaths:
+        print('No .idf files found in: {}'.format(args.idfFolder))
+        return 1
+    
+    if not zipfile.is_zipfile(args.template):
+        print('The PHPP template must be an .xlsx file: {}'.format(args.template))
+        return 1
+    
+    outputFolder = args.output or os.path.join(args.idfFolder, 'PHPP')
+    if not os.path.exists(outputFolder):
+        os.makedirs(outputFolder)
+    
+    cacheFolder = os.path.join(outputFolder, 'IDF_Cache') if args.cache else None
+    if cacheFolder and not os.path.exists(cacheFolder):
+        os.makedirs(cacheFolder)
+    
+    print('Converting {} IDF files with {} processes...'.format(len(idfPaths), args.processes))
+    start = time.time()
+    results = []
+    pool = multiprocessing.Pool(max(1, args.processes))
+    try:
+        jobs = [(path, args.template, outputFolder, cacheFolder) for path in idfPaths]
+        for result in pool.imap_unordered(convertFile, jobs):
+            results.append(result)
+            print('  {:<8} {:7.2f}s  {}'.format(result['Status'].split(' ')[0], result['Total'], os.path.basename(result['IDF'])))
+    finally:
+        pool.close()
+        pool.join()
+    
+    reportPath = os.path.join(outputFolder, 'IDF2PHPP_Batch_Report.csv')
+    writeReport(results, reportPath)
+    
+    failed = [result for result in results if result['Status'] != 'OK']
+    for result in failed:
+        print('\n{} {}:\n{}'.format(result['Status'], result['IDF'], result['Error']))
+    
+    print('Done: {} converted, {} failed in {:.2f}s. Report: {}'.format(
+            len(results) - len(failed), len(failed), time.time() - start, reportPath))
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+#
+# This component is part of IDF2PHPP.
+#
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com>
+# IDF2PHPP is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 3 of the License,
+# or (at your option) any later version.
+#
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+#
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Tests for looking up IDF Objects by IDF Class in the BT_CORE IDF_ObjectStore
+-
+Usage (Python 2.7):
+    python -m unittest discover -s 04_Batch/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import IDF2PHPP_Batch as batch
+
+RECORDS = [('Construction:InternalSource', [('Name', 'Slab'), ('Outside Layer', 'Concrete')]),
+           ('Construction', [('Name', 'Wall'), ('Outside Layer', 'Brick'), ('Layer 2', 'Insul')]),
+           ('WindowMaterial:Gas', [('Name', 'Argon 12mm')]),
+           ('WindowMaterial:GasMixture', [('Name', 'Mix 12mm')]),
+           ('Construction', [('Name', 'Roof'), ('Outside Layer', 'Insul')]),
+           ('Material', [('Name', 'Brick')]),
+           ('Material:NoMass', [('Name', 'Membrane')])]
+
+class ObjectStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = batch.IDF_ObjectStore(RECORDS)
+
+    def names(self, _objs):
+        return [obj.Name for obj in _objs]
+
+    def test_getObjects_exact(self):
+        self.assertEqual(self.names(self.store.getObjects('Construction')), ['Wall', 'Roof'])
+        self.assertEqual(self.names(self.store.getObjects('Material')), ['Brick'])
+        self.assertEqual(self.names(self.store.getObjects('Material', 'Material:NoMass')), ['Brick', 'Membrane'])
+
+    def test_getObjectsLike_includes_variants(self):
+        # The same as the older reader: 'Construction' in objName
+        self.assertEqual(self.names(self.store.getObjectsLike('Construction')), ['Slab', 'Wall', 'Roof'])
+        self.assertEqual(self.names(self.store.getObjectsLike('WindowMaterial:Gas')), ['Argon 12mm', 'Mix 12mm'])
+        self.assertEqual(self.names(self.store.getObjectsLike('WindowMaterial:Glazing')), [])
+
+    def test_class_order(self):
+        self.assertEqual(self.store.getClassNames(), ['Construction:InternalSource', 'Construction', 'WindowMaterial:Gas',
+                                                      'WindowMaterial:GasMixture', 'Material', 'Material:NoMass'])
+
+if __name__ == '__main__':
+    unittest.main()
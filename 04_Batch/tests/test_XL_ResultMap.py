@@ -0,0 +1,125 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+#
+# This component is part of IDF2PHPP.
+#
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com>
+# IDF2PHPP is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 3 of the License,
+# or (at your option) any later version.
+#
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+#
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Tests for reading results back with BT_CORE XL_ResultMap, against the XL_WriteSnapshot 'Generation'
+-
+Usage (Python 2.7):
+    python -m unittest discover -s 04_Batch/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import IDF2PHPP_Batch as batch
+
+core = batch.loadCore(batch.CORE_PATH, batch.CORE_NAMES +
+        ['XL_SNAPSHOT_VERSION', 'XL_WriteSnapshot', 'XL_ResultField', 'xl_typedValue', 'XL_ResultMap'])
+
+class MemoryWorkbook(core['XL_WorkbookBackend']):
+    """ An in-memory workbook which counts its reads """
+
+    def __init__(self):
+        self.cells = {}
+        self.reads = []
+        self.writeSnapshot = core['XL_WriteSnapshot']()
+
+    def getSheetNames(self):
+        return ['Verification', 'Heating']
+
+    def readCell(self, _sheet, _address):
+        self.reads.append( (_sheet, _address) )
+        return self.cells.get( (_sheet, core['xl_splitAddress'](_address)) )
+
+    def readRange(self, _sheet, _range):
+        self.reads.append( (_sheet, _range) )
+        start, end = (_range.split(':') + [_range])[:2]
+        startCol, startRow = core['xl_splitAddress'](start)
+        endCol, endRow = core['xl_splitAddress'](end)
+        return [[self.cells.get( (_sheet, (col, row)) ) for col in range(startCol, endCol + 1)]
+                    for row in range(startRow, endRow + 1)]
+
+    def writeBlocks(self, _blocks, _highlight=True):
+        for block in _blocks:
+            col, row = core['xl_splitAddress'](block.Range.split(':')[0])
+            for i, values in enumerate(block.Values):
+                for j, value in enumerate(values):
+                    self.cells[(block.Worksheet, (col + j, row + i))] = value
+        return []
+
+    def write(self, _newCells):
+        # The same as BT_XLWriteWorkbook with useDiff on
+        self.writeItems(self.writeSnapshot.diff(_newCells))
+        self.writeSnapshot.update(_newCells)
+
+FIELDS = [['TFA', 'Verification', 'I34'],
+          ['Heating Demand', 'Verification', 'I35'],
+          ['Heating Load', 'Verification', 'I36'],
+          ['PER', 'Verification', 'I56'],
+          ['Heating Total', 'Heating', 'O27'],
+          ['Cooling Total', 'Cooling', 'O28']]
+
+class ResultMapTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workbook = MemoryWorkbook()
+        self.resultMap = core['XL_ResultMap'](FIELDS)
+
+    def test_read_ranges(self):
+        ranges = sorted( (sheet, address) for sheet, address, offsets in self.resultMap.ReadRanges )
+        self.assertEqual(ranges, [('Cooling', 'O28'), ('Heating', 'O27'), ('Verification', 'I34:I36'), ('Verification', 'I56')])
+
+    def test_typed_values(self):
+        self.workbook.write({('Verification', 'I34'): 120.5, ('Verification', 'I35'): ' 14 ',
+                             ('Verification', 'I36'): 'n/a', ('Heating', 'O27'): 3})
+
+        results = self.resultMap.read(self.workbook)
+
+        # 'Cooling' isn't a Worksheet in the workbook, so it is left out
+        self.assertEqual(results, [('TFA', 120.5), ('Heating Demand', 14.0), ('Heating Load', u'n/a'),
+                                   ('PER', None), ('Heating Total', 3.0)])
+
+    def test_empty_diff_write_keeps_results(self):
+        newCells = {('Verification', 'I34'): 120.5}
+        self.workbook.write(newCells)
+        results = self.resultMap.read(self.workbook)
+        numReads = len(self.workbook.reads)
+        generation = self.workbook.writeSnapshot.Generation
+
+        # Nothing new, so nothing is written and the workbook isn't read again
+        self.workbook.write(dict(newCells))
+        self.assertEqual(self.workbook.writeSnapshot.Generation, generation)
+        self.assertEqual(self.resultMap.read(self.workbook), results)
+        self.assertEqual(len(self.workbook.reads), numReads)
+
+    def test_changed_write_reads_again(self):
+        self.workbook.write({('Verification', 'I34'): 120.5})
+        self.resultMap.read(self.workbook)
+        numReads = len(self.workbook.reads)
+
+        self.workbook.write({('Verification', 'I34'): 130.0})
+        self.assertEqual(self.resultMap.read(self.workbook)[0], ('TFA', 130.0))
+        self.assertGreater(len(self.workbook.reads), numReads)
+
+if __name__ == '__main__':
+    unittest.main()
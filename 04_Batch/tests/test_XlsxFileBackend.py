@@ -0,0 +1,143 @@
+#
+# IDF2PHPP: A Plugin for exporting an EnergyPlus IDF file to the Passive House Planning Package (PHPP). Created by blgdtyp, llc
+#
+# This component is part of IDF2PHPP.
+#
+# Copyright (c) 2020, bldgtyp, llc <info@bldgtyp.com>
+# IDF2PHPP is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; either version 3 of the License,
+# or (at your option) any later version.
+#
+# IDF2PHPP is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# For a copy of the GNU General Public License
+# see <http://www.gnu.org/licenses/>.
+#
+# @license GPL-3.0+ <http://spdx.org/licenses/GPL-3.0+>
+#
+"""
+Tests for the headless .xlsx workbook backend (BT_CORE XL_XlsxFileBackend)
+-
+Usage (Python 2.7):
+    python -m unittest discover -s 04_Batch/tests
+"""
+
+import os
+import re
+import sys
+import shutil
+import zipfile
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import IDF2PHPP_Batch as batch
+
+CONTENT_TYPES = (u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    u'<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    u'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    u'</Types>')
+
+WORKBOOK = (u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    u'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    u'<sheets><sheet name="Areas" sheetId="1" r:id="rId1"/></sheets><calcPr calcId="0"/></workbook>')
+
+WORKBOOK_RELS = (u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    u'<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    u'</Relationships>')
+
+# D17:D19 share the formula 'B17*$B$2' with D17 as the master cell
+SHEET = (u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+    u'<row r="2"><c r="B2"><v>2</v></c></row>'
+    u'<row r="17"><c r="B17"><v>1</v></c><c r="D17" s="3"><f t="shared" ref="D17:D19" si="0">B17*$B$2</f><v>2</v></c></row>'
+    u'<row r="18"><c r="B18"><v>2</v></c><c r="D18" s="3"><f t="shared" si="0"/><v>4</v></c></row>'
+    u'<row r="19"><c r="B19"><v>3</v></c><c r="D19" s="3"><f t="shared" si="0"/><v>6</v></c></row>'
+    u'</sheetData></worksheet>')
+
+class XlsxFileBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'PHPP.xlsx')
+        with zipfile.ZipFile(self.path, 'w') as xlsx:
+            xlsx.writestr('[Content_Types].xml', CONTENT_TYPES.encode('utf-8'))
+            xlsx.writestr('xl/workbook.xml', WORKBOOK.encode('utf-8'))
+            xlsx.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS.encode('utf-8'))
+            xlsx.writestr('xl/worksheets/sheet1.xml', SHEET.encode('utf-8'))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def writeAndSave(self, _items):
+        workbook = batch.XL_XlsxFileBackend(self.path)
+        blocks, missing = workbook.writeItems(_items)
+        self.assertEqual(missing, [])
+        self.assertTrue(workbook.save())
+        workbook.saveAndQuit(False)
+
+        with zipfile.ZipFile(self.path, 'r') as xlsx:
+            return xlsx.read('xl/worksheets/sheet1.xml').decode('utf-8')
+
+    def getCell(self, _sheetXML, _address):
+        return re.search(u'<c r="{}"[^>]*?(?:/>|>.*?</c>)'.format(_address), _sheetXML).group(0)
+
+    def test_formula(self):
+        sheetXML = self.writeAndSave([('Areas', 'D20', '=D17'), ('Areas', 'E20', '=IF(A1<>"",A1&"_x",0)')])
+
+        self.assertEqual(self.getCell(sheetXML, 'D20'), u'<c r="D20"><f>D17</f></c>')
+        self.assertEqual(self.getCell(sheetXML, 'E20'), u'<c r="E20"><f>IF(A1&lt;&gt;&quot;&quot;,A1&amp;&quot;_x&quot;,0)</f></c>')
+
+    def test_text_and_numbers(self):
+        sheetXML = self.writeAndSave([('Areas', 'A20', 'Wall'), ('Areas', 'B20', '12.5'), ('Areas', 'C20', '=')])
+
+        self.assertIn(u't="inlineStr"', self.getCell(sheetXML, 'A20'))
+        self.assertEqual(self.getCell(sheetXML, 'B20'), u'<c r="B20"><v>12.5</v></c>')
+        self.assertIn(u't="inlineStr"', self.getCell(sheetXML, 'C20'))
+
+    def test_overwrite_shared_formula_master(self):
+        sheetXML = self.writeAndSave([('Areas', 'D17', '=B17*10')])
+
+        self.assertEqual(self.getCell(sheetXML, 'D17'), u'<c r="D17" s="3"><f>B17*10</f></c>')
+        self.assertEqual(self.getCell(sheetXML, 'D18'), u'<c r="D18" s="3"><f>B18*$B$2</f><v>4</v></c>')
+        self.assertEqual(self.getCell(sheetXML, 'D19'), u'<c r="D19" s="3"><f>B19*$B$2</f><v>6</v></c>')
+        self.assertNotIn(u'si="0"', sheetXML)
+
+    def test_overwrite_shared_formula_dependent(self):
+        sheetXML = self.writeAndSave([('Areas', 'D18', 5)])
+
+        self.assertEqual(self.getCell(sheetXML, 'D18'), u'<c r="D18" s="3"><v>5.0</v></c>')
+        self.assertIn(u'<f t="shared" ref="D17:D19" si="0">B17*$B$2</f>', self.getCell(sheetXML, 'D17'))
+        self.assertIn(u'<f t="shared" si="0"/>', self.getCell(sheetXML, 'D19'))
+    
+    def test_failed_save_keeps_workbook(self):
+        def failingRename(_src, _dst):
+            if _src.endswith('.tmp'):
+                raise OSError('The file is in use')
+            rename(_src, _dst)
+        
+        workbook = batch.XL_XlsxFileBackend(self.path)
+        workbook.writeItems([('Areas', 'A20', 'Wall')])
+        rename = os.rename
+        os.rename = failingRename
+        try:
+            self.assertFalse(workbook.save())
+        finally:
+            os.rename = rename
+        
+        # The original is back in place, untouched, and can still be read
+        self.assertEqual(sorted(os.listdir(self.folder)), ['PHPP.xlsx'])
+        with zipfile.ZipFile(self.path, 'r') as xlsx:
+            self.assertEqual(xlsx.read('xl/worksheets/sheet1.xml').decode('utf-8'), SHEET)
+        self.assertEqual(workbook.readCell('Areas', 'B19'), 3.0)
+        workbook.saveAndQuit(False)
+
+if __name__ == '__main__':
+    unittest.main()